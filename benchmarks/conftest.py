@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import base64
+import json
+import threading
+import typing
+
+import numpy as np
+import pytest
+
+from higlass._tileset_registry import TilesetRegistry
+from higlass._widget import JupyterTilesetClient
+from higlass.tilesets import Tileset
+
+
+class SyntheticTileset(Tileset):
+    """A 1D tileset with deterministic dense tiles of `tile_size` values.
+
+    The dense data are NumPy arrays, or base64-encoded strings (like those
+    produced by clodius) if `as_base64` is set.
+    """
+
+    def __init__(self, tile_size: int = 1024, max_zoom: int = 16, as_base64=False):
+        self.tile_size = tile_size
+        self.max_zoom = max_zoom
+        self.as_base64 = as_base64
+
+    def info(self):
+        return {
+            "tile_size": self.tile_size,
+            "max_zoom": self.max_zoom,
+            "min_pos": [0],
+            "max_pos": [self.tile_size * 2**self.max_zoom],
+        }
+
+    def tiles(self, tile_ids):
+        tiles = []
+        for tile_id in tile_ids:
+            _, z, x = tile_id.split(".")[:3]
+            rng = np.random.default_rng(int(z) * 2**20 + int(x))
+            dense = rng.random(self.tile_size, dtype=np.float32)
+            tiles.append(
+                (
+                    tile_id,
+                    {
+                        "dense": (
+                            base64.b64encode(dense.tobytes()).decode()
+                            if self.as_base64
+                            else dense
+                        ),
+                        "dtype": "float32",
+                        "min_value": float(np.min(dense)),
+                        "max_value": float(np.max(dense)),
+                        "tile_pos": [int(x)],
+                        "tile_zoom_pos": int(z),
+                    },
+                )
+            )
+        return tiles
+
+
+class FakeComm:
+    """Stands in for the kernel comm of a widget.
+
+    Delivers messages from the "front end" to the widget's handler and
+    serializes each message sent by the widget like the comm would, counting
+    the bytes sent.
+    """
+
+    comm_id = "fake-comm"
+
+    def __init__(self):
+        self.handler: typing.Callable[[dict], None] | None = None
+        self.nbytes = 0
+        self.responses = 0
+        self._condition = threading.Condition()
+
+    def on_msg(self, callback):
+        self.handler = callback
+
+    def close(self):
+        self.handler = None
+
+    def receive(self, content: dict):
+        msg = {"data": {"method": "custom", "content": content}}
+        assert self.handler is not None, "the comm is closed"
+        self.handler({"content": msg, "buffers": []})
+
+    def send(self, data, buffers=None):
+        self.nbytes += len(json.dumps(data))
+        self.nbytes += sum(memoryview(b).nbytes for b in buffers or [])
+        if data["content"].get("done", True):
+            with self._condition:
+                self.responses += 1
+                self._condition.notify_all()
+
+    def deliver(self, messages: list[dict], timeout: float = 60):
+        """Deliver custom messages and wait for all (final) responses."""
+        with self._condition:
+            expected = self.responses + len(messages)
+        for content in messages:
+            self.receive(content)
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self.responses >= expected, timeout
+            ):
+                raise TimeoutError
+
+
+@pytest.fixture
+def client():
+    """A tileset client connected to a `FakeComm`, with caching disabled."""
+    client = JupyterTilesetClient()
+    client.comm = FakeComm()
+    client.tile_cache.max_bytes = 0
+    yield client
+    client.close()
+
+
+@pytest.fixture(params=[False, True], ids=["numpy", "base64"])
+def tilesets(request):
+    """The uids of four synthetic tilesets (with NumPy or base64 tiles)."""
+    tilesets = [SyntheticTileset(as_base64=request.param) for _ in range(4)]
+    yield [TilesetRegistry.add(ts) for ts in tilesets]
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+
+def run(code: str):
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_interpreter_startup(benchmark):
+    """The baseline for `test_import`."""
+    benchmark.pedantic(run, args=("pass",), rounds=10)
+
+
+def test_import(benchmark):
+    benchmark.pedantic(run, args=("import higlass",), rounds=10)
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from higlass._scale import Scale
+
+N = 1_000_000
+
+# the chromosome sizes of hg38 (without alternate contigs)
+CHROMSIZES = {
+    "chr1": 248956422,
+    "chr2": 242193529,
+    "chr3": 198295559,
+    "chr4": 190214555,
+    "chr5": 181538259,
+    "chr6": 170805979,
+    "chr7": 159345973,
+    "chr8": 145138636,
+    "chr9": 138394717,
+    "chr10": 133797422,
+    "chr11": 135086622,
+    "chr12": 133275309,
+    "chr13": 114364328,
+    "chr14": 107043718,
+    "chr15": 101991189,
+    "chr16": 90338345,
+    "chr17": 83257441,
+    "chr18": 80373285,
+    "chr19": 58617616,
+    "chr20": 64444167,
+    "chr21": 46709983,
+    "chr22": 50818468,
+    "chrX": 156040895,
+    "chrY": 57227415,
+}
+
+
+@pytest.fixture(scope="module")
+def scale():
+    return Scale(CHROMSIZES, binsize=1000)
+
+
+@pytest.fixture(scope="module")
+def positions():
+    rng = np.random.default_rng(0)
+    chroms = rng.choice(list(CHROMSIZES), N)
+    return [(chrom, int(rng.integers(CHROMSIZES[chrom]))) for chrom in chroms]
+
+
+@pytest.fixture(scope="module")
+def indices(scale):
+    rng = np.random.default_rng(0)
+    return rng.integers(len(scale), size=N).tolist()
+
+
+def test_call(benchmark, scale, positions):
+    benchmark.pedantic(lambda: [scale(p) for p in positions], rounds=3)
+
+
+def test_invert(benchmark, scale, indices):
+    benchmark.pedantic(lambda: [scale.invert(i) for i in indices], rounds=3)
+
+
+def test_bins(benchmark, scale, positions):
+    chroms, starts = (list(x) for x in zip(*positions))
+    benchmark.pedantic(scale.bins, args=(chroms, starts), rounds=3)
+
+
+def test_bins_codes(benchmark, scale, positions):
+    names = list(CHROMSIZES)
+    codes = np.array([names.index(chrom) for chrom, _ in positions])
+    starts = np.array([pos for _, pos in positions])
+    benchmark(scale.bins, codes, starts)
+
+
+def test_invert_bins(benchmark, scale, indices):
+    benchmark(scale.invert_bins, np.asarray(indices))
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+from higlass._tileset_registry import TilesetRegistry
+from higlass._widget import _encode_tiles
+from higlass.tilesets import Tileset
+
+counter = itertools.count()
+
+
+def tile_requests(uids: list[str], batches: int, tiles_per_tileset: int):
+    """Tile requests like those sent by the front end while panning."""
+    return [
+        {
+            "id": f"r{next(counter)}",
+            "payload": {
+                "type": "tiles",
+                "tileIds": [
+                    f"{uid}.12.{batch * tiles_per_tileset + x}"
+                    for uid in uids
+                    for x in range(tiles_per_tileset)
+                ],
+            },
+        }
+        for batch in range(batches)
+    ]
+
+
+def test_tileset_info(benchmark, client, tilesets):
+    def run():
+        client.info_cache.clear()
+        client.comm.deliver(
+            [
+                {
+                    "id": f"r{next(counter)}",
+                    "payload": {"type": "tileset_info", "tilesetUid": uid},
+                }
+                for uid in tilesets * 25
+            ],
+        )
+
+    benchmark(run)
+
+
+@pytest.mark.parametrize("binary", [True, False], ids=["binary", "json"])
+@pytest.mark.parametrize("stream", [True, False], ids=["stream", "batch"])
+def test_tile_batches(benchmark, client, tilesets, binary, stream):
+    client.binary = binary
+    client.stream_tiles = stream
+    benchmark(lambda: client.comm.deliver(tile_requests(tilesets, 20, 8)))
+    if benchmark.stats is not None:
+        rounds = benchmark.stats.stats.rounds
+        benchmark.extra_info["bytes_per_round"] = client.comm.nbytes // rounds
+
+
+def test_cached_tile_batches(benchmark, client, tilesets):
+    client.tile_cache.max_bytes = 2**30
+    messages = tile_requests(tilesets, 20, 8)
+    client.comm.deliver(messages)  # warm the cache
+    benchmark(lambda: client.comm.deliver(messages))
+
+
+def test_encode_tiles(benchmark, tilesets):
+    tileset = TilesetRegistry.get(tilesets[0])
+    assert isinstance(tileset, Tileset)
+    tile_ids = [f"{tilesets[0]}.12.{x}" for x in range(256)]
+    tiles = {tile_id: tile for tile_id, tile in tileset.tiles(tile_ids)}
+    benchmark(_encode_tiles, tiles)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import higlass as hg
+
+N = 10_000_000
+
+
+@pytest.fixture(scope="module")
+def values():
+    values = np.random.default_rng(0).random(N, dtype=np.float32)
+    values[::7] = np.nan
+    return values
+
+
+@pytest.mark.parametrize("aggregation", ["mean", "max", "sum"])
+def test_array_pyramid(benchmark, values, aggregation):
+    benchmark.pedantic(hg.array, args=(values,), kwargs={"aggregation": aggregation})
+
+
+def test_array_tiles(benchmark, values):
+    tileset = hg.array(values)
+    max_zoom = tileset.info()["max_zoom"]
+    tile_ids = [f"x.{z}.{x}" for z in range(max_zoom + 1) for x in range(2**z)]
+    benchmark(tileset.tiles, tile_ids[:4096])
+
+
+@pytest.fixture(scope="module")
+def peaks():
+    rng = np.random.default_rng(0)
+    starts = rng.integers(0, 3_000_000_000, N // 5)
+    return {
+        "chrom": np.full(len(starts), "chr1"),
+        "start": starts,
+        "end": starts + rng.integers(100, 5000, len(starts)),
+        "score": rng.random(len(starts)),
+    }
+
+
+def test_intervals_index(benchmark, peaks):
+    benchmark.pedantic(
+        hg.intervals,
+        args=(peaks, {"chr1": 3_000_000_000}),
+        kwargs={"importance": "score"},
+    )
+
+
+def test_intervals_tiles(benchmark, peaks):
+    tileset = hg.intervals(peaks, {"chr1": 3_000_000_000}, importance="score")
+    tile_ids = [f"x.{z}.{2**z // 3}" for z in range(tileset.max_zoom + 1)]
+    benchmark(tileset.tiles, tile_ids)
+
+
+def test_intervals_tiles_with_long_interval(benchmark, peaks):
+    # a genome-spanning interval overlaps every tile
+    peaks = {name: column.copy() for name, column in peaks.items()}
+    peaks["start"][0], peaks["end"][0] = 0, 3_000_000_000
+    tileset = hg.intervals(peaks, {"chr1": 3_000_000_000}, importance="score")
+    z = tileset.max_zoom
+    benchmark(tileset.tiles, [f"x.{z}.{x}" for x in range(0, 2**z, 2**z // 64)])
+
+
+@pytest.fixture(scope="module")
+def contacts():
+    rng = np.random.default_rng(0)
+    x = rng.integers(0, 3_000_000_000, N // 5)
+    # most contacts are close to the diagonal
+    y = np.clip(x + rng.normal(0, 1e7, len(x)).astype(np.int64), 0, None)
+    return x, y
+
+
+def test_points_index(benchmark, contacts):
+    benchmark.pedantic(hg.points, args=contacts)
+
+
+def test_points_tiles(benchmark, contacts):
+    tileset = hg.points(*contacts)
+    tile_ids = [f"x.{z}.{2**z // 3}.{2**z // 3}" for z in range(tileset.max_zoom + 1)]
+    benchmark(tileset.tiles, tile_ids)
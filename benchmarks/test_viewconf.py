@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import functools
+import itertools
+
+import higlass as hg
+
+N_VIEWS = 200
+N_TRACKS = 500
+
+
+def make_tracks(n: int):
+    return [
+        hg.track("horizontal-line", server="https://example.com", tilesetUid=f"t{i}")
+        for i in range(n)
+    ]
+
+
+def make_views(n: int):
+    return [
+        hg.view(hg.track("heatmap", tilesetUid=f"h{i}"), hg.track("top-axis"))
+        for i in range(n)
+    ]
+
+
+def test_track(benchmark):
+    benchmark(make_tracks, N_TRACKS)
+
+
+def test_track_opts(benchmark):
+    tracks = make_tracks(N_TRACKS)
+    benchmark(lambda: [t.opts(color="red", lineStrokeWidth=2) for t in tracks])
+
+
+def test_combine(benchmark):
+    tracks = make_tracks(N_TRACKS)
+    benchmark(lambda: functools.reduce(hg.combine, tracks[:50]))
+
+
+def test_view_with_many_tracks(benchmark):
+    tracks = make_tracks(N_TRACKS)
+    benchmark(hg.view, *tracks)
+
+
+def test_view_properties_chain(benchmark):
+    view = hg.view(*make_tracks(N_TRACKS))
+
+    def chain():
+        derived = view
+        for i in range(100):
+            derived = derived.properties(zoomFixed=i % 2 == 0)
+        return derived
+
+    benchmark(chain)
+
+
+def test_view(benchmark):
+    benchmark(make_views, N_VIEWS)
+
+
+def test_hconcat(benchmark):
+    views = make_views(N_VIEWS)
+    benchmark(lambda: functools.reduce(hg.hconcat, views))
+
+
+def test_vconcat(benchmark):
+    views = make_views(N_VIEWS)
+    benchmark(lambda: functools.reduce(hg.vconcat, views))
+
+
+def test_hconcat_many(benchmark):
+    views = make_views(N_VIEWS)
+    benchmark(hg.hconcat, *views)
+
+
+def test_grid(benchmark):
+    views = make_views(N_VIEWS)
+    benchmark(lambda: hg.grid(*views, columns=10))
+
+
+def test_locks(benchmark):
+    views = make_views(N_VIEWS)
+    viewconf = functools.reduce(hg.hconcat, views)
+    locks = [hg.lock(a, b) for a, b in itertools.pairwise(views)]
+    benchmark(viewconf.locks, *locks)
+
+
+def test_dump(benchmark):
+    viewconf = functools.reduce(hg.hconcat, make_views(N_VIEWS))
+    benchmark(viewconf.model_dump_json, exclude_none=True)
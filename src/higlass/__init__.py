@@ -23,6 +23,7 @@ from higlass.api import (
     combine,
     concat,
     divide,
+    grid,
     hconcat,
     lock,
     track,
@@ -31,15 +32,21 @@ from higlass.api import (
 )
 from higlass.server import HiGlassServer
 from higlass.tilesets import (
+    ArrayTileset,
     InlineTileset,
+    IntervalTileset,
+    PointTileset,
     Tileset,
+    array,
     bed2ddb,
     beddb,
     bigwig,
     chromsizes,
     cooler,
     hitile,
+    intervals,
     multivec,
+    points,
     remote,
 )
 
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import contextvars
+import threading
+import typing
+
+__all__ = ["CancelledError", "cancel_scope", "cancelled", "check_cancelled"]
+
+CancelledError = concurrent.futures.CancelledError
+
+_cancel_event: contextvars.ContextVar[threading.Event | None] = contextvars.ContextVar(
+    "higlass_cancel_event", default=None
+)
+
+
+def cancelled() -> bool:
+    """Whether the request currently being served has been cancelled."""
+    event = _cancel_event.get()
+    return event is not None and event.is_set()
+
+
+def check_cancelled() -> None:
+    """Raise `CancelledError` if the current request has been cancelled."""
+    if cancelled():
+        raise CancelledError
+
+
+@contextlib.contextmanager
+def cancel_scope(event: threading.Event) -> typing.Iterator[None]:
+    """Associate a cancellation event with the code run in this context."""
+    token = _cancel_event.set(event)
+    try:
+        yield
+    finally:
+        _cancel_event.reset(token)
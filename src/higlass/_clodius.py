@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import base64
+import pathlib
+import typing
+from dataclasses import dataclass, field
+
+from higlass._handles import handle_pool
+
+__all__ = ["bigwig_tiles", "hitile_tiles", "multivec_tiles"]
+
+FilePath = typing.Union[str, pathlib.Path]  # noqa: UP007
+
+
+@dataclass
+class _Handle:
+    """An open file along with metadata read when it was opened.
+
+    `clodius.tiles.*.tiles` take a file path, and reopen the file and parse its
+    headers for every tile. Keeping both around in the `handle_pool` avoids
+    this work for subsequent tiles.
+    """
+
+    file: typing.Any
+    meta: dict[str, typing.Any] = field(default_factory=dict)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def _b64(array: typing.Any, dtype: str) -> str:
+    import numpy as np
+
+    return base64.b64encode(np.asarray(array, dtype=dtype)).decode("utf-8")
+
+
+def _open_hitile(filepath: str) -> _Handle:
+    import h5py
+
+    return _Handle(h5py.File(filepath, "r"))
+
+
+def hitile_tiles(filepath: FilePath, tile_ids: typing.Sequence[str]) -> list:
+    """Equivalent to `clodius.tiles.hitile.tiles`, reusing open file handles."""
+    from clodius.tiles.hitile import get_data
+
+    tiles = []
+    with handle_pool.open(filepath, _open_hitile) as handle:
+        for tile_id in tile_ids:
+            zoom, pos = map(int, tile_id.split(".")[1:3])
+            dense, mins, maxs = get_data(handle.file, zoom, pos)
+            tile = {
+                "dense": _b64(dense, "float32"),
+                "mins": _b64(mins, "float32"),
+                "maxs": _b64(maxs, "float32"),
+                "dtype": "float32",
+            }
+            tiles.append((tile_id, tile))
+    return tiles
+
+
+def _open_multivec(filepath: str) -> _Handle:
+    import h5py
+
+    f = h5py.File(filepath, "r")
+    resolutions = sorted((int(r) for r in f["resolutions"].keys()), reverse=True)
+    tile_size = int(f["info"].attrs["tile-size"])
+    chrom_names = f["chroms"]["name"][:]
+    chrom_lengths = f["chroms"]["length"][:]
+    values = f["resolutions"][str(resolutions[0])]["values"]
+    shape = list(values[chrom_names[0]].shape)
+    shape[0] = tile_size
+    return _Handle(
+        f,
+        {
+            "resolutions": resolutions,
+            "tile_size": tile_size,
+            "shape": shape,
+            "chromsizes": list(zip(chrom_names, chrom_lengths)),
+        },
+    )
+
+
+def multivec_tiles(filepath: FilePath, tile_ids: typing.Sequence[str]) -> list:
+    """Equivalent to `clodius.tiles.multivec.tiles`, reusing open file handles."""
+    import numpy as np
+    from clodius.tiles.multivec import get_tile
+
+    f16 = np.finfo("float16")
+    tiles = []
+    with handle_pool.open(filepath, _open_multivec) as handle:
+        meta = handle.meta
+        tile_size = meta["tile_size"]
+        for tile_id in tile_ids:
+            zoom, pos = map(int, tile_id.split(".")[1:3])
+            resolution = meta["resolutions"][zoom]
+            start = pos * tile_size * resolution
+            end = start + tile_size * resolution
+            dense = get_tile(
+                handle.file, meta["chromsizes"], resolution, start, end, meta["shape"]
+            )
+            if len(dense) < tile_size:
+                # pad tiles that extend past the end of the data
+                padding = np.zeros((tile_size - len(dense), meta["shape"][1]))
+                dense = np.vstack([dense, padding])
+            ma = dense.T
+            has_nan = np.isnan(ma).any()
+            ma_min = ma.min() if ma.size else 0
+            ma_max = ma.max() if ma.size else 0
+            use_f16 = not has_nan and f16.min < ma_min and ma_max < f16.max
+            dtype = "float16" if use_f16 else "float32"
+            tile = {"dense": _b64(ma.ravel(), dtype), "dtype": dtype, "shape": ma.shape}
+            tiles.append((tile_id, tile))
+    return tiles
+
+
+def _open_bigwig(filepath: str) -> _Handle:
+    from clodius.tiles.bigwig import get_chromsizes
+
+    f = open(filepath, "rb")
+    chromsizes = [[chrom, int(size)] for chrom, size in get_chromsizes(f).items()]
+    return _Handle(f, {"chromsizes": chromsizes})
+
+
+def bigwig_tiles(filepath: FilePath, tile_ids: typing.Sequence[str]) -> list:
+    """Equivalent to `clodius.tiles.bigwig.tiles`, reusing open file handles."""
+    from clodius.tiles.bigwig import tiles
+
+    with handle_pool.open(filepath, _open_bigwig) as handle:
+        return tiles(handle.file, tile_ids, chromsizes=handle.meta["chromsizes"])
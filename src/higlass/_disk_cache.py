@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import base64
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+import typing
+
+__all__ = ["DiskTileCache", "default_cache_dir"]
+
+
+def default_cache_dir() -> pathlib.Path:
+    """The default location of the on-disk tile cache."""
+    root = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(root) / "higlass"
+
+
+def _encode(obj: typing.Any) -> typing.Any:
+    if hasattr(obj, "__array_interface__"):  # NumPy arrays
+        return {
+            "__ndarray__": base64.b64encode(obj.tobytes()).decode(),
+            "dtype": obj.dtype.str,
+            "shape": list(obj.shape),
+        }
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def _decode(obj: dict) -> typing.Any:
+    if "__ndarray__" in obj:
+        import numpy as np
+
+        data = base64.b64decode(obj["__ndarray__"])
+        return np.frombuffer(data, dtype=obj["dtype"]).reshape(obj["shape"])
+    return obj
+
+
+def dumps(tile: typing.Any) -> bytes:
+    """Serialize a tile (JSON with support for NumPy arrays)."""
+    return json.dumps(tile, default=_encode, separators=(",", ":")).encode()
+
+
+def loads(data: bytes) -> typing.Any:
+    """Deserialize a tile serialized with `dumps`."""
+    return json.loads(data, object_hook=_decode)
+
+
+class DiskTileCache:
+    """A persistent tile cache in an SQLite database.
+
+    Tiles are keyed by a stable tileset fingerprint (see `Tileset.fingerprint`)
+    and the tile position (the tile id without its tileset uid), so cached
+    tiles can be shared between kernels and sessions. The database may be
+    used by several processes at once. When the cached tiles exceed
+    `max_bytes`, the least recently used are evicted.
+
+    Parameters
+    ----------
+    path : str | pathlib.Path, optional
+        The database file (default: ``tiles.sqlite`` in `default_cache_dir`).
+    max_bytes : int, optional
+        The maximum total size of cached tiles (default: 2 GiB).
+    """
+
+    # the number of writes between checks of the total size
+    _evict_interval = 64
+
+    def __init__(
+        self,
+        path: str | pathlib.Path | None = None,
+        max_bytes: int = 2 * 2**30,
+    ) -> None:
+        if path is None:
+            path = default_cache_dir() / "tiles.sqlite"
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tiles ("
+                " fingerprint TEXT NOT NULL,"
+                " position TEXT NOT NULL,"
+                " data BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " accessed REAL NOT NULL,"
+                " PRIMARY KEY (fingerprint, position))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS tiles_accessed ON tiles(accessed)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # one connection per thread; sqlite handles locking between processes
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(
+        self, fingerprint: str, positions: typing.Sequence[str]
+    ) -> dict[str, typing.Any]:
+        """Look up cached tiles by position, returning those found."""
+        if not positions:
+            return {}
+        conn = self._connect()
+        params = ",".join("?" * len(positions))
+        rows = conn.execute(
+            f"SELECT position, data FROM tiles "
+            f"WHERE fingerprint = ? AND position IN ({params})",
+            (fingerprint, *positions),
+        ).fetchall()
+        if rows:
+            with conn:
+                conn.execute(
+                    f"UPDATE tiles SET accessed = ? "
+                    f"WHERE fingerprint = ? AND position IN ({params})",
+                    (time.time(), fingerprint, *positions),
+                )
+        return {position: loads(data) for position, data in rows}
+
+    def put_many(
+        self, fingerprint: str, tiles: typing.Iterable[tuple[str, typing.Any]]
+    ) -> None:
+        """Add tiles (by position) to the cache."""
+        now = time.time()
+        rows = []
+        for position, tile in tiles:
+            try:
+                data = dumps(tile)
+            except (TypeError, ValueError):
+                continue  # not serializable, only cached in memory
+            rows.append((fingerprint, position, data, len(data), now))
+        if not rows:
+            return
+        conn = self._connect()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO tiles VALUES (?,?,?,?,?)", rows)
+        self._writes += len(rows)
+        if self._writes >= self._evict_interval:
+            self._writes = 0
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used tiles until within `max_bytes`."""
+        conn = self._connect()
+        with conn:
+            (total,) = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM tiles"
+            ).fetchone()
+            if total <= self.max_bytes:
+                return
+            excess = total - self.max_bytes
+            evicted = []
+            rows = conn.execute("SELECT rowid, size FROM tiles ORDER BY accessed")
+            for rowid, size in rows:
+                if excess <= 0:
+                    break
+                evicted.append((rowid,))
+                excess -= size
+            conn.executemany("DELETE FROM tiles WHERE rowid = ?", evicted)
+
+    def stats(self) -> dict[str, int]:
+        """Summary statistics for the cache."""
+        (tiles, nbytes) = (
+            self._connect()
+            .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM tiles")
+            .fetchone()
+        )
+        return {"tiles": tiles, "nbytes": nbytes, "max_bytes": self.max_bytes}
+
+    def clear(self) -> None:
+        """Remove all cached tiles."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM tiles")
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+import typing
+
+__all__ = ["EventLoopThread"]
+
+T = typing.TypeVar("T")
+
+
+class EventLoopThread:
+    """An asyncio event loop running in a background (daemon) thread.
+
+    The loop is started on first use. Coroutines submitted from other threads
+    run with a copy of the submitting thread's context variables.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The event loop, started on first use."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="higlass-event-loop", daemon=True
+                ).start()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, awaitable: typing.Awaitable[T]) -> concurrent.futures.Future[T]:
+        """Schedule an awaitable on the event loop.
+
+        Cancelling the returned future cancels the underlying task.
+        """
+        context = contextvars.copy_context()
+
+        async def run() -> T:
+            for var, value in context.items():
+                var.set(value)
+            return await awaitable
+
+        return asyncio.run_coroutine_threadsafe(run(), self.loop)
+
+    def run(self, awaitable: typing.Awaitable[T]) -> T:
+        """Run an awaitable on the event loop and wait for its result."""
+        future = self.submit(awaitable)
+        try:
+            return future.result()
+        finally:
+            future.cancel()
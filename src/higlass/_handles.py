@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import collections
+import contextlib
+import os
+import pathlib
+import threading
+import time
+import typing
+
+__all__ = ["FileHandlePool", "handle_pool"]
+
+# the file path, the opener, and the file's modification time and size
+HandleKey = tuple[str, typing.Callable, int, int]
+
+
+def _key(filepath: str | pathlib.Path, opener: typing.Callable) -> HandleKey:
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        # let the opener raise
+        return (str(filepath), opener, -1, -1)
+    return (str(filepath), opener, stat.st_mtime_ns, stat.st_size)
+
+
+class FileHandlePool:
+    """A pool of open file handles, reused across tile requests.
+
+    Handles are opened on first use and kept open (per file and per opener)
+    until they have been idle for longer than `idle_timeout` seconds, or
+    until more than `max_idle` idle handles are open, in which case the
+    least recently used are closed. A handle is only ever lent to one
+    caller at a time, and handles in use are not limited, nor counted
+    towards `max_idle`. Handles of files that were modified since they were
+    opened are not reused. Each process has its own pool.
+
+    Parameters
+    ----------
+    max_idle : int, optional
+        The maximum number of idle handles kept open (default: 32).
+    idle_timeout : float, optional
+        Seconds after which an unused handle is closed (default: 300).
+    """
+
+    def __init__(self, max_idle: int = 32, idle_timeout: float = 300.0) -> None:
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle: collections.OrderedDict[HandleKey, tuple[typing.Any, float]] = (
+            collections.OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+    @contextlib.contextmanager
+    def open(
+        self,
+        filepath: str | pathlib.Path,
+        opener: typing.Callable[[str], typing.Any],
+    ) -> typing.Iterator[typing.Any]:
+        """Borrow an open handle for a file.
+
+        Parameters
+        ----------
+        filepath : str | pathlib.Path
+            The file to open.
+        opener : Callable[[str], Any]
+            Opens the file, returning a handle with a ``close`` method.
+
+        Yields
+        ------
+        Any
+            The handle, which must not be closed or used after the context.
+        """
+        key = _key(filepath, opener)
+        with self._lock:
+            entry = self._idle.pop(key, None)
+            stale = self._pop_stale(modified=key)
+        self._close(stale)
+
+        handle = opener(str(filepath)) if entry is None else entry[0]
+        try:
+            yield handle
+        except BaseException:
+            # the handle may be in a bad state
+            self._close([handle])
+            raise
+
+        with self._lock:
+            # another caller may have returned a handle for the file meanwhile
+            replaced = self._idle.pop(key, None)
+            self._idle[key] = (handle, time.monotonic())
+            stale = self._pop_stale()
+        if replaced is not None:
+            stale.append(replaced[0])
+        self._close(stale)
+
+    def clear(self) -> None:
+        """Close all idle handles."""
+        with self._lock:
+            handles = [handle for handle, _ in self._idle.values()]
+            self._idle.clear()
+        self._close(handles)
+
+    def _pop_stale(self, modified: HandleKey | None = None) -> list[typing.Any]:
+        stale = []
+        if modified is not None:
+            # handles of earlier versions of the file
+            path, opener = modified[:2]
+            for key in [k for k in self._idle if k[:2] == (path, opener)]:
+                stale.append(self._idle.pop(key)[0])
+        deadline = time.monotonic() - self.idle_timeout
+        while self._idle:
+            key, (handle, last_used) = next(iter(self._idle.items()))
+            if len(self._idle) <= self.max_idle and last_used > deadline:
+                break
+            del self._idle[key]
+            stale.append(handle)
+        return stale
+
+    @staticmethod
+    def _close(handles: list[typing.Any]) -> None:
+        for handle in handles:
+            with contextlib.suppress(Exception):
+                handle.close()
+
+
+handle_pool = FileHandlePool()
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+
+__all__ = ["IntervalIndex"]
+
+
+def _ranks(importance: np.ndarray) -> np.ndarray:
+    """Rank items by importance (0 for the most important), breaking ties in
+    favor of earlier items."""
+    import numpy as np
+
+    by_importance = np.argsort(-importance, kind="stable")
+    ranks = np.empty(len(by_importance), dtype=np.int64)
+    ranks[by_importance] = np.arange(len(by_importance))
+    return ranks
+
+
+def _top_per_group(groups: np.ndarray, ranks: np.ndarray, k: int) -> np.ndarray | None:
+    """Mask the `k` best ranked items of each group (sorted by group).
+
+    `ranks` are unique, non-negative integers, the lowest being the most
+    important. Returns None if no group has more than `k` items.
+    """
+    import numpy as np
+
+    if len(groups) <= k:
+        return None
+    group_starts = np.flatnonzero(np.diff(groups, prepend=groups[0] - 1))
+    counts = np.diff(group_starts, append=len(groups))
+    overfull = counts > k
+    if not overfull.any():
+        return None
+
+    # sort the items of the overfull groups by group, then by rank, with a
+    # single integer key (much faster than `np.lexsort`)
+    members = np.flatnonzero(np.repeat(overfull, counts))
+    member_groups = np.repeat(np.arange(len(counts)), counts)[members]
+    key = member_groups * (int(ranks.max()) + 1) + ranks[members]
+    order = np.argsort(key)
+    ranked = members[order]
+    ranked_groups = member_groups[order]
+    firsts = np.flatnonzero(np.diff(ranked_groups, prepend=-1))
+    sizes = np.diff(firsts, append=len(ranked))
+    ranks_in_group = np.arange(len(ranked)) - np.repeat(firsts, sizes)
+
+    keep = np.ones(len(groups), dtype=bool)
+    keep[ranked[ranks_in_group >= k]] = False
+    return keep
+
+
+class IntervalIndex:
+    """An index of intervals for serving them as tiles of at most `k` each.
+
+    Intervals are sorted by start once. For each zoom level, the index keeps
+    the `k` most important intervals starting in each tile, found by
+    thinning out the level above it (the most important intervals of a tile
+    are among those of its two children).
+
+    Within a level, intervals are grouped into length classes, where class
+    ``j`` holds those no longer than ``tile_size * 2**j``, and sorted by
+    start within each class. The intervals of a class that may overlap a
+    tile start at most its maximum length before the tile, so a tile is
+    answered with two binary searches per class. The intervals these yield
+    mostly overlap the tile, no matter how long the longest interval is or
+    how many intervals there are in total.
+
+    Parameters
+    ----------
+    starts, ends : numpy.ndarray
+        The (absolute, non-negative) start and end positions of the
+        intervals.
+    importance : numpy.ndarray
+        The importance of each interval. More important intervals are kept
+        at lower zoom levels.
+    tile_size : int
+        The width of the tiles of the highest zoom level.
+    max_zoom : int
+        The highest zoom level.
+    k : int
+        The maximum number of intervals per tile.
+    """
+
+    def __init__(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        importance: np.ndarray,
+        tile_size: int,
+        max_zoom: int,
+        k: int,
+    ):
+        import numpy as np
+
+        self.tile_size = tile_size
+        self.max_zoom = max_zoom
+        self.k = k
+
+        self.order = np.argsort(starts, kind="stable")
+        self.starts = starts[self.order].astype(np.int64)
+        self.ends = ends[self.order].astype(np.int64)
+        self.ranks = _ranks(importance[self.order])
+
+        # the smallest class `j` with `length <= tile_size * 2**j`
+        lengths = np.maximum(self.ends - self.starts, 1)
+        classes = np.ceil(np.log2(lengths / tile_size)).clip(0).astype(np.int64)
+        classes += lengths > (tile_size << classes)  # guards against rounding
+        self.classes = classes
+        self.num_classes = int(classes.max(initial=0)) + 1
+        # combines a class and a start into a single sort key
+        self._stride = int(self.starts.max(initial=0)) + 1
+
+        # from the highest zoom level down, sharing unchanged levels
+        positions = np.arange(len(self.order))
+        level = self._level(positions)
+        self.levels = [level] * (max_zoom + 1)
+        for zoom in range(max_zoom, -1, -1):
+            tiles = self.starts[positions] // self.tile_width(zoom)
+            keep = _top_per_group(tiles, self.ranks[positions], k)
+            if keep is not None:
+                positions = positions[keep]
+                level = self._level(positions)
+            self.levels[zoom] = level
+
+    def _level(self, positions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        import numpy as np
+
+        # `positions` are in order of start, which a stable sort keeps
+        classes = self.classes[positions]
+        positions = positions[np.argsort(classes, kind="stable")]
+        keys = self.classes[positions] * self._stride + self.starts[positions]
+        return positions, keys
+
+    def tile_width(self, zoom: int) -> int:
+        """The width of the tiles at a zoom level."""
+        return self.tile_size * 2 ** (self.max_zoom - zoom)
+
+    def query(self, zoom: int, pos: int) -> np.ndarray:
+        """The intervals of a tile, as indices into the original intervals.
+
+        Returns (at most `k` of) the most important intervals overlapping
+        the tile, in order of their start.
+        """
+        import numpy as np
+
+        positions, keys = self.levels[zoom]
+        width = self.tile_width(zoom)
+        tile_start, tile_end = pos * width, (pos + 1) * width
+        classes = np.arange(self.num_classes, dtype=np.int64)
+        offsets = classes * self._stride
+        # intervals of class `j` are at most `tile_size * 2**j` long
+        reach = np.maximum(tile_start - (self.tile_size << classes), 0)
+        lo = np.searchsorted(keys, offsets + np.minimum(reach, self._stride))
+        hi = np.searchsorted(keys, offsets + min(tile_end, self._stride))
+        found = np.concatenate(
+            [positions[a:b] for a, b in zip(lo.tolist(), hi.tolist()) if b > a]
+            or [positions[:0]]
+        )
+        # ends are exclusive
+        found = found[self.ends[found] > tile_start]
+        if len(found) > self.k:
+            found = found[np.argpartition(self.ranks[found], self.k - 1)[: self.k]]
+        return self.order[np.sort(found)]
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import collections
+import math
+import threading
+
+__all__ = ["Histogram", "Metrics"]
+
+
+class Histogram:
+    """A latency histogram with logarithmic (power of two) buckets.
+
+    Bucket ``i`` counts durations up to ``2**i`` microseconds, so quantiles
+    are accurate to within a factor of two, while recording a value is
+    constant time.
+    """
+
+    buckets = 40  # up to ~12 days
+
+    def __init__(self) -> None:
+        self.counts = [0] * self.buckets
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        micros = seconds * 1e6
+        index = 0 if micros <= 1 else math.ceil(math.log2(micros))
+        self.counts[min(index, self.buckets - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """The (approximate) `q`-quantile of the recorded durations."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(max(2**index / 1e6, self.min), self.max)
+        return self.max
+
+    def summary(self) -> dict[str, float]:
+        """Summary statistics (in seconds)."""
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+class Metrics:
+    """Thread-safe counters and latency histograms, overall and per tileset.
+
+    Values recorded for a tileset also count towards the overall totals.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all recorded values."""
+        with self._lock:
+            self._counters: dict[str | None, collections.Counter[str]] = (
+                collections.defaultdict(collections.Counter)
+            )
+            self._latency: dict[str | None, dict[str, Histogram]] = (
+                collections.defaultdict(lambda: collections.defaultdict(Histogram))
+            )
+
+    def count(self, name: str, value: int = 1, tileset: str | None = None) -> None:
+        """Increment a counter."""
+        if not value:
+            return
+        with self._lock:
+            self._counters[None][name] += value
+            if tileset is not None:
+                self._counters[tileset][name] += value
+
+    def observe(self, name: str, seconds: float, tileset: str | None = None) -> None:
+        """Record a duration."""
+        with self._lock:
+            self._latency[None][name].add(seconds)
+            if tileset is not None:
+                self._latency[tileset][name].add(seconds)
+
+    def _section(self, key: str | None) -> dict:
+        return {
+            "counters": dict(self._counters.get(key, {})),
+            "latency": {
+                name: histogram.summary()
+                for name, histogram in self._latency.get(key, {}).items()
+            },
+        }
+
+    def snapshot(self) -> dict:
+        """The recorded values, overall (``"total"``) and per tileset."""
+        with self._lock:
+            keys = self._counters.keys() | self._latency.keys()
+            tilesets = sorted(uid for uid in keys if uid is not None)
+            return {
+                "total": self._section(None),
+                "tilesets": {uid: self._section(uid) for uid in tilesets},
+            }
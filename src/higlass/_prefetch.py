@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import concurrent.futures
+import contextvars
+import itertools
+import logging
+import typing
+
+from higlass._scheduler import PREFETCH
+from higlass.tiles import max_zoom, num_tiles, tile_range, zoom_level
+
+if typing.TYPE_CHECKING:
+    from higlass._widget import HiGlassWidget, JupyterTilesetClient
+
+__all__ = ["TilePrefetcher"]
+
+logger = logging.getLogger("higlass.widget")
+
+# whether tiles are fetched for prefetching (rather than for the front end),
+# recorded in the client's `prefetch_metrics`
+prefetching: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "prefetching", default=False
+)
+
+Domain = tuple[float, float]
+
+
+def _jupyter_tracks(view: dict) -> typing.Iterator[tuple[str, dict]]:
+    """Yield (position, track) for each track of a view served by Jupyter."""
+    for position, tracks in (view.get("tracks") or {}).items():
+        for track in tracks or []:
+            for trk in [track, *(track.get("contents") or [])]:
+                if trk.get("server") == "jupyter" and trk.get("tilesetUid"):
+                    yield position, trk
+
+
+def _expand(positions: range, count: int) -> range:
+    return range(max(0, positions.start - 1), min(count, positions.stop + 1))
+
+
+def neighboring_tiles(
+    info: typing.Mapping,
+    domains: list[Domain],
+    width: float,
+    suffix: str = "",
+) -> list[str]:
+    """Tile positions just outside the visible ones, or one zoom level deeper.
+
+    Parameters
+    ----------
+    info : Mapping
+        The tileset info.
+    domains : list[tuple[float, float]]
+        The visible domain for each dimension of the tileset.
+    width : float
+        The (assumed) width of the track in pixels.
+    suffix : str, optional
+        A suffix (e.g., ``".default"``) appended to each tile position.
+
+    Returns
+    -------
+    list[str]
+        Tile ids without the tileset uid, like ``"3.4.5"``.
+    """
+    zoom = max(
+        zoom_level(info, domain, width, axis) for axis, domain in enumerate(domains)
+    )
+
+    def positions(zoom: int, expand: bool) -> set[tuple[int, ...]]:
+        ranges = []
+        for axis, domain in enumerate(domains):
+            visible = tile_range(info, zoom, domain, axis)
+            if expand:
+                visible = _expand(visible, num_tiles(info, zoom, axis))
+            ranges.append(visible)
+        return set(itertools.product(*ranges))
+
+    visible = positions(zoom, expand=False)
+    tiles = [(zoom, pos) for pos in sorted(positions(zoom, expand=True) - visible)]
+    if zoom < max_zoom(info):
+        tiles.extend((zoom + 1, pos) for pos in sorted(positions(zoom + 1, False)))
+    return [".".join([str(z), *(str(i) for i in pos)]) + suffix for z, pos in tiles]
+
+
+class TilePrefetcher:
+    """Generates tiles around the current viewport of a widget in the background.
+
+    Watches the widget's `location` and, for each track served from Jupyter,
+    fills the client's tile cache with the tiles adjacent to the visible ones
+    and those one zoom level deeper. Only the latest location is prefetched;
+    work for earlier locations that hasn't started yet is dropped.
+
+    The work is queued in the client's `scheduler` at the lowest priority,
+    one tileset at a time, so it only runs while no requests from the front
+    end are waiting (and is shed first).
+
+    Parameters
+    ----------
+    widget : HiGlassWidget
+        The widget to prefetch tiles for.
+    client : JupyterTilesetClient
+        The client whose tile cache is filled.
+    width : float, optional
+        The assumed width (and height) of tracks in pixels (default: 800).
+    """
+
+    def __init__(
+        self,
+        widget: HiGlassWidget,
+        client: JupyterTilesetClient,
+        width: float = 800,
+    ) -> None:
+        self.widget = widget
+        self.client = client
+        self.width = width
+        # the queued (or running) step of the latest location
+        self._future: concurrent.futures.Future | None = None
+        self._generation = 0
+
+    def start(self) -> None:
+        """Start watching the widget's location."""
+        self.widget.observe(self._on_location, names="location")
+
+    def stop(self) -> None:
+        """Stop watching the widget's location and drop pending work."""
+        self.widget.unobserve(self._on_location, names="location")
+        self._supersede()
+
+    def _supersede(self) -> int:
+        self._generation += 1
+        if self._future is not None:
+            self._future.cancel()
+        return self._generation
+
+    def _on_location(self, change: dict) -> None:
+        generation = self._supersede()
+        location = change["new"]
+        self._schedule(lambda: self._run(self.plan(location), generation))
+
+    def _schedule(self, fn: typing.Callable[[], None]) -> None:
+        self._future = self.client.scheduler.put(fn, priority=PREFETCH, group=self)
+        self.client._executor.submit(self.client.scheduler.run_next)
+
+    def _run(self, plan: list[tuple[str, list[str]]], generation: int) -> None:
+        """Prefetch the first tileset of a plan, and queue the rest."""
+        if generation != self._generation or not plan:
+            return  # the viewport moved on
+        (tileset_uid, tile_ids), *rest = plan
+        self.prefetch(tileset_uid, tile_ids)
+        if rest:
+            self._schedule(lambda: self._run(rest, generation))
+
+    def plan(self, location: list) -> list[tuple[str, list[str]]]:
+        """The tiles to prefetch (by tileset uid) for a widget location."""
+        views = self.widget._viewconf.get("views") or []
+        if views and location and not isinstance(location[0], (list, tuple)):
+            location = [location]
+
+        plan = []
+        for view, coords in zip(views, location):
+            if not coords or len(coords) != 4:
+                continue
+            x, y = (coords[0], coords[1]), (coords[2], coords[3])
+            for position, track in _jupyter_tracks(view):
+                uid = track["tilesetUid"]
+                try:
+                    info = self.client._fetch_info(uid)
+                except KeyError:
+                    continue
+                options = track.get("options") or {}
+                if len(info.get("min_pos", [])) == 2:
+                    domains = [x, y]
+                    suffix = options.get("dataTransform")
+                else:
+                    domains = [y if position in ("left", "right") else x]
+                    suffix = options.get("aggregationMode")
+                suffix = f".{suffix}" if suffix else ""
+                tiles = neighboring_tiles(info, domains, self.width, suffix)
+                plan.append((uid, [f"{uid}.{tile}" for tile in tiles]))
+        return plan
+
+    def prefetch(self, tileset_uid: str, tile_ids: list[str]) -> None:
+        """Generate (uncached) tiles into the client's tile cache."""
+        missing = [
+            tile_id
+            for tile_id in tile_ids
+            if (tileset_uid, tile_id) not in self.client.tile_cache
+        ]
+        if not missing:
+            return
+        logger.debug("prefetch: %s (%d tiles)", tileset_uid, len(missing))
+        token = prefetching.set(True)
+        try:
+            self.client._fetch_tiles(tileset_uid, missing)
+        except Exception:
+            logger.exception("prefetch failed for tileset %s", tileset_uid)
+        finally:
+            prefetching.reset(token)
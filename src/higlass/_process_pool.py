@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import hashlib
+import logging
+import multiprocessing
+import pickle
+import threading
+import typing
+
+if typing.TYPE_CHECKING:
+    from higlass._tileset_registry import TilesetProtocol
+
+__all__ = ["ProcessPool"]
+
+logger = logging.getLogger("higlass.widget")
+
+
+# the tilesets rebuilt in a worker process, by uid and digest of their pickle
+_TILESETS: collections.OrderedDict[tuple[str, bytes], TilesetProtocol] = (
+    collections.OrderedDict()
+)
+_MAX_TILESETS = 32
+
+PickledTileset = tuple[tuple[str, bytes], bytes]
+
+
+class _UnpicklingError(Exception):
+    """A tileset could not be rebuilt in a worker process."""
+
+
+def _load(pickled: PickledTileset) -> TilesetProtocol:
+    key, data = pickled
+    tileset = _TILESETS.get(key)
+    if tileset is not None:
+        _TILESETS.move_to_end(key)
+        return tileset
+    try:
+        tileset = pickle.loads(data)
+    except Exception as e:
+        # e.g., the class of a tileset defined in a notebook (`__main__`)
+        raise _UnpicklingError(f"{type(e).__name__}: {e}") from None
+    _TILESETS[key] = tileset
+    if len(_TILESETS) > _MAX_TILESETS:
+        _TILESETS.popitem(last=False)
+    return tileset
+
+
+def _tiles(pickled: PickledTileset, tile_ids: list[str]) -> list:
+    return list(_load(pickled).tiles(tile_ids))
+
+
+class ProcessPool:
+    """Generates tiles in worker processes.
+
+    Tilesets are pickled (once) and sent with every call, and each worker
+    keeps the tilesets it rebuilt, so this is only suitable for tilesets
+    which are cheap to pickle, such as those created by `hg.cooler` and
+    friends that only hold a file path. Tilesets that can't be pickled, or
+    rebuilt in a worker (like those defined in a notebook), are served from
+    the current thread instead.
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        The number of worker processes (default: the number of CPUs).
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self._max_workers = max_workers
+        self._executor: concurrent.futures.ProcessPoolExecutor | None = None
+        self._pickled: dict[str, PickledTileset | None] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        """The process pool, started on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self._max_workers,
+                    # forking a (multi-threaded) kernel is unsafe
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _pickle(
+        self, tileset_uid: str, tileset: TilesetProtocol
+    ) -> PickledTileset | None:
+        with self._lock:
+            if tileset_uid in self._pickled:
+                return self._pickled[tileset_uid]
+        if not getattr(tileset, "_process_safe", True):
+            pickled = None
+        else:
+            pickled = self._dumps(tileset_uid, tileset)
+        with self._lock:
+            self._pickled[tileset_uid] = pickled
+        return pickled
+
+    @staticmethod
+    def _dumps(tileset_uid: str, tileset: TilesetProtocol) -> PickledTileset | None:
+        try:
+            data = pickle.dumps(tileset)
+        except Exception:
+            logger.debug("tileset %s can't be pickled, using threads", tileset_uid)
+            return None
+        # the digest tells apart tilesets that reuse a uid
+        return (tileset_uid, hashlib.sha1(data).digest()), data
+
+    def _use_threads(self, tileset_uid: str) -> None:
+        with self._lock:
+            self._pickled[tileset_uid] = None
+
+    def tiles(
+        self, tileset_uid: str, tileset: TilesetProtocol, tile_ids: list[str]
+    ) -> list:
+        """Get tiles from a tileset, in a worker process if possible.
+
+        Falls back to calling the tileset in the current thread if it opts
+        out (with a false `_process_safe` attribute), or can't be pickled or
+        rebuilt in a worker.
+        """
+        pickled = self._pickle(tileset_uid, tileset)
+        if pickled is not None:
+            try:
+                return self.executor.submit(_tiles, pickled, tile_ids).result()
+            except _UnpicklingError as e:
+                logger.debug(
+                    "tileset %s can't be rebuilt in a worker (%s), using threads",
+                    tileset_uid,
+                    e,
+                )
+                self._use_threads(tileset_uid)
+        return list(tileset.tiles(tile_ids))
+
+    def forget(self, tileset_uid: str) -> None:
+        """Drop the pickled copy of a tileset."""
+        with self._lock:
+            self._pickled.pop(tileset_uid, None)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
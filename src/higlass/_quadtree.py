@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import typing
+
+from higlass._intervals import _ranks, _top_per_group
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+
+__all__ = ["PointIndex", "morton"]
+
+# each coordinate gets 31 bits of a 62-bit code
+MAX_ZOOM = 31
+
+
+def _spread(values: np.ndarray) -> np.ndarray:
+    """Interleave the bits of (32-bit) integers with zeros."""
+    import numpy as np
+
+    values = values.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    for shift, mask in (
+        (16, 0x0000FFFF0000FFFF),
+        (8, 0x00FF00FF00FF00FF),
+        (4, 0x0F0F0F0F0F0F0F0F),
+        (2, 0x3333333333333333),
+        (1, 0x5555555555555555),
+    ):
+        values = (values | (values << np.uint64(shift))) & np.uint64(mask)
+    return values
+
+
+def morton(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """The Morton (Z-order) codes of integer cell coordinates.
+
+    The cells of a tile at any zoom level have consecutive codes, with the
+    bits of `x` in the even and those of `y` in the odd positions.
+    """
+    import numpy as np
+
+    return _spread(x) | (_spread(y) << np.uint64(1))
+
+
+class PointIndex:
+    """An index of 2D points for serving them as tiles of at most `k` each.
+
+    Points are sorted by the Morton code of the cell of the highest zoom
+    level they fall into, so the points of any tile (a node of the implied
+    quadtree) are a contiguous run of codes. For each zoom level, the index
+    keeps the `k` most important points of each tile, found by thinning out
+    the level above it. A tile is answered with two binary searches into its
+    level, no matter how many points there are in total.
+
+    Parameters
+    ----------
+    x, y : numpy.ndarray
+        The (absolute, non-negative) coordinates of the points.
+    importance : numpy.ndarray
+        The importance of each point. More important points are kept at
+        lower zoom levels.
+    tile_size : int
+        The width of the tiles of the highest zoom level.
+    max_zoom : int
+        The highest zoom level (at most 31).
+    k : int
+        The maximum number of points per tile.
+    """
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        importance: np.ndarray,
+        tile_size: int,
+        max_zoom: int,
+        k: int,
+    ):
+        import numpy as np
+
+        if max_zoom > MAX_ZOOM:
+            raise ValueError(f"max_zoom must be at most {MAX_ZOOM}")
+        self.tile_size = tile_size
+        self.max_zoom = max_zoom
+        self.k = k
+
+        codes = morton(
+            np.floor_divide(x, tile_size).astype(np.int64),
+            np.floor_divide(y, tile_size).astype(np.int64),
+        ).astype(np.int64)
+        self.order = np.argsort(codes, kind="stable")
+        self.codes = codes[self.order]
+        self.ranks = _ranks(importance[self.order])
+
+        # from the highest zoom level down, sharing unchanged levels
+        positions = np.arange(len(self.order))
+        level = (positions, self.codes)
+        self.levels = [level] * (max_zoom + 1)
+        for zoom in range(max_zoom, -1, -1):
+            tiles = self.codes[positions] >> self._shift(zoom)
+            keep = _top_per_group(tiles, self.ranks[positions], k)
+            if keep is not None:
+                positions = positions[keep]
+                level = (positions, self.codes[positions])
+            self.levels[zoom] = level
+
+    def _shift(self, zoom: int) -> int:
+        return 2 * (self.max_zoom - zoom)
+
+    def query(self, zoom: int, x: int, y: int) -> np.ndarray:
+        """The points of a tile, as indices into the original points.
+
+        Returns (at most `k` of) the most important points in the tile, in
+        Morton order.
+        """
+        import numpy as np
+
+        if not (0 <= x < 2**zoom and 0 <= y < 2**zoom):
+            return self.order[:0]
+        positions, codes = self.levels[zoom]
+        shift = self._shift(zoom)
+        first = int(morton(np.array([x]), np.array([y]))[0]) << shift
+        lo = np.searchsorted(codes, first, side="left")
+        hi = np.searchsorted(codes, first + (1 << shift), side="left")
+        return self.order[positions[lo:hi]]
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import functools
 import itertools
+import typing
 from bisect import bisect_right
 from collections.abc import Iterable
 
+if typing.TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
 GenomicPosition = tuple[str, int]
 
 
@@ -32,11 +38,15 @@ class Scale:
     The genomic coordinates are 0-based and the bins of the partition are
     half-open intervals, i.e. the start coordinate of a bin is included in the
     bin, but the end is not.
+
+    Besides the scalar mappings (`__call__` and `invert`), `bins` and
+    `invert_bins` map whole arrays of positions and bin indices at once
+    (requires NumPy).
     """
 
     def __init__(
         self,
-        chromsizes: dict[str, int] | Iterable[tuple[str, int]],
+        chromsizes: typing.Mapping[str, int] | Iterable[tuple[str, int]],
         binsize: int = 1,
     ):
         chromsizes = dict(chromsizes)
@@ -94,6 +104,124 @@ class Scale:
         rel_offset = index - self._chrom_offsets[i - 1]
         return chrom, rel_offset * self._binsize
 
+    @functools.cached_property
+    def _arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The chromosome offsets, lengths, and names as NumPy arrays."""
+        import numpy as np
+
+        offsets = np.asarray(self._chrom_offsets, dtype=np.int64)
+        lengths = np.fromiter(self._chrom_lengths_map.values(), dtype=np.int64)
+        names = np.asarray(self._chrom_names)
+        return offsets, lengths, names
+
+    def _chrom_codes(self, chroms: typing.Any) -> np.ndarray:
+        """Convert chromosome names (or categoricals) to chromosome indices."""
+        import numpy as np
+
+        values = getattr(chroms, "cat", chroms)  # pandas categorical series
+        categories = getattr(values, "categories", None)
+        if categories is not None:
+            # pandas categorical, only look up each category once
+            lookup = self._chrom_codes(np.asarray(categories, dtype=object))
+            codes = np.asarray(values.codes)
+            if (codes < 0).any():
+                raise KeyError("missing chromosome name")
+            return lookup[codes]
+
+        index = {name: i for i, name in enumerate(self._chrom_names)}
+        if not isinstance(values, np.ndarray):
+            if not isinstance(values, (list, tuple)):
+                values = list(values)
+            if values and isinstance(values[0], str):
+                # names in a list
+                return np.fromiter(map(index.__getitem__, values), np.intp, len(values))
+        array: np.ndarray = np.asarray(values)
+
+        if array.dtype.kind in "iu":
+            if array.size and not (
+                0 <= array.min() and array.max() < len(self._chrom_names)
+            ):
+                raise IndexError("chromosome code out of range")
+            return array.astype(np.intp, copy=False)
+
+        if array.dtype.kind in "US":
+            # binary search in the sorted names, without a Python-level loop
+            names = self._arrays[2]
+            if array.dtype.kind == "S":
+                names = names.astype("S")
+            order = np.argsort(names)
+            found = np.searchsorted(names, array, sorter=order)
+            found = order[np.minimum(found, len(names) - 1)]
+            unknown = names[found] != array
+            if unknown.any():
+                raise KeyError(array[unknown][0].item())
+            return found
+
+        # names in an object array
+        flat = array.ravel().tolist()
+        codes = np.fromiter(map(index.__getitem__, flat), np.intp, len(flat))
+        return codes.reshape(array.shape)
+
+    def bins(self, chroms: npt.ArrayLike, positions: npt.ArrayLike) -> np.ndarray:
+        """
+        Returns the indices of the bins in which the given genomic positions
+        fall (the vectorized version of `__call__`).
+
+        Parameters
+        ----------
+        chroms : array_like
+            Chromosome names, integer chromosome codes (indices into
+            `chromsizes`), or a pandas categorical of chromosome names.
+        positions : array_like
+            Positions on the respective chromosomes. Positions outside of a
+            chromosome are clamped to its first or last bin.
+
+        Returns
+        -------
+        numpy.ndarray
+            The bin indices (as int64).
+        """
+        import numpy as np
+
+        offsets, lengths, _ = self._arrays
+        codes = self._chrom_codes(chroms)
+        positions = np.asarray(positions, dtype=np.int64)
+        # same order as in `__call__` (matters for empty chromosomes)
+        positions = np.maximum(np.minimum(positions, lengths[codes] - 1), 0)
+        return offsets[codes] + positions // self._binsize
+
+    def invert_bins(
+        self, indices: npt.ArrayLike, codes: bool = False
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the genomic positions of the starts of the bins at the given
+        indices (the vectorized version of `invert`).
+
+        Parameters
+        ----------
+        indices : array_like
+            Bin indices. Indices out of range are clamped to the first or
+            last bin.
+        codes : bool, optional
+            Whether to return integer chromosome codes (indices into
+            `chromsizes`) rather than chromosome names (default: False).
+
+        Returns
+        -------
+        chroms : numpy.ndarray
+            The chromosome names (or codes).
+        positions : numpy.ndarray
+            The start positions of the bins (as int64).
+        """
+        import numpy as np
+
+        offsets, _, names = self._arrays
+        indices = np.asarray(indices, dtype=np.int64)
+        indices = np.maximum(np.minimum(indices, len(self) - 1), 0)
+        chrom_codes = np.searchsorted(offsets, indices, side="right") - 1
+        positions = (indices - offsets[chrom_codes]) * self._binsize
+        return (chrom_codes if codes else names[chrom_codes]), positions
+
     def rebin(self, binsize: int) -> Scale:
         """
         Returns a new scale with the same genomic coordinate system but a
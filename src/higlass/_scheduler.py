@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import dataclasses
+import itertools
+import threading
+import typing
+
+__all__ = ["RequestScheduler"]
+
+# priorities, most urgent first
+INFO = 0
+TILES = 1
+PREFETCH = 2
+
+
+@dataclasses.dataclass
+class _Item:
+    seq: int
+    fn: typing.Callable[[], typing.Any]
+    future: concurrent.futures.Future
+
+
+class RequestScheduler:
+    """A bounded priority queue for requests from the front end.
+
+    Requests are not run by the scheduler itself. Instead, each `put` must be
+    paired with a call to `run_next` (e.g., submitted to an executor), which
+    runs the most urgent request queued at that time:
+
+    - requests with a lower priority number run first (e.g., tileset info
+      before tiles),
+    - among requests of the same priority, groups (e.g., widgets) take turns,
+    - and within a group, the newest request runs first.
+
+    When more than `max_queued` requests are waiting, the oldest requests of
+    the lowest priority are shed (their futures are cancelled).
+
+    Parameters
+    ----------
+    max_queued : int, optional
+        The maximum number of queued requests (default: 256).
+    priorities : int, optional
+        The number of priority levels (default: 2).
+    """
+
+    def __init__(self, max_queued: int = 256, priorities: int = 2) -> None:
+        self.max_queued = max_queued
+        self._priorities = priorities
+        self._queues: dict[typing.Hashable, list[collections.deque[_Item]]] = {}
+        # groups in the order they take turns
+        self._turns: collections.deque[typing.Hashable] = collections.deque()
+        self._counter = itertools.count()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put(
+        self,
+        fn: typing.Callable[[], typing.Any],
+        priority: int = TILES,
+        group: typing.Hashable = None,
+    ) -> concurrent.futures.Future:
+        """Queue a request.
+
+        Parameters
+        ----------
+        fn : callable
+            The function to run for the request.
+        priority : int, optional
+            The priority of the request, lower runs first (default: 1).
+        group : hashable, optional
+            The group (e.g., widget) the request originates from.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            A future for the result of `fn`. It is cancelled if the request
+            is shed.
+        """
+        item = _Item(next(self._counter), fn, concurrent.futures.Future())
+        with self._lock:
+            if group not in self._queues:
+                self._queues[group] = [
+                    collections.deque() for _ in range(self._priorities)
+                ]
+                self._turns.append(group)
+            self._queues[group][priority].append(item)
+            self._size += 1
+            shed = self._shed() if self._size > self.max_queued else []
+        for future in shed:
+            future.cancel()
+        return item.future
+
+    def _shed(self) -> list[concurrent.futures.Future]:
+        """Drop queued requests until within `max_queued`."""
+        shed = []
+        # first drop requests that have been cancelled already
+        for queues in self._queues.values():
+            for queue in queues:
+                for item in [item for item in queue if item.future.cancelled()]:
+                    queue.remove(item)
+                    self._size -= 1
+        while self._size > self.max_queued:
+            oldest = None
+            for priority in reversed(range(self._priorities)):
+                heads = [qs[priority] for qs in self._queues.values() if qs[priority]]
+                if heads:
+                    oldest = min(heads, key=lambda queue: queue[0].seq)
+                    break
+            assert oldest is not None
+            shed.append(oldest.popleft().future)
+            self._size -= 1
+        for group in [g for g, queues in self._queues.items() if not any(queues)]:
+            del self._queues[group]
+            self._turns.remove(group)
+        return shed
+
+    def _pop(self) -> _Item | None:
+        with self._lock:
+            for priority in range(self._priorities):
+                for group in self._turns:
+                    queues = self._queues[group]
+                    if queues[priority]:
+                        item = queues[priority].pop()
+                        self._size -= 1
+                        # the group goes to the back of the line
+                        self._turns.remove(group)
+                        if any(queues):
+                            self._turns.append(group)
+                        else:
+                            del self._queues[group]
+                        return item
+            return None
+
+    def run_next(self) -> None:
+        """Run the most urgent queued request (if any)."""
+        while (item := self._pop()) is not None:
+            if not item.future.set_running_or_notify_cancel():
+                continue  # cancelled while queued, try the next one
+            try:
+                result = item.fn()
+            except BaseException as e:
+                item.future.set_exception(e)
+            else:
+                item.future.set_result(result)
+            return
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import sys
+import threading
+import typing
+
+__all__ = ["InfoCache", "TileCache"]
+
+TileKey = tuple[str, str]
+
+
+def sizeof(obj: object) -> int:
+    """Estimate the number of bytes held by a (JSON-like) tile object."""
+    nbytes = getattr(obj, "nbytes", None)  # NumPy arrays, memoryviews
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(obj, (str, bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sum(sizeof(k) + sizeof(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sum(sizeof(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+class TileCache:
+    """A thread-safe LRU cache of tiles, bounded by their size in bytes.
+
+    Tiles are keyed by ``(tileset_uid, tile_id)``. When the total estimated
+    size of the cached tiles exceeds `max_bytes`, the least recently used
+    tiles are evicted.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        The maximum total size of cached tiles (default: 256 MiB). A value of
+        ``0`` disables caching.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20) -> None:
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict[TileKey, tuple[typing.Any, int]] = (
+            collections.OrderedDict()
+        )
+        # the cached tile ids of each tileset, for `invalidate`
+        self._tile_ids: dict[str, set[str]] = {}
+        self._max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_bytes(self) -> int:
+        """The maximum total size of cached tiles in bytes."""
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: int) -> None:
+        with self._lock:
+            self._max_bytes = value
+            self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: TileKey) -> bool:
+        return key in self._entries
+
+    def get(self, key: TileKey) -> typing.Any | None:
+        """Return a cached tile (marking it as recently used), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: TileKey, tile: typing.Any) -> None:
+        """Add a tile to the cache, evicting old tiles if necessary."""
+        nbytes = sizeof(tile)
+        with self._lock:
+            if nbytes > self._max_bytes:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old[1]
+            self._entries[key] = (tile, nbytes)
+            self._tile_ids.setdefault(key[0], set()).add(key[1])
+            self.nbytes += nbytes
+            self._evict()
+
+    def invalidate(self, tileset_uid: str) -> None:
+        """Remove all cached tiles for a tileset."""
+        with self._lock:
+            for tile_id in self._tile_ids.pop(tileset_uid, ()):
+                self.nbytes -= self._entries.pop((tileset_uid, tile_id))[1]
+
+    def clear(self) -> None:
+        """Remove all cached tiles and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._tile_ids.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Summary statistics for the cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "tiles": len(self._entries),
+                "nbytes": self.nbytes,
+                "max_bytes": self._max_bytes,
+            }
+
+    def _evict(self) -> None:
+        while self.nbytes > self._max_bytes and self._entries:
+            (tileset_uid, tile_id), (_, nbytes) = self._entries.popitem(last=False)
+            tile_ids = self._tile_ids[tileset_uid]
+            tile_ids.discard(tile_id)
+            if not tile_ids:
+                del self._tile_ids[tileset_uid]
+            self.nbytes -= nbytes
+
+
+class InfoCache:
+    """A thread-safe cache of tileset info, keyed by tileset uid.
+
+    Concurrent requests for the same (uncached) tileset info are coalesced:
+    only the first caller computes the result, while the others wait for and
+    share its answer (or exception).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._results: dict[str, typing.Any] = {}
+        self._pending: dict[str, concurrent.futures.Future] = {}
+
+    def __contains__(self, tileset_uid: str) -> bool:
+        return tileset_uid in self._results
+
+    def get(self, tileset_uid: str, compute: typing.Callable[[], typing.Any]):
+        """Return the cached info for a tileset, computing it if necessary.
+
+        Parameters
+        ----------
+        tileset_uid : str
+            The uid of the tileset.
+        compute : Callable[[], Any]
+            Computes the tileset info if it is neither cached nor pending.
+
+        Returns
+        -------
+        Any
+            The tileset info.
+        """
+        with self._lock:
+            if tileset_uid in self._results:
+                return self._results[tileset_uid]
+            future = self._pending.get(tileset_uid)
+            if future is None:
+                future = self._pending[tileset_uid] = concurrent.futures.Future()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:
+                if self._pending.get(tileset_uid) is future:
+                    del self._pending[tileset_uid]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            # skip storing the result if invalidated while computing
+            if self._pending.get(tileset_uid) is future:
+                del self._pending[tileset_uid]
+                self._results[tileset_uid] = result
+        future.set_result(result)
+        return result
+
+    def invalidate(self, tileset_uid: str) -> None:
+        """Forget the cached info for a tileset."""
+        with self._lock:
+            self._results.pop(tileset_uid, None)
+            self._pending.pop(tileset_uid, None)
+
+    def clear(self) -> None:
+        """Forget all cached tileset info."""
+        with self._lock:
+            self._results.clear()
+            self._pending.clear()
@@ -3,7 +3,14 @@ from __future__ import annotations
 import typing
 import weakref
 
-__all__ = ["TilesetInfo", "TilesetProtocol", "TilesetRegistry"]
+__all__ = [
+    "AnyTileset",
+    "AsyncTilesetProtocol",
+    "InlineTilesetProtocol",
+    "TilesetInfo",
+    "TilesetProtocol",
+    "TilesetRegistry",
+]
 
 
 class Transform(typing.TypedDict):
@@ -11,12 +18,22 @@ class Transform(typing.TypedDict):
     value: str
 
 
-class TilesetInfo(typing.TypedDict):
-    resolutions: tuple[int, ...]
-    transforms: list[Transform]
+class _TilesetInfo(typing.TypedDict):
     max_pos: list[int]
     min_pos: list[int]
+
+
+class TilesetInfo(_TilesetInfo, total=False):
+    # multi-resolution tilesets (e.g., matrices)
+    resolutions: tuple[int, ...]
+    transforms: list[Transform]
     chromsizes: list[tuple[str, int]]
+    # tilesets with a tile for each power of two (e.g., vectors)
+    max_width: int
+    tile_size: int
+    max_zoom: int
+    # tab-separated column names of bedlike tilesets
+    header: str
 
 
 class TilesetProtocol(typing.Protocol):
@@ -25,26 +42,72 @@ class TilesetProtocol(typing.Protocol):
     def info(self) -> TilesetInfo: ...
 
 
+class AsyncTilesetProtocol(typing.Protocol):
+    """A tileset whose `tiles` (and optionally `info`) are `async`."""
+
+    async def tiles(self, tile_ids: typing.Sequence[str], /) -> list[dict]: ...
+
+    def info(self) -> TilesetInfo | typing.Awaitable[TilesetInfo]: ...
+
+
+@typing.runtime_checkable
+class InlineTilesetProtocol(TilesetProtocol, typing.Protocol):
+    """A tileset that can send all of its tiles with the viewconf."""
+
+    inline: bool
+
+    def inline_tiles(self) -> dict[str, dict]: ...
+
+
+AnyTileset = TilesetProtocol | AsyncTilesetProtocol
+
+
 class TilesetRegistry:
-    _registry: weakref.WeakValueDictionary[str, TilesetProtocol] = (
+    _registry: weakref.WeakValueDictionary[str, AnyTileset] = (
         weakref.WeakValueDictionary()
     )
+    _removal_callbacks: typing.ClassVar[list[typing.Callable[[str], None]]] = []
 
     @classmethod
-    def add(cls, tileset: TilesetProtocol) -> str:
+    def add(cls, tileset: AnyTileset) -> str:
         """Register a tileset with a given ID."""
         uid = f"hg_{id(tileset):x}"
-        cls._registry[uid] = tileset
+        if cls._registry.get(uid) is not tileset:
+            cls._registry[uid] = tileset
+            weakref.finalize(tileset, cls._removed, uid)
         return uid
 
     @classmethod
-    def get(cls, tileset_id: str) -> TilesetProtocol:
+    def get(cls, tileset_id: str) -> AnyTileset:
         """Retrieve a tileset by its ID, or None if it no longer exists."""
         tileset = cls._registry.get(tileset_id)
         if tileset is None:
             raise KeyError(tileset_id)
         return tileset
 
+    @classmethod
+    def on_remove(cls, callback: typing.Callable[[str], None]) -> None:
+        """Register a callback invoked with the ID of each removed tileset.
+
+        Tilesets are removed when they are garbage collected or when the
+        registry is cleared.
+        """
+        cls._removal_callbacks.append(callback)
+
+    @classmethod
+    def remove_callback(cls, callback: typing.Callable[[str], None]) -> None:
+        """Unregister a callback registered with `on_remove` (if registered)."""
+        if callback in cls._removal_callbacks:
+            cls._removal_callbacks.remove(callback)
+
+    @classmethod
+    def _removed(cls, tileset_id: str) -> None:
+        for callback in cls._removal_callbacks:
+            callback(tileset_id)
+
     @classmethod
     def clear(cls) -> None:
+        uids = list(cls._registry.keys())
         cls._registry.clear()
+        for uid in uids:
+            cls._removed(uid)
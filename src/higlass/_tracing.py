@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import threading
+import time
+import typing
+
+__all__ = ["Tracer"]
+
+# the (fake) process id for events recorded in the browser
+BROWSER_PID = 0
+
+
+class Tracer:
+    """Records spans of the tile-serving pipeline as Chrome trace events.
+
+    Durations are measured with `time.perf_counter` and converted to Unix
+    time (in microseconds), so that events recorded in the browser (with
+    ``performance.timeOrigin + performance.now()``) line up with those
+    recorded in the kernel. The trace can be saved as JSON and opened in
+    Perfetto (https://ui.perfetto.dev) or ``chrome://tracing``.
+    """
+
+    def __init__(self) -> None:
+        self.events: list[dict] = []
+        self._pid = os.getpid()
+        self._epoch = time.time() - time.perf_counter()
+        self._threads: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def _us(self, perf_counter: float) -> float:
+        return (perf_counter + self._epoch) * 1e6
+
+    def complete(
+        self, name: str, start: float, end: float, cat: str = "kernel", **args
+    ) -> None:
+        """Record a span on the current thread (`time.perf_counter` times)."""
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": self._us(start),
+            "dur": (end - start) * 1e6,
+            "pid": self._pid,
+            "tid": thread.ident,
+            "args": args,
+        }
+        with self._lock:
+            self._threads.setdefault(thread.ident or 0, thread.name)
+            self.events.append(event)
+
+    def async_span(
+        self,
+        name: str,
+        span_id: str,
+        start: float,
+        end: float,
+        cat: str = "request",
+        **args,
+    ) -> None:
+        """Record a span that is not tied to a thread, e.g., a request."""
+        start, end = self._us(start), self._us(end)
+        self._async_span(name, span_id, start, end, cat, self._pid, args)
+
+    def browser_span(
+        self, name: str, span_id: str, start: float, end: float, **args
+    ) -> None:
+        """Record a span measured in the browser (Unix times in milliseconds)."""
+        start, end = start * 1e3, end * 1e3
+        self._async_span(name, span_id, start, end, "browser", BROWSER_PID, args)
+
+    def _async_span(
+        self,
+        name: str,
+        span_id: str,
+        start: float,
+        end: float,
+        cat: str,
+        pid: int,
+        args: dict,
+    ) -> None:
+        common = {"name": name, "cat": cat, "id": span_id, "pid": pid, "tid": 0}
+        with self._lock:
+            self.events.append({**common, "ph": "b", "ts": start, "args": args})
+            self.events.append({**common, "ph": "e", "ts": end})
+
+    def to_dict(self) -> dict:
+        """The trace in the Chrome trace event format."""
+        with self._lock:
+            metadata: list[dict[str, typing.Any]] = [
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "args": {"name": name},
+                }
+                for pid, name in ((self._pid, "kernel"), (BROWSER_PID, "browser"))
+            ]
+            metadata.extend(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self._pid,
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+                for tid, name in self._threads.items()
+            )
+            return {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}
+
+    def save(self, path: str | pathlib.Path) -> None:
+        """Write the trace to a JSON file."""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
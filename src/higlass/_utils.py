@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-import uuid
-from typing import Literal, TypeVar
+import os
+from typing import Any, Literal, TypeVar
 
 import higlass_schema as hgs
 from pydantic import BaseModel
@@ -47,7 +47,8 @@ datatype_default_track = {
 
 
 def uid() -> str:
-    return str(uuid.uuid4()).split("-")[0]
+    # like the first group of a uuid4 (32 random bits), but much cheaper
+    return os.urandom(4).hex()
 
 
 T = TypeVar("T")
@@ -80,3 +81,30 @@ def copy_unique(model: ModelT) -> ModelT:
     if hasattr(copy, "uid"):
         setattr(copy, "uid", uid())
     return copy
+
+
+def _copy_containers(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        copy = value.model_copy()
+        for fields in (copy.__dict__, copy.__pydantic_extra__ or {}):
+            for name, field in fields.items():
+                fields[name] = _copy_containers(field)
+        return copy
+    if isinstance(value, list):
+        return [_copy_containers(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _copy_containers(v) for k, v in value.items()}
+    return value
+
+
+def derive_unique(model: ModelT) -> ModelT:
+    """Creates an independent copy of a pydantic BaseModel with new UID.
+
+    Like `copy_unique`, but only the nested models, lists and dicts are
+    copied. Other values (strings, numbers, ...) are shared with the
+    original, which makes this considerably faster than a deep copy.
+    """
+    copy = _copy_containers(model)
+    if hasattr(copy, "uid"):
+        setattr(copy, "uid", uid())
+    return copy
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import base64
 import concurrent.futures
+import contextlib
+import contextvars
 import functools
+import inspect
 import itertools
 import json
 import logging
 import os
 import pathlib
+import threading
+import time
 import typing
 
 import anywidget
@@ -14,7 +20,22 @@ import ipywidgets
 import pydantic
 import traitlets as t
 
-from higlass._tileset_registry import TilesetRegistry
+from higlass._cancellation import CancelledError, cancel_scope, check_cancelled
+from higlass._disk_cache import DiskTileCache
+from higlass._event_loop import EventLoopThread
+from higlass._metrics import Metrics
+from higlass._prefetch import TilePrefetcher, _jupyter_tracks, prefetching
+from higlass._process_pool import ProcessPool
+from higlass._scheduler import INFO, PREFETCH, TILES, RequestScheduler
+from higlass._tile_cache import InfoCache, TileCache, sizeof
+from higlass._tileset_registry import (
+    AnyTileset,
+    AsyncTilesetProtocol,
+    InlineTilesetProtocol,
+    TilesetProtocol,
+    TilesetRegistry,
+)
+from higlass._tracing import Tracer
 
 __all__ = ["HiGlassWidget"]
 
@@ -35,23 +56,243 @@ class Tiles(pydantic.BaseModel):
     tileIds: list[str]
 
 
+class Cancel(pydantic.BaseModel):
+    """A request to cancel the pending request with the same message id."""
+
+    type: typing.Literal["cancel"]
+
+
+class Timing(pydantic.BaseModel):
+    """The front end's timing of the request with the same message id.
+
+    Times are Unix times in milliseconds.
+    """
+
+    type: typing.Literal["timing"]
+    sent: float
+    received: float
+
+
 class CustomMessage(pydantic.BaseModel):
     """A custom message from the widget front end."""
 
     id: str
-    payload: typing.Union[TilesetInfo, Tiles]  # noqa: UP007
+    widget: str | None = None
+    payload: typing.Union[TilesetInfo, Tiles, Cancel, Timing]  # noqa: UP007
+
+
+# the dtypes the front end decodes from binary buffers (see `TYPED_ARRAYS`)
+_BINARY_DTYPES = frozenset(
+    {
+        "float16",
+        "float32",
+        "float64",
+        "int8",
+        "int16",
+        "int32",
+        "uint8",
+        "uint16",
+        "uint32",
+    }
+)
+
+
+def _encode_tiles(
+    tiles: dict[str, typing.Any],
+) -> tuple[dict[str, typing.Any], list[memoryview]]:
+    """Move dense tile data out of the JSON payload and into binary buffers.
+
+    Dense tile arrays (either NumPy arrays or the base64-encoded strings
+    produced by clodius) of a dtype the front end can decode are replaced by
+    a ``{"buffer": index}`` reference into the returned list of buffers. The
+    ``dtype`` (and ``shape``, if known) of each dense array is kept alongside
+    in the tile's JSON. Other dense data (e.g., plain lists) is left in the
+    JSON payload, with NumPy arrays of other dtypes converted to lists.
+
+    Parameters
+    ----------
+    tiles : dict[str, Any]
+        A mapping of tile ids to tile data.
+
+    Returns
+    -------
+    tuple[dict[str, Any], list[memoryview]]
+        The JSON-serializable payload and the raw buffers to send with it.
+    """
+    payload = {}
+    buffers = []
+    for tile_id, tile in tiles.items():
+        dense = tile.get("dense") if isinstance(tile, dict) else None
+        if dense is None:
+            payload[tile_id] = tile
+            continue
+
+        tile = dict(tile)
+        if isinstance(dense, str) and tile.get("dtype", "float32") in _BINARY_DTYPES:
+            buffer = memoryview(base64.b64decode(dense))
+            tile.setdefault("dtype", "float32")
+        elif (
+            hasattr(dense, "__array_interface__") and dense.dtype.name in _BINARY_DTYPES
+        ):
+            # a NumPy array, sent zero-copy if already C-contiguous
+            if not dense.flags.c_contiguous:
+                dense = dense.copy(order="C")
+            buffer = memoryview(dense).cast("B")
+            tile["dtype"] = dense.dtype.name
+            tile["shape"] = list(dense.shape)
+        else:
+            if hasattr(dense, "__array_interface__"):
+                tile["dense"] = dense.tolist()
+            payload[tile_id] = tile
+            continue
+
+        tile["dense"] = {"buffer": len(buffers)}
+        buffers.append(buffer)
+        payload[tile_id] = tile
+
+    return payload, buffers
+
+
+def _embed_tiles(tiles: dict[str, typing.Any]) -> dict[str, typing.Any]:
+    """Embed dense NumPy tile arrays in the JSON payload as base64 strings.
+
+    Other dense data (like the base64-encoded strings produced by clodius)
+    is left as is.
+    """
+    payload = {}
+    for tile_id, tile in tiles.items():
+        dense = tile.get("dense") if isinstance(tile, dict) else None
+        if hasattr(dense, "__array_interface__"):
+            tile = dict(tile)
+            tile["dense"] = base64.b64encode(dense.tobytes()).decode("utf-8")
+            tile["dtype"] = dense.dtype.name
+            tile["shape"] = list(dense.shape)
+        payload[tile_id] = tile
+    return payload
+
+
+def _inline_tilesets(viewconf: dict) -> dict[str, dict]:
+    """The info and tiles of the inline tilesets displayed by a viewconf.
+
+    Tilesets with a truthy `inline` attribute provide all of their tiles
+    with `inline_tiles`. Dense tile data is kept as binary buffers, which
+    the widget syncs to the front end without base64 encoding.
+    """
+    inline = {}
+    for view in viewconf.get("views") or []:
+        for _, track in _jupyter_tracks(view):
+            uid = track["tilesetUid"]
+            try:
+                tileset = TilesetRegistry.get(uid)
+            except KeyError:
+                continue
+            if uid in inline or not isinstance(tileset, InlineTilesetProtocol):
+                continue
+            if not tileset.inline:
+                continue
+            tiles, buffers = _encode_tiles(tileset.inline_tiles())
+            for tile in tiles.values():
+                if isinstance(tile.get("dense"), dict):
+                    tile["dense"] = buffers[tile["dense"]["buffer"]]
+            inline[uid] = {"info": tileset.info(), "tiles": tiles}
+    return inline
+
+
+def _find_track(viewconf: dict, uid: str) -> dict:
+    """The track (or track of a combined track) with a uid in a viewconf."""
+    for view in viewconf.get("views") or []:
+        for tracks in (view.get("tracks") or {}).values():
+            for track in tracks or []:
+                for trk in [track, *(track.get("contents") or [])]:
+                    if trk.get("uid") == uid:
+                        return trk
+    raise KeyError(f"No track with uid {uid!r}")
+
+
+def _apply_patch(viewconf: dict, patch: dict) -> None:
+    """Apply a patch (see `HiGlassWidget.update_track`) to a viewconf in place.
+
+    Mirrors `applyPatches` in the front end.
+    """
+    op = patch["op"]
+    if op == "add_view":
+        viewconf.setdefault("views", []).append(patch["view"])
+    elif op == "update_track":
+        _find_track(viewconf, patch["track"]).update(patch["properties"])
+    elif op == "set_options":
+        track = _find_track(viewconf, patch["track"])
+        track["options"] = {**(track.get("options") or {}), **patch["options"]}
+    else:
+        raise ValueError(f"Unknown patch: {op!r}")
+
+
+def _position(tile_id: str) -> str:
+    """The tile id without its tileset uid (e.g., ``"3.1.2"``)."""
+    return tile_id.partition(".")[2]
+
+
+def _is_async(tileset: object) -> typing.TypeGuard[AsyncTilesetProtocol]:
+    """Whether a tileset's `tiles` method is a coroutine function."""
+    return inspect.iscoroutinefunction(getattr(tileset, "tiles", None))
+
+
+def _sync(tileset: AnyTileset) -> TilesetProtocol:
+    """A tileset known not to be async (see `_is_async`)."""
+    return typing.cast("TilesetProtocol", tileset)
 
 
 class JupyterTilesetClient(ipywidgets.Widget):
     """A singleton client for handling tileset requests in a Jupyter environment.
 
-    Requests are handled asynchronously using a thread pool executor.
+    Requests are queued in a `scheduler` and handled asynchronously using a
+    thread pool executor. Tileset info and tiles are cached in `info_cache`
+    and `tile_cache` (and optionally on disk, see `enable_disk_cache`), and
+    the metrics of serving them are available from `stats` and `trace`.
+
+    Attributes
+    ----------
+    binary : bool
+        Send dense tile data as raw binary buffers alongside the JSON message,
+        rather than as base64-encoded strings in the payload (default: True).
+    max_concurrent_tilesets : int
+        The number of tilesets fetched concurrently per request (default: 4).
+    stream_tiles : bool
+        Send the tiles of each tileset as soon as they are ready (as partial
+        responses, with ``done: false``), rather than all at once (default:
+        True).
+    backend : {"threads", "processes"}
+        Generate tiles in threads, or in a pool of worker processes, which
+        avoids contention on the GIL for CPU-bound (picklable) tilesets
+        (default: "threads"). Async tilesets always run on an event loop.
     """
 
     _executor = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
-
-    def __init__(self) -> None:
-        super().__init__()
+    # separate pool for per-tileset work so that requests waiting on their
+    # tilesets can't starve the pool they are waiting on
+    _tileset_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=os.cpu_count()
+    )
+
+    binary = t.Bool(True)
+    max_concurrent_tilesets = t.Int(4)
+    stream_tiles = t.Bool(True)
+    backend = t.Enum(["threads", "processes"], default_value="threads")
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.tile_cache = TileCache()
+        self.info_cache = InfoCache()
+        self.process_pool = ProcessPool(max_workers=os.cpu_count())
+        self.event_loop = EventLoopThread()
+        self.disk_cache: DiskTileCache | None = None
+        # info requests run before tiles, which run before prefetching
+        self.scheduler = RequestScheduler(priorities=PREFETCH + 1)
+        self.metrics = Metrics()
+        self.prefetch_metrics = Metrics()
+        self.tracer: Tracer | None = None
+        TilesetRegistry.on_remove(self.invalidate)
+        self._pending: dict[str, tuple[concurrent.futures.Future, threading.Event]] = {}
+        self._pending_lock = threading.RLock()
         self.on_msg(self._handle_custom_message)
 
     @classmethod
@@ -60,36 +301,510 @@ class JupyterTilesetClient(ipywidgets.Widget):
         """Return a singleton client."""
         return cls()
 
+    def close(self) -> None:
+        """Close the comm and release the client's workers and callbacks."""
+        TilesetRegistry.remove_callback(self.invalidate)
+        self.process_pool.shutdown()
+        super().close()
+
+    def stats(self) -> dict:
+        """Metrics of the tile-serving pipeline since the last `reset_stats`.
+
+        Counters and latency histograms (in seconds) are reported overall
+        (``"total"``) and per tileset (``"tilesets"``, keyed by uid). Tiles
+        generated by prefetching (see `HiGlassWidget.enable_prefetching`)
+        are reported separately, overall (``"prefetch"``).
+
+        Counters
+            ``info_requests``, ``tile_requests``, ``cancelled``, and ``shed``
+            requests; ``tiles`` served, ``cache_hits``, ``disk_hits``, and
+            ``cache_misses``; ``errors`` (error tiles and exceptions); and
+            ``bytes``, the estimated size of the served tiles.
+        Latency
+            ``parse`` (message validation), ``queue`` (waiting for a
+            worker), ``handle`` (the whole request on the worker), ``fetch``
+            (getting the tiles of a tileset, including cached ones), ``info``
+            and ``tiles`` (tileset code), ``encode`` (binary or base64
+            encoding), and ``send`` (handing the message to the comm).
+
+        Returns
+        -------
+        dict
+            A snapshot of the metrics.
+        """
+        return {
+            **self.metrics.snapshot(),
+            "prefetch": self.prefetch_metrics.snapshot()["total"],
+        }
+
+    def reset_stats(self) -> None:
+        """Reset the metrics reported by `stats`."""
+        self.metrics.reset()
+        self.prefetch_metrics.reset()
+
+    @property
+    def _metrics(self) -> Metrics:
+        """The metrics of the tiles being fetched in the current context."""
+        return self.prefetch_metrics if prefetching.get() else self.metrics
+
+    def start_tracing(self) -> Tracer:
+        """Start recording a timeline of requests (see `trace`).
+
+        Returns
+        -------
+        Tracer
+            The tracer recording the timeline.
+        """
+        self.tracer = Tracer()
+        return self.tracer
+
+    def stop_tracing(self, path: str | pathlib.Path | None = None) -> Tracer | None:
+        """Stop recording the timeline of requests.
+
+        Parameters
+        ----------
+        path : str | pathlib.Path, optional
+            A file to write the trace to (as Chrome trace JSON).
+
+        Returns
+        -------
+        Tracer | None
+            The tracer that was recording, if any.
+        """
+        tracer, self.tracer = self.tracer, None
+        if tracer is not None and path is not None:
+            tracer.save(path)
+        return tracer
+
+    @contextlib.contextmanager
+    def trace(self, path: str | pathlib.Path | None = None) -> typing.Iterator[Tracer]:
+        """Record a timeline of requests within a block.
+
+        Spans are recorded for each request (from its arrival to the final
+        response, including the time spent queued), for each stage on the
+        worker threads (fetching info and tiles per tileset, encoding, and
+        sending), and, if the front end reports them, for the round trip of
+        each request as seen by the browser.
+
+        Since tiles are requested asynchronously by the front end, use
+        `start_tracing` and `stop_tracing` to trace across notebook cells.
+
+        Parameters
+        ----------
+        path : str | pathlib.Path, optional
+            A file to write the trace to (as Chrome trace JSON) at the end of
+            the block. It can be opened in Perfetto (https://ui.perfetto.dev).
+
+        Yields
+        ------
+        Tracer
+            The tracer recording the timeline.
+        """
+        tracer = self.start_tracing()
+        try:
+            yield tracer
+        finally:
+            if self.tracer is tracer:
+                self.stop_tracing()
+            if path is not None:
+                tracer.save(path)
+
+    @contextlib.contextmanager
+    def _stage(
+        self, name: str, tileset_uid: str | None = None
+    ) -> typing.Iterator[None]:
+        """Measure a stage of serving a request (for `stats` and `trace`)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._metrics.observe(name, end - start, tileset_uid)
+            tracer = self.tracer
+            if tracer is not None:
+                args = {} if tileset_uid is None else {"tileset": tileset_uid}
+                tracer.complete(name, start, end, **args)
+
+    def invalidate(self, tileset_uid: str) -> None:
+        """Drop the cached info and tiles (and pickled copy) of a tileset.
+
+        Use this when the underlying data of a tileset changed. Tilesets
+        removed from the `TilesetRegistry` are invalidated automatically.
+
+        Parameters
+        ----------
+        tileset_uid : str
+            The uid of the tileset (i.e., a track's `tilesetUid`).
+        """
+        self.info_cache.invalidate(tileset_uid)
+        self.tile_cache.invalidate(tileset_uid)
+        self.process_pool.forget(tileset_uid)
+
+    def _fetch_info(self, tileset_uid: str) -> typing.Any:
+        """Get the info for a tileset, using the cached info if possible."""
+
+        def compute():
+            with self._stage("info", tileset_uid):
+                try:
+                    info = TilesetRegistry.get(tileset_uid).info()
+                    if inspect.isawaitable(info):
+                        info = self.event_loop.run(info)
+                except Exception:
+                    self._metrics.count("errors", tileset=tileset_uid)
+                    raise
+            return info
+
+        return self.info_cache.get(tileset_uid, compute)
+
+    def enable_disk_cache(
+        self, path: str | pathlib.Path | None = None, max_bytes: int = 2 * 2**30
+    ) -> DiskTileCache:
+        """Persist tiles in an on-disk cache shared across kernels and sessions.
+
+        Only tiles of tilesets with a `fingerprint` (e.g., those created with
+        `hg.cooler`, `hg.bigwig`, ...) are stored on disk.
+
+        Parameters
+        ----------
+        path : str | pathlib.Path, optional
+            The SQLite database file (default: ``~/.cache/higlass/tiles.sqlite``).
+        max_bytes : int, optional
+            The maximum total size of the cached tiles (default: 2 GiB).
+
+        Returns
+        -------
+        DiskTileCache
+            The on-disk tile cache.
+        """
+        self.disk_cache = DiskTileCache(path, max_bytes=max_bytes)
+        return self.disk_cache
+
+    def disable_disk_cache(self) -> None:
+        """Stop using the on-disk tile cache."""
+        self.disk_cache = None
+
+    def _fingerprint(self, tileset: object) -> str | None:
+        """The tileset's fingerprint, if the on-disk cache is used for it."""
+        if self.disk_cache is None:
+            return None
+        fingerprint = getattr(tileset, "fingerprint", None)
+        return fingerprint() if callable(fingerprint) else None
+
+    def _cached_tiles(
+        self, tileset_uid: str, tile_ids: list[str], fingerprint: str | None = None
+    ) -> tuple[list[tuple[str, typing.Any]], list[str]]:
+        """Split tile ids into cached tiles and the ids of missing tiles."""
+        tiles = []
+        missing = []
+        for tile_id in tile_ids:
+            tile = self.tile_cache.get((tileset_uid, tile_id))
+            if tile is None:
+                missing.append(tile_id)
+            else:
+                tiles.append((tile_id, tile))
+
+        if missing and fingerprint is not None and self.disk_cache is not None:
+            found = self.disk_cache.get_many(fingerprint, list(map(_position, missing)))
+            still_missing = []
+            for tile_id in missing:
+                tile = found.get(_position(tile_id))
+                if tile is None:
+                    still_missing.append(tile_id)
+                else:
+                    self.tile_cache.put((tileset_uid, tile_id), tile)
+                    tiles.append((tile_id, tile))
+            disk_hits = len(missing) - len(still_missing)
+            self._metrics.count("disk_hits", disk_hits, tileset_uid)
+            missing = still_missing
+
+        self._metrics.count("cache_hits", len(tile_ids) - len(missing), tileset_uid)
+        self._metrics.count("cache_misses", len(missing), tileset_uid)
+        return tiles, missing
+
+    def _cache_tiles(
+        self,
+        tileset_uid: str,
+        generated: typing.Iterable[typing.Any],
+        fingerprint: str | None = None,
+    ) -> list[tuple[str, typing.Any]]:
+        """Add newly generated tiles (but not errors) to the tile cache(s)."""
+        tiles = []
+        errors = 0
+        for tile_id, tile in generated:
+            if isinstance(tile, dict) and "error" in tile:
+                errors += 1
+            else:
+                self.tile_cache.put((tileset_uid, tile_id), tile)
+            tiles.append((tile_id, tile))
+        self._metrics.count("errors", errors, tileset_uid)
+
+        if fingerprint is not None and self.disk_cache is not None:
+            self.disk_cache.put_many(
+                fingerprint,
+                (
+                    (_position(tile_id), tile)
+                    for tile_id, tile in tiles
+                    if not (isinstance(tile, dict) and "error" in tile)
+                ),
+            )
+        return tiles
+
+    def _fetch_tiles(
+        self, tileset_uid: str, tile_ids: list[str]
+    ) -> list[tuple[str, typing.Any]]:
+        """Get tiles for a single tileset, using cached tiles where possible."""
+        with self._stage("fetch", tileset_uid):
+            tileset = TilesetRegistry.get(tileset_uid)
+            fingerprint = self._fingerprint(tileset)
+            tiles, missing = self._cached_tiles(tileset_uid, tile_ids, fingerprint)
+            if missing:
+                with self._measure_tiles(tileset_uid):
+                    if _is_async(tileset):
+                        generated = self.event_loop.run(tileset.tiles(missing))
+                    elif self.backend == "processes":
+                        generated = self.process_pool.tiles(
+                            tileset_uid, _sync(tileset), missing
+                        )
+                    else:
+                        generated = list(_sync(tileset).tiles(missing))
+                tiles.extend(self._cache_tiles(tileset_uid, generated, fingerprint))
+            self._count_served(tileset_uid, tiles)
+        return tiles
+
+    async def _fetch_tiles_async(
+        self, tileset_uid: str, tile_ids: list[str]
+    ) -> list[tuple[str, typing.Any]]:
+        """Get tiles for a single async tileset, using cached tiles where possible."""
+        with self._stage("fetch", tileset_uid):
+            tileset = typing.cast(
+                "AsyncTilesetProtocol", TilesetRegistry.get(tileset_uid)
+            )
+            fingerprint = self._fingerprint(tileset)
+            tiles, missing = self._cached_tiles(tileset_uid, tile_ids, fingerprint)
+            if missing:
+                with self._measure_tiles(tileset_uid):
+                    generated = await tileset.tiles(missing)
+                tiles.extend(self._cache_tiles(tileset_uid, generated, fingerprint))
+            self._count_served(tileset_uid, tiles)
+        return tiles
+
+    @contextlib.contextmanager
+    def _measure_tiles(self, tileset_uid: str) -> typing.Iterator[None]:
+        """Time a call to the tileset's `tiles`, counting exceptions as errors."""
+        with self._stage("tiles", tileset_uid):
+            try:
+                yield
+            except CancelledError:
+                raise
+            except Exception:
+                self._metrics.count("errors", tileset=tileset_uid)
+                raise
+
+    def _count_served(
+        self, tileset_uid: str, tiles: list[tuple[str, typing.Any]]
+    ) -> None:
+        """Count the served tiles of a tileset and their (estimated) size."""
+        self._metrics.count("tiles", len(tiles), tileset_uid)
+        nbytes = sum(sizeof(tile) for _, tile in tiles)
+        self._metrics.count("bytes", nbytes, tileset_uid)
+
+    def _submit_tiles(
+        self, tileset_uid: str, tile_ids: list[str]
+    ) -> concurrent.futures.Future[list[tuple[str, typing.Any]]]:
+        """Start fetching tiles for a tileset in the background."""
+        if _is_async(TilesetRegistry.get(tileset_uid)):
+            return self.event_loop.submit(
+                self._fetch_tiles_async(tileset_uid, tile_ids)
+            )
+        # copy the context so tilesets see the request's cancellation
+        context = contextvars.copy_context()
+        return self._tileset_executor.submit(
+            lambda: context.run(self._fetch_tiles, tileset_uid, tile_ids)
+        )
+
+    def _iter_tile_groups(
+        self, groups: list[tuple[str, list[str]]]
+    ) -> typing.Iterator[list[tuple[str, typing.Any]]]:
+        """Get tiles for several tilesets, fetching each tileset concurrently.
+
+        Yields the tiles of each tileset as soon as they are available.
+        """
+        limit = max(1, self.max_concurrent_tilesets)
+        if len(groups) <= 1 or limit == 1:
+            for tileset_uid, tile_ids in groups:
+                check_cancelled()
+                yield self._fetch_tiles(tileset_uid, tile_ids)
+            return
+
+        running: set[concurrent.futures.Future] = set()
+        try:
+            for tileset_uid, tile_ids in groups:
+                if len(running) >= limit:
+                    done, running = concurrent.futures.wait(
+                        running, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        yield future.result()
+                check_cancelled()
+                running.add(self._submit_tiles(tileset_uid, tile_ids))
+            while running:
+                done, running = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in running:
+                future.cancel()
+
+    def cancel(self, request_id: str) -> bool:
+        """Cancel a pending request.
+
+        Requests still waiting in the queue are dropped, and running requests
+        stop between tilesets. Long-running tilesets can check
+        `Tileset.cancelled()` to stop early. The front end cancels requests
+        it no longer awaits.
+
+        Parameters
+        ----------
+        request_id : str
+            The id of the request message.
+
+        Returns
+        -------
+        bool
+            Whether the request was still pending.
+        """
+        with self._pending_lock:
+            pending = self._pending.pop(request_id, None)
+        if pending is None:
+            return False
+        future, event = pending
+        event.set()
+        future.cancel()
+        self.metrics.count("cancelled")
+        logger.debug("cancel: %s", request_id)
+        return True
+
     def _handle_custom_message(self, widget, msg, buffers):
-        message = CustomMessage(**msg)
+        received = time.perf_counter()
+        with self._stage("parse"):
+            message = CustomMessage(**msg)
         logger.debug("handle_custom_message: %s", message)
 
-        def respond_with(payload: object):
+        if isinstance(message.payload, Cancel):
+            self.cancel(message.id)
+            return
+
+        if isinstance(message.payload, Timing):
+            if self.tracer is not None:
+                sent, done = message.payload.sent, message.payload.received
+                self.tracer.browser_span("sendCustomMessage", message.id, sent, done)
+            return
+
+        event = threading.Event()
+
+        def respond_with(
+            payload: object,
+            buffers: list[memoryview] | None = None,
+            done: bool = True,
+        ):
             logger.debug("handle_custom_message::respond_with: %s", message.id)
-            self.send({"id": message.id, "payload": payload})
+            msg = {"id": message.id, "payload": payload, "done": done}
+            if done and self.tracer is not None:
+                # asks the front end to report its timing of the request
+                msg["trace"] = True
+            with self._stage("send"):
+                self.send(msg, buffers)
+
+        def respond_with_tiles(tiles: list[tuple[str, typing.Any]], done: bool):
+            payload = {tile_id: tile for tile_id, tile in tiles}
+            if self.binary:
+                with self._stage("encode"):
+                    payload, buffers = _encode_tiles(payload)
+                respond_with(payload, buffers, done=done)
+            else:
+                with self._stage("encode"):
+                    payload = _embed_tiles(payload)
+                respond_with(payload, done=done)
 
         def process_message():
+            started = time.perf_counter()
+            self.metrics.observe("queue", started - enqueued)
+            try:
+                with cancel_scope(event), self._stage("handle"):
+                    handle_message()
+            except CancelledError:
+                logger.debug("handle_custom_message::cancelled: %s", message.id)
+            finally:
+                tracer = self.tracer
+                if tracer is not None:
+                    kind = message.payload.type
+                    tracer.async_span("queue", message.id, enqueued, started)
+                    end = time.perf_counter()
+                    tracer.async_span("request", message.id, received, end, type=kind)
+
+        def handle_message():
             if isinstance(message.payload, TilesetInfo):
                 tileset_uid = message.payload.tilesetUid
-                respond_with({tileset_uid: TilesetRegistry.get(tileset_uid).info()})
+                respond_with({tileset_uid: self._fetch_info(tileset_uid)})
 
             elif isinstance(message.payload, Tiles):
                 tile_ids = message.payload.tileIds
-                tiles = []
-                for tileset_uid, group in itertools.groupby(
-                    iterable=sorted(tile_ids), key=lambda tile_id: tile_id.split(".")[0]
-                ):
-                    tiles.extend(TilesetRegistry.get(tileset_uid).tiles(list(group)))
-                respond_with({tile_id: tile for tile_id, tile in tiles})
+                groups = [
+                    (tileset_uid, list(group))
+                    for tileset_uid, group in itertools.groupby(
+                        iterable=sorted(tile_ids),
+                        key=lambda tile_id: tile_id.split(".")[0],
+                    )
+                ]
+                if self.stream_tiles:
+                    for tiles in self._iter_tile_groups(groups):
+                        check_cancelled()
+                        respond_with_tiles(tiles, done=False)
+                    respond_with({})
+                else:
+                    tiles = list(itertools.chain(*self._iter_tile_groups(groups)))
+                    check_cancelled()
+                    respond_with_tiles(tiles, done=True)
 
             else:
                 raise RuntimeError("Unexpected execution path")
 
-        self._executor.submit(process_message)
+        def forget(_: concurrent.futures.Future):
+            with self._pending_lock:
+                if self._pending.get(message.id, (None,))[0] is future:
+                    del self._pending[message.id]
+            if future.cancelled() and not event.is_set():
+                # shed by the scheduler, don't leave the front end waiting
+                logger.debug("handle_custom_message::shed: %s", message.id)
+                self.metrics.count("shed")
+                respond_with({})
+
+        if isinstance(message.payload, TilesetInfo):
+            priority = INFO
+            self.metrics.count("info_requests")
+        else:
+            priority = TILES
+            self.metrics.count("tile_requests")
+        enqueued = time.perf_counter()
+        with self._pending_lock:
+            future = self.scheduler.put(
+                process_message, priority=priority, group=message.widget
+            )
+            self._pending[message.id] = (future, event)
+            future.add_done_callback(forget)
+        self._executor.submit(self.scheduler.run_next)
 
 
 class HiGlassWidget(anywidget.AnyWidget):
-    """An interactive anywidget for HiGlass."""
+    """An interactive anywidget for HiGlass.
+
+    The displayed viewconf can be changed incrementally with `update_track`,
+    `set_options`, and `add_view`. These send small patches that the front
+    end applies to the running viewer, which keeps the tiles of unchanged
+    tracks, instead of syncing (and rendering) the whole viewconf again.
+    """
 
     _esm = pathlib.Path(__file__).parent / "widget.js"
 
@@ -97,6 +812,8 @@ class HiGlassWidget(anywidget.AnyWidget):
     _options = t.Dict().tag(sync=True)
     _plugin_urls = t.List().tag(sync=True)
     _tileset_client = t.Any().tag(sync=True, **ipywidgets.widget_serialization)
+    # tiles sent along with the widget, by tileset uid (see `_inline_tilesets`)
+    _inline_tilesets = t.Dict().tag(sync=True)
 
     # readonly properties
     location = t.List(t.Union([t.Float(), t.Tuple()]), read_only=True).tag(sync=True)
@@ -107,7 +824,130 @@ class HiGlassWidget(anywidget.AnyWidget):
             _plugin_urls=plugin_urls,
             _options=viewer_options,
             _tileset_client=JupyterTilesetClient.get_instance(),
+            _inline_tilesets=_inline_tilesets(viewconf),
+        )
+
+    def enable_prefetching(self, width: float = 800) -> TilePrefetcher:
+        """Prefetch tiles around the current viewport in the background.
+
+        Whenever the location of a view changes, the tiles adjacent to the
+        visible ones and those one zoom level deeper are generated (at low
+        priority) into the tile cache of the kernel, so that the next pan or
+        zoom step can be served from the cache.
+
+        Parameters
+        ----------
+        width : float, optional
+            The assumed width of tracks in pixels, used to determine the
+            displayed zoom level (default: 800).
+
+        Returns
+        -------
+        TilePrefetcher
+            The (started) prefetcher.
+        """
+        self.disable_prefetching()
+        self._prefetcher = TilePrefetcher(
+            self, JupyterTilesetClient.get_instance(), width=width
         )
+        self._prefetcher.start()
+        return self._prefetcher
+
+    def disable_prefetching(self) -> None:
+        """Stop prefetching tiles."""
+        prefetcher = getattr(self, "_prefetcher", None)
+        if prefetcher is not None:
+            prefetcher.stop()
+            self._prefetcher = None
+
+    def _patch(self, patch: dict) -> None:
+        # validates the patch before sending it
+        _apply_patch(self._viewconf, patch)
+        # the tiles of new inline tilesets are synced before the patch
+        self._add_inline_tilesets(patch)
+        pending = getattr(self, "_pending_patches", None)
+        if pending is not None:
+            pending.append(patch)
+        else:
+            self._send_patches([patch])
+
+    def _add_inline_tilesets(self, patch: dict) -> None:
+        if patch["op"] == "add_view":
+            view = patch["view"]
+        elif patch["op"] == "update_track":
+            view = {"tracks": {"center": [_find_track(self._viewconf, patch["track"])]}}
+        else:
+            return
+        inline = _inline_tilesets({"views": [view]})
+        if inline.keys() - self._inline_tilesets.keys():
+            self._inline_tilesets = {**self._inline_tilesets, **inline}
+
+    def _send_patches(self, patches: list[dict]) -> None:
+        if not patches:
+            return
+        # lets views of the widget apply each patch to the shared state once
+        self._patch_version = getattr(self, "_patch_version", 0) + 1
+        self.send(json.dumps(["patch", self._patch_version, patches]))
+
+    @contextlib.contextmanager
+    def batch(self) -> typing.Iterator[None]:
+        """Send all updates made within the block at once.
+
+        Examples
+        --------
+        >>> with widget.batch():
+        ...     for track in tracks:
+        ...         widget.set_options(track, colorRange=["white", "black"])
+        """
+        if getattr(self, "_pending_patches", None) is not None:
+            yield  # nested
+            return
+        self._pending_patches: list[dict] | None = []
+        try:
+            yield
+        finally:
+            patches, self._pending_patches = self._pending_patches, None
+            self._send_patches(patches)
+
+    def update_track(self, track: typing.Any, /, **properties) -> None:
+        """Update a displayed track without recreating the viewer.
+
+        Parameters
+        ----------
+        track : higlass.api.Track | str
+            A (modified) track, replacing the displayed track with the same
+            `uid`, or the uid of the track to update.
+        **properties : dict
+            Top-level properties of the track to set (e.g., ``height``).
+        """
+        if not isinstance(track, str):
+            properties = {**track.model_dump(), **properties}
+            track = track.uid
+        self._patch({"op": "update_track", "track": track, "properties": properties})
+
+    def set_options(self, track: typing.Any, /, **options) -> None:
+        """Set options of a displayed track without recreating the viewer.
+
+        Parameters
+        ----------
+        track : higlass.api.Track | str
+            The track (or the uid of the track) to update.
+        **options : dict
+            The options to set, merged with the existing options.
+        """
+        uid = track if isinstance(track, str) else track.uid
+        self._patch({"op": "set_options", "track": uid, "options": options})
+
+    def add_view(self, view: typing.Any, /) -> None:
+        """Add a view without recreating the viewer.
+
+        Parameters
+        ----------
+        view : higlass.api.View | dict
+            The view to add. Its `layout` determines where it is placed.
+        """
+        view = view if isinstance(view, dict) else view.model_dump()
+        self._patch({"op": "add_view", "view": view})
 
     def reload(self, *items):
         msg = json.dumps(["reload", items])
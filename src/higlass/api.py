@@ -7,12 +7,13 @@ from typing import (
     Generic,
     Literal,
     TypeVar,
-    cast,
+    get_args,
+    get_origin,
     overload,
 )
 
 import higlass_schema as hgs
-from pydantic import RootModel
+from pydantic import RootModel, ValidationError
 
 import higlass._utils as utils
 
@@ -29,6 +30,7 @@ __all__ = [
     "combine",
     "concat",
     "divide",
+    "grid",
     "hconcat",
     "lock",
     "track",
@@ -76,7 +78,7 @@ class _PropertiesMixin:
         track : A track with the the newly specified track options.
 
         """
-        model = self if inplace else utils.copy_unique(self)
+        model = self if inplace else utils.derive_unique(self)
         for k, v in fields.items():
             setattr(model, k, v)
         return model
@@ -113,7 +115,7 @@ class _OptionsMixin:
         >>> assert isinstance(derived.options["colorRange"], list)
 
         """
-        track = self if inplace else utils.copy_unique(self)
+        track = self if inplace else utils.derive_unique(self)
         if track.options is None:
             track.options = {}
         track.options.update(options)
@@ -197,7 +199,7 @@ class View(hgs.View[TrackT], _PropertiesMixin, Generic[TrackT]):
         view : a View with the updated x & y domains
 
         """
-        view = self if inplace else utils.copy_unique(self)
+        view = self if inplace else utils.derive_unique(self)
         if x is not None:
             view.initialXDomain = x
         if y is not None:
@@ -306,7 +308,7 @@ class View(hgs.View[TrackT], _PropertiesMixin, Generic[TrackT]):
         -------
         view : A view with a new viewport-projection track.
         """
-        new_view = self if inplace else utils.copy_unique(self)
+        new_view = self if inplace else utils.derive_unique(self)
 
         # projection track type from position
         if on == "center":
@@ -437,7 +439,7 @@ class Viewconf(hgs.Viewconf[View[TrackT]], _PropertiesMixin, Generic[TrackT]):
         >>> (view1 | view2).lock(location=view_lock)
 
         """
-        conf = self if inplace else utils.copy_unique(self)
+        conf = self if inplace else utils.derive_unique(self)
 
         zoom = utils.ensure_list(zoom)
         location = utils.ensure_list(location)
@@ -517,82 +519,126 @@ class Viewconf(hgs.Viewconf[View[TrackT]], _PropertiesMixin, Generic[TrackT]):
         return vconcat(self, other)
 
 
-TrackTA = TypeVar("TrackTA", bound=Track)
-TrackTB = TypeVar("TrackTB", bound=Track)
+_LOCK_CLASSES = {
+    "zoomLocks": hgs.ZoomLocks,
+    "locationLocks": hgs.LocationLocks,
+    "valueScaleLocks": hgs.ValueScaleLocks,
+}
 
 
 def concat(
     method: Literal["horizontal", "vertical"],
-    a: View[TrackTA] | Viewconf[TrackTA],
-    b: View[TrackTB] | Viewconf[TrackTB],
-) -> Viewconf[TrackTA | TrackTB]:
-    """Concatenate two views or separate viewconfs together.
+    *items: View[TrackT] | Viewconf[TrackT],
+) -> Viewconf[TrackT]:
+    """Concatenate views and/or separate viewconfs together.
 
-    Uses the layout of one view or the total bounds of all views in one
-    viewconf to offset the other view/viewconf.
+    Uses the layout of each view or the total bounds of all views in each
+    viewconf to offset the items that follow it. All items are laid out in
+    a single pass, so concatenating many views at once (rather than
+    chaining ``|`` or ``/``) takes time linear in their number.
 
     Parameters
     ----------
     method : Literal["horizontal", "vertical"]
         How to concatenate views/viewconfs.
 
-    a : View | Viewconf
-        A view or viewconf to combine.
-
-    b : View | Viewconf
-        The other view or viewconf to combine.
+    *items : View | Viewconf
+        The views or viewconfs to combine (at least one), in order.
 
     Returns
     -------
     viewconf : A combined viewconf containing multiple views.
 
     """
-    a = a.viewconf() if isinstance(a, View) else a
-    assert a.views is not None
+    if method == "vertical":
+        field, size = "y", "h"
+    elif method == "horizontal":
+        field, size = "x", "w"
+    else:
+        raise ValueError("concat method must be 'vertical' or 'horizontal'.")
+    if not items:
+        raise ValueError("concat requires at least one view or viewconf.")
+
+    viewconfs = [item.viewconf() if isinstance(item, View) else item for item in items]
+    first, *rest = viewconfs
+    assert first.views is not None
+    views = list(first.views)
+
+    # gather views and adjust layout (sharing everything else)
+    def end(view: View) -> int:
+        return getattr(view.layout, field) + getattr(view.layout, size)
+
+    offset = max(map(end, views), default=0)
+    for viewconf in rest:
+        assert viewconf.views is not None
+        shifted = []
+        for view in viewconf.views:
+            layout = view.layout
+            view = view.model_copy()
+            view.layout = layout.model_copy(
+                update={field: getattr(layout, field) + offset}
+            )
+            shifted.append(view)
+        views.extend(shifted)
+        offset = max([offset, *map(end, shifted)])
+
+    conf = first.model_copy()
+    conf.views = views
 
-    b = b.viewconf() if isinstance(b, View) else b
-    assert b.views is not None
+    # merge locks
+    for lockattr, cls in _LOCK_CLASSES.items():
+        merged = [getattr(vc, lockattr) for vc in viewconfs if getattr(vc, lockattr)]
+        if merged and rest:
+            locks_dict, by_view_uid = {}, {}
+            for locks in merged:
+                locks_dict.update(locks.locksDict)
+                by_view_uid.update(locks.locksByViewUid)
+            combined = cls(locksDict=locks_dict, locksByViewUid=by_view_uid)
+            setattr(conf, lockattr, combined)
 
-    if method == "vertical":
+    return conf
 
-        def mapper(view):
-            return view.layout.y + view.layout.h
 
-        field = "y"
-    elif method == "horizontal":
+hconcat = functools.partial(concat, "horizontal")
 
-        def mapper(view):
-            return view.layout.x + view.layout.w
+vconcat = functools.partial(concat, "vertical")
 
-        field = "x"
-    else:
-        raise ValueError("concat method must be 'vertical' or 'horizontal'.")
 
-    # gather views and adjust layout
-    views = [v.model_copy(deep=True) for v in b.views]
-    offset = 0 if a.views is None else max(map(mapper, a.views))
-    for view in views:
-        curr = getattr(view.layout, field)
-        setattr(view.layout, field, curr + offset)
+def grid(
+    *items: View[TrackT] | Viewconf[TrackT],
+    columns: int,
+) -> Viewconf[TrackT]:
+    """Arrange views and/or viewconfs in a grid, row by row.
 
-    a.views.extend(views)  # type: ignore
+    The rows are concatenated horizontally and then stacked vertically (see
+    `concat`), in time linear in the number of items.
 
-    # merge locks
-    for lockattr in ["zoomLocks", "valueScaleLocks", "locationLocks"]:
-        locks = getattr(b, lockattr)
-        if locks:
-            if getattr(a, lockattr) is None:
-                setattr(a, lockattr, locks.model_copy(deep=True))
-            else:
-                getattr(a, lockattr).locksByViewUid.update(locks.locksByViewUid)
-                getattr(a, lockattr).locksDict.update(locks.locksDict)
+    Parameters
+    ----------
+    *items : View | Viewconf
+        The views or viewconfs to arrange (at least one), in row-major order.
 
-    return cast(Viewconf[TrackTA | TrackTB], a)
+    columns : int
+        The number of items per row.
 
+    Returns
+    -------
+    viewconf : A combined viewconf containing all views.
 
-hconcat = functools.partial(concat, "horizontal")
+    Examples
+    --------
+    >>> views = [hg.view(hg.track("top-axis"), width=3) for _ in range(8)]
+    >>> viewconf = hg.grid(*views, columns=4)
+    >>> assert [v.layout.y for v in viewconf.views] == [0] * 4 + [6] * 4
 
-vconcat = functools.partial(concat, "vertical")
+    """
+    if columns < 1:
+        raise ValueError("columns must be at least 1.")
+    rows = [
+        hconcat(*items[start : start + columns])
+        for start in range(0, len(items), columns)
+    ]
+    return vconcat(*rows)
 
 
 ## Top-level functions to easily create tracks,
@@ -614,6 +660,33 @@ class _TrackCreator(RootModel):
     root: Track
 
 
+def _literal_values(annotation) -> list[str]:
+    """The values of a `Literal` type (or a union of them)."""
+    if get_origin(annotation) is Literal:
+        return list(get_args(annotation))
+    return [value for arg in get_args(annotation) for value in _literal_values(arg)]
+
+
+@functools.cache
+def _track_classes() -> dict[str, type[Track] | None]:
+    """The track class for each known track type.
+
+    Types that more than one class accepts map to `None`: viewport
+    projections (an `IndependentViewportProjectionTrack`, or an `EnumTrack`
+    with a `fromViewUid`) and combined tracks (a `PluginTrack` without
+    `contents`). Unknown types are `PluginTrack`s.
+    """
+    projections = IndependentViewportProjectionTrack.model_fields["type"].annotation
+    classes: dict[str, type[Track] | None] = {
+        type_: EnumTrack
+        for type_ in _literal_values(EnumTrack.model_fields["type"].annotation)
+    }
+    classes["heatmap"] = HeatmapTrack
+    for type_ in ["combined", *_literal_values(projections)]:
+        classes[type_] = None
+    return classes
+
+
 @overload
 def track(type_: hgs.EnumTrackType, uid: str | None = None, **kwargs) -> EnumTrack: ...
 
@@ -654,6 +727,14 @@ def track(
     if uid is None:
         uid = utils.uid()
     data = dict(type=type_, uid=uid, **kwargs)
+    # validating against the one matching class is much faster than against
+    # the union, which is left to report errors and resolve ambiguous types
+    cls = _track_classes().get(type_, PluginTrack)
+    if cls is not None:
+        try:
+            return cls.model_validate(data)
+        except ValidationError:
+            pass
     return _TrackCreator.model_validate(data).root
 
 
@@ -771,9 +852,11 @@ def combine(t1: Track, t2: Track, uid: str | None = None, **kwargs) -> CombinedT
     if uid is None:
         uid = utils.uid()
 
+    # shallow copies suffice, since tracks are derived without mutating their
+    # nested values (and are much cheaper than a round trip through dicts)
     if isinstance(t1, CombinedTrack):
-        copy = CombinedTrack(**t1.model_dump())
-        copy.contents.append(t2.__class__(**t2.model_dump()))
+        copy = t1.model_copy()
+        copy.contents = [*t1.contents, t2.model_copy()]
         for key, val in kwargs.items():
             setattr(copy, key, val)
         return copy
@@ -781,7 +864,7 @@ def combine(t1: Track, t2: Track, uid: str | None = None, **kwargs) -> CombinedT
     return CombinedTrack(
         type="combined",
         uid=uid,
-        contents=[track.__class__(**track.model_dump()) for track in (t1, t2)],
+        contents=[track.model_copy() for track in (t1, t2)],
         **kwargs,
     )
 
@@ -819,7 +902,7 @@ def divide(t1: T, t2: T, **kwargs) -> T:
     assert isinstance(t2.tilesetUid, str)
     assert isinstance(t2.server, str)
 
-    copy = utils.copy_unique(t1)
+    copy = utils.derive_unique(t1)
     copy.tilesetUid = None
     copy.server = None
     copy.data = hgs.Data(
@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import itertools
+import math
+import typing
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+    from higlass._scale import Scale
+
+__all__ = [
+    "max_zoom",
+    "num_tiles",
+    "plan_tiles",
+    "region_domains",
+    "region_tile_ids",
+    "tile_ids",
+    "tile_range",
+    "zoom_level",
+]
+
+Domain = tuple[float, float]
+
+# the track width (in pixels) at which HiGlass adds another zoom level
+_VIEW_RESOLUTION = 384
+
+# guards against tiles that would just touch the end of a domain
+_EPSILON = 1e-7
+
+
+def _sorted_resolutions(info: typing.Mapping) -> list[int]:
+    return sorted((int(r) for r in info["resolutions"]), reverse=True)
+
+
+def _bins_per_tile_correction(info: typing.Mapping) -> int:
+    bins_per_tile = info.get("bins_per_dimension") or info.get("tile_size")
+    if bins_per_tile:
+        return math.floor(8 - math.log2(bins_per_tile))
+    return 0
+
+
+def max_zoom(info: typing.Mapping) -> int:
+    """The highest zoom level of a tileset."""
+    if "resolutions" in info:
+        return len(info["resolutions"]) - 1
+    return int(info["max_zoom"])
+
+
+def zoom_level(
+    info: typing.Mapping, domain: Domain, width: float, axis: int = 0
+) -> int:
+    """The zoom level HiGlass displays for a domain of a tileset.
+
+    Mirrors the calculation of the HiGlass front end.
+
+    Parameters
+    ----------
+    info : Mapping
+        The tileset info.
+    domain : tuple[float, float]
+        The visible (absolute) data domain along `axis`.
+    width : float
+        The width of the track in pixels.
+    axis : int, optional
+        The tileset dimension of the domain (default: 0).
+
+    Returns
+    -------
+    int
+        The zoom level.
+    """
+    extent = max(domain[1] - domain[0], 1e-9)
+    if "resolutions" in info:
+        # the highest resolution with less than one bin per pixel
+        bins_per_pixel = [extent / r / width for r in _sorted_resolutions(info)]
+        return max((i for i, b in enumerate(bins_per_pixel) if b < 1), default=0)
+
+    min_pos, max_pos = info["min_pos"][axis], info["max_pos"][axis]
+    zoom_scale = max((max_pos - min_pos) / extent, 1)
+    added_zoom = max(0, math.ceil(math.log2(width / _VIEW_RESOLUTION)))
+    # like JavaScript's Math.round
+    zoom = math.floor(math.log2(zoom_scale) + 0.5) + added_zoom
+    zoom += _bins_per_tile_correction(info)
+    return min(max(zoom, 0), max_zoom(info))
+
+
+def _tile_width(info: typing.Mapping, zoom: int, axis: int = 0) -> float:
+    if "resolutions" in info:
+        resolution = _sorted_resolutions(info)[zoom]
+        return resolution * info.get("tile_size", 256)
+    min_pos, max_pos = info["min_pos"][axis], info["max_pos"][axis]
+    max_width = info.get("max_width", max_pos - min_pos)
+    return max_width / 2**zoom
+
+
+def num_tiles(info: typing.Mapping, zoom: int, axis: int = 0) -> int:
+    """The number of tiles along `axis` at a zoom level."""
+    if "resolutions" in info:
+        extent = info["max_pos"][axis] - info["min_pos"][axis]
+        return max(1, math.ceil(extent / _tile_width(info, zoom, axis)))
+    return 2**zoom
+
+
+def tile_range(info: typing.Mapping, zoom: int, domain: Domain, axis: int = 0) -> range:
+    """The positions of the tiles along `axis` covering a domain at a zoom level.
+
+    Mirrors the calculation of the HiGlass front end.
+    """
+    min_pos = info["min_pos"][axis]
+    tile_width = _tile_width(info, zoom, axis)
+    start = max(0, math.floor((domain[0] - min_pos) / tile_width))
+    stop = math.ceil((domain[1] - min_pos - _EPSILON) / tile_width)
+    return range(start, min(stop, num_tiles(info, zoom, axis)))
+
+
+def tile_ids(
+    info: typing.Mapping,
+    domains: typing.Sequence[Domain],
+    width: float,
+    zoom: int | None = None,
+    uid: str | None = None,
+) -> list[str]:
+    """The ids of the tiles HiGlass requests for a view of a tileset.
+
+    Parameters
+    ----------
+    info : Mapping
+        The tileset info.
+    domains : Sequence[tuple[float, float]]
+        The visible (absolute) domain for each dimension of the tileset, i.e.,
+        ``[x_domain]`` for 1D and ``[x_domain, y_domain]`` for 2D tilesets.
+    width : float
+        The width (and height) of the track in pixels.
+    zoom : int, optional
+        The zoom level. Defaults to the level HiGlass displays for the domain
+        (the highest level of any dimension).
+    uid : str, optional
+        A tileset uid to prefix the tile positions with.
+
+    Returns
+    -------
+    list[str]
+        The tile ids, like ``"uid.3.4.5"`` (or ``"3.4.5"`` without a `uid`).
+    """
+    if zoom is None:
+        zoom = max(
+            zoom_level(info, domain, width, axis) for axis, domain in enumerate(domains)
+        )
+    ranges = [
+        tile_range(info, zoom, domain, axis) for axis, domain in enumerate(domains)
+    ]
+    prefix = f"{zoom}" if uid is None else f"{uid}.{zoom}"
+    return [
+        ".".join([prefix, *map(str, position)])
+        for position in itertools.product(*ranges)
+    ]
+
+
+def plan_tiles(
+    info: typing.Mapping,
+    starts: npt.ArrayLike,
+    ends: npt.ArrayLike,
+    width: float | npt.ArrayLike,
+    zoom: int | npt.ArrayLike | None = None,
+    axis: int = 0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """The zoom levels and tile ranges for many domains at once (vectorized).
+
+    The vectorized version of `zoom_level` and `tile_range`. Requires NumPy.
+
+    Parameters
+    ----------
+    info : Mapping
+        The tileset info.
+    starts, ends : array_like
+        The (absolute) start and end positions of the domains along `axis`.
+    width : float | array_like
+        The width of the track in pixels (per domain).
+    zoom : int | array_like, optional
+        The zoom level (per domain). Defaults to the level HiGlass displays
+        for each domain.
+    axis : int, optional
+        The tileset dimension of the domains (default: 0).
+
+    Returns
+    -------
+    zooms : numpy.ndarray
+        The zoom level for each domain.
+    tile_starts, tile_stops : numpy.ndarray
+        The half-open range of tile positions covering each domain.
+    """
+    import numpy as np
+
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    width = np.asarray(width, dtype=np.float64)
+    min_pos, max_pos = info["min_pos"][axis], info["max_pos"][axis]
+
+    if zoom is None:
+        extent = np.maximum(ends - starts, 1e-9)
+        if "resolutions" in info:
+            resolutions = np.asarray(_sorted_resolutions(info), dtype=np.float64)
+            bins_per_pixel = extent[..., None] / resolutions / width[..., None]
+            # resolutions are descending, so these are all those before a cutoff
+            zooms = np.maximum((bins_per_pixel < 1).sum(axis=-1) - 1, 0)
+        else:
+            zoom_scale = np.maximum((max_pos - min_pos) / extent, 1)
+            added_zoom = np.maximum(0, np.ceil(np.log2(width / _VIEW_RESOLUTION)))
+            zooms = np.floor(np.log2(zoom_scale) + 0.5) + added_zoom
+            zooms += _bins_per_tile_correction(info)
+            zooms = np.clip(zooms, 0, max_zoom(info))
+    else:
+        zooms = np.broadcast_to(np.asarray(zoom), np.broadcast(starts, ends).shape)
+    zooms = zooms.astype(np.int64)
+
+    if "resolutions" in info:
+        resolutions = np.asarray(_sorted_resolutions(info), dtype=np.float64)
+        tile_widths = resolutions[zooms] * info.get("tile_size", 256)
+        counts = np.maximum(1, np.ceil((max_pos - min_pos) / tile_widths))
+    else:
+        max_width = info.get("max_width", max_pos - min_pos)
+        tile_widths = max_width / 2.0**zooms
+        counts = 2.0**zooms
+
+    tile_starts = np.maximum(0, np.floor((starts - min_pos) / tile_widths))
+    tile_stops = np.ceil((ends - min_pos - _EPSILON) / tile_widths)
+    tile_stops = np.minimum(tile_stops, counts)
+    return zooms, tile_starts.astype(np.int64), tile_stops.astype(np.int64)
+
+
+def region_domains(
+    chromsizes: Scale | typing.Mapping[str, int] | typing.Iterable[tuple[str, int]],
+    chroms: npt.ArrayLike,
+    starts: npt.ArrayLike,
+    ends: npt.ArrayLike,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Convert genomic regions to absolute (genome-wide) domains.
+
+    Requires NumPy.
+
+    Parameters
+    ----------
+    chromsizes : Scale | Mapping[str, int] | Iterable[tuple[str, int]]
+        The chromosome sizes (in the order of the tileset's coordinates).
+    chroms : array_like
+        The chromosomes of the regions (see `Scale.bins`).
+    starts, ends : array_like
+        The start and (exclusive) end positions of the regions. Regions are
+        clipped to their chromosomes.
+
+    Returns
+    -------
+    starts, ends : numpy.ndarray
+        The absolute start and end positions.
+    """
+    import numpy as np
+
+    from higlass._scale import Scale
+
+    if not (isinstance(chromsizes, Scale) and chromsizes.binsize == 1):
+        chromsizes = dict(
+            chromsizes.chromsizes if isinstance(chromsizes, Scale) else chromsizes
+        )
+        chromsizes = Scale(chromsizes)
+    starts = chromsizes.bins(chroms, starts)
+    ends = chromsizes.bins(chroms, np.asarray(ends, dtype=np.int64) - 1) + 1
+    return starts, np.maximum(ends, starts)
+
+
+def region_tile_ids(
+    info: typing.Mapping,
+    chromsizes: Scale | typing.Mapping[str, int] | typing.Iterable[tuple[str, int]],
+    chroms: npt.ArrayLike,
+    starts: npt.ArrayLike,
+    ends: npt.ArrayLike,
+    width: float | npt.ArrayLike,
+    zoom: int | npt.ArrayLike | None = None,
+    uid: str | None = None,
+) -> list[list[str]]:
+    """The ids of the tiles HiGlass requests for each of many genomic regions.
+
+    Each region is viewed on its own, as the x domain of a track (and, for
+    2D tilesets, also as its y domain, i.e., along the diagonal). Requires
+    NumPy.
+
+    Parameters
+    ----------
+    info : Mapping
+        The tileset info.
+    chromsizes : Scale | Mapping[str, int] | Iterable[tuple[str, int]]
+        The chromosome sizes (in the order of the tileset's coordinates).
+    chroms : array_like
+        The chromosomes of the regions (see `Scale.bins`).
+    starts, ends : array_like
+        The start and (exclusive) end positions of the regions.
+    width : float | array_like
+        The width of the track in pixels (per region).
+    zoom : int | array_like, optional
+        The zoom level (per region). Defaults to the level HiGlass displays.
+    uid : str, optional
+        A tileset uid to prefix the tile positions with.
+
+    Returns
+    -------
+    list[list[str]]
+        The tile ids for each region.
+    """
+    abs_starts, abs_ends = region_domains(chromsizes, chroms, starts, ends)
+    zooms, tile_starts, tile_stops = plan_tiles(info, abs_starts, abs_ends, width, zoom)
+    dims = len(info.get("min_pos", [0]))
+    ids = []
+    for z, start, stop in zip(
+        zooms.tolist(), tile_starts.tolist(), tile_stops.tolist()
+    ):
+        prefix = f"{z}" if uid is None else f"{uid}.{z}"
+        positions = itertools.product(range(start, stop), repeat=dims)
+        ids.append([".".join([prefix, *map(str, pos)]) for pos in positions])
+    return ids
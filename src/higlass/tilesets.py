@@ -2,22 +2,37 @@ from __future__ import annotations
 
 import abc
 import functools
+import hashlib
+import itertools
+import math
 import pathlib
 import typing
 from dataclasses import dataclass
 
+import higlass._clodius as _clodius
 import higlass.api
+from higlass._cancellation import cancelled
 from higlass._tileset_registry import TilesetInfo, TilesetRegistry
 from higlass._utils import TrackType, datatype_default_track
 
+if typing.TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
 __all__ = [
+    "ArrayTileset",
     "InlineTileset",
+    "IntervalTileset",
+    "PointTileset",
     "Tileset",
+    "array",
     "bed2ddb",
     "bigwig",
     "cooler",
     "hitile",
+    "intervals",
     "multivec",
+    "points",
     "remote",
 ]
 
@@ -76,6 +91,10 @@ def remote(
 class InlineTileset:
     """A tileset that serves data locally without a server.
 
+    The data is embedded in the viewconf as a single tile, shown at every
+    zoom level. To embed a whole pyramid of tiles of an array, use
+    ``hg.array(values, inline=True)``.
+
     Parameters
     ----------
     tsinfo : dict
@@ -130,7 +149,9 @@ class InlineTileset:
 class Tileset(abc.ABC):
     """Base class for defining custom tilesets in `higlass`.
 
-    Subclasses must implement the `tiles` and `info` methods.
+    Subclasses must implement the `tiles` and `info` methods. Either may be
+    defined with ``async def`` for I/O-bound tilesets, in which case it is
+    run on an event loop rather than in a thread.
 
     The provided `track` method is a helper which automatically registers the
     tileset with the `TilesetRegistry` and returns a HiGlass track object
@@ -167,12 +188,36 @@ class Tileset(abc.ABC):
     >>> hg.view(tileset.track("heatmap"))
     """
 
+    # whether the "processes" backend may pickle the tileset and serve it
+    # from worker processes (rather than threads)
+    _process_safe: typing.ClassVar[bool] = True
+
     @abc.abstractmethod
     def tiles(self, tile_ids: typing.Sequence[str], /) -> list[dict]: ...
 
     @abc.abstractmethod
     def info(self) -> TilesetInfo: ...
 
+    def fingerprint(self) -> str | None:
+        """A stable identifier for the tileset's data, or None.
+
+        Tiles of tilesets with a fingerprint may be stored in (and served
+        from) the on-disk tile cache, which is shared between kernels and
+        sessions. The fingerprint must therefore change whenever the data
+        changes. Returns None by default, which disables on-disk caching.
+        """
+        return None
+
+    @staticmethod
+    def cancelled() -> bool:
+        """Whether the request currently being served has been cancelled.
+
+        Long-running `tiles` implementations can check this periodically and
+        stop early (e.g., by raising `concurrent.futures.CancelledError`) once
+        the front end no longer needs the tiles.
+        """
+        return cancelled()
+
     def track(self, type_: TrackType | None = None, /, **kwargs) -> higlass.api.Track:
         """
         Create a HiGlass track for the tileset.
@@ -219,6 +264,8 @@ class ClodiusTileset(Tileset):
     datatype: DataType
     tiles_impl: typing.Callable[[typing.Sequence[str]], list[typing.Any]]
     info_impl: typing.Callable[[], TilesetInfo]
+    filepath: str | pathlib.Path | None = None
+    kind: str | None = None
 
     def tiles(self, tile_ids: typing.Sequence[str], /) -> list[dict]:
         return self.tiles_impl(tile_ids)
@@ -226,9 +273,24 @@ class ClodiusTileset(Tileset):
     def info(self) -> TilesetInfo:
         return self.info_impl()
 
+    def fingerprint(self) -> str | None:
+        """Identifies the file by its path, modification time, size, and kind."""
+        if self.filepath is None or self.kind is None:
+            return None
+        try:
+            path = pathlib.Path(self.filepath).resolve()
+            stat = path.stat()
+        except OSError:
+            return None
+        key = f"{self.kind}:{path}:{stat.st_mtime_ns}:{stat.st_size}"
+        return hashlib.sha256(key.encode()).hexdigest()
+
 
 def create_lazy_clodius_loader(
-    kind: str, datatype: DataType
+    kind: str,
+    datatype: DataType,
+    tiles_impl: typing.Callable[[str | pathlib.Path, typing.Sequence[str]], list]
+    | None = None,
 ) -> typing.Callable[[str | pathlib.Path], ClodiusTileset]:
     def load(filepath: str | pathlib.Path) -> ClodiusTileset:
         try:
@@ -240,8 +302,10 @@ def create_lazy_clodius_loader(
 
         return ClodiusTileset(
             datatype=datatype,
-            tiles_impl=functools.partial(module.tiles, filepath),
+            tiles_impl=functools.partial(tiles_impl or module.tiles, filepath),
             info_impl=functools.partial(module.tileset_info, filepath),
+            filepath=filepath,
+            kind=kind,
         )
 
     return load
@@ -259,7 +323,653 @@ def chromsizes(filepath: str) -> ClodiusTileset:
 
 bed2ddb = create_lazy_clodius_loader("bed2ddb", datatype="2d-rectangle-domains")
 beddb = create_lazy_clodius_loader("beddb", datatype="vector")
-bigwig = create_lazy_clodius_loader("bigwig", datatype="vector")
+bigwig = create_lazy_clodius_loader(
+    "bigwig", datatype="vector", tiles_impl=_clodius.bigwig_tiles
+)
+# clodius keeps cooler files open itself
 cooler = create_lazy_clodius_loader("cooler", datatype="matrix")
-hitile = create_lazy_clodius_loader("hitile", datatype="vector")
-multivec = create_lazy_clodius_loader("multivec", datatype="multivec")
+hitile = create_lazy_clodius_loader(
+    "hitile", datatype="vector", tiles_impl=_clodius.hitile_tiles
+)
+multivec = create_lazy_clodius_loader(
+    "multivec", datatype="multivec", tiles_impl=_clodius.multivec_tiles
+)
+
+
+Aggregation = typing.Literal["mean", "max", "min", "sum"]
+
+
+def _downsample(
+    values: np.ndarray, counts: np.ndarray | None, aggregation: Aggregation
+) -> tuple[np.ndarray, np.ndarray | None]:
+    """Halve the resolution of a level of the pyramid, ignoring NaNs.
+
+    `counts` holds the number of (non-NaN) values summarized by each bin,
+    which the mean and sum need to weigh bins and to tell empty bins apart.
+    Bins without any values are NaN.
+    """
+    import numpy as np
+
+    if len(values) % 2:
+        values = np.append(values, np.float32(np.nan))
+        if counts is not None:
+            counts = np.append(counts, 0)
+    left, right = values[0::2], values[1::2]
+
+    if aggregation == "max":
+        return np.fmax(left, right), None
+    if aggregation == "min":
+        return np.fmin(left, right), None
+
+    assert counts is not None
+    left_counts, right_counts = counts[0::2], counts[1::2]
+    merged = np.add(left_counts, right_counts, dtype=np.int64)
+    if aggregation == "mean":
+        left = np.where(left_counts > 0, left * left_counts, 0)
+        right = np.where(right_counts > 0, right * right_counts, 0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = (left + right) / merged
+    else:
+        result = np.add(
+            np.where(left_counts > 0, left, 0),
+            np.where(right_counts > 0, right, 0),
+            dtype=np.float64,
+        )
+        result[merged == 0] = np.nan
+    return result.astype(np.float32), merged
+
+
+def _genome_bins(
+    values: np.ndarray, chromsizes: typing.Mapping[str, int], binsize: int
+) -> np.ndarray:
+    """Lay out values binned per chromosome on a genome-wide grid of bins.
+
+    HiGlass tiles a single (genome-wide) coordinate system, in which the last,
+    partial bin of a chromosome and the first bin of the next one may fall
+    into the same bin. Values already binned genome-wide are returned as is.
+    """
+    import numpy as np
+
+    lengths = np.fromiter(chromsizes.values(), dtype=np.int64, count=len(chromsizes))
+    genome_bins = -(-int(lengths.sum()) // binsize)
+    if len(values) == genome_bins:
+        return values
+
+    bins_per_chrom = -(-lengths // binsize)
+    if len(values) != bins_per_chrom.sum():
+        raise ValueError(
+            f"Expected {genome_bins} values (binned genome-wide) or "
+            f"{bins_per_chrom.sum()} values (binned per chromosome), "
+            f"got {len(values)}"
+        )
+    bin_offsets = np.repeat(np.cumsum(bins_per_chrom) - bins_per_chrom, bins_per_chrom)
+    chrom_offsets = np.repeat(np.cumsum(lengths) - lengths, bins_per_chrom)
+    starts = chrom_offsets + (np.arange(len(values)) - bin_offsets) * binsize
+    result = np.full(genome_bins, np.nan, dtype=np.float32)
+    result[starts // binsize] = values
+    return result
+
+
+class ArrayTileset(Tileset):
+    """A 1D (vector) tileset of the values in a NumPy array.
+
+    The tiles of the highest zoom level are the binned values themselves.
+    Each lower zoom level halves the resolution of the one above it, by
+    summarizing pairs of bins with the `aggregation` (ignoring NaNs). This
+    pyramid is computed once, when the tileset is created, and tiles are
+    views into its levels, so serving a tile copies no data.
+
+    If `inline` is set, all tiles are sent to the front end (as binary data)
+    along with each widget displaying the tileset, rather than on request.
+    The widget then needs no kernel to zoom and pan, e.g., in a saved
+    notebook. Inline tilesets take about twice the size of their values.
+
+    Use `array` to create one.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The value of each bin, in genome-wide order.
+    binsize : int
+        The size of each bin in bp.
+    aggregation : {"mean", "max", "min", "sum"}
+        How bins are summarized at lower zoom levels.
+    tile_size : int
+        The number of bins per tile.
+    name : str, optional
+        A name for the tileset.
+    inline : bool
+        Whether to send all tiles along with the widget.
+    """
+
+    datatype = "vector"
+    # pickling would ship the whole pyramid to the worker processes
+    _process_safe = False
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        binsize: int = 1,
+        aggregation: Aggregation = "mean",
+        tile_size: int = 1024,
+        name: str | None = None,
+        inline: bool = False,
+    ):
+        import numpy as np
+
+        if aggregation not in typing.get_args(Aggregation):
+            raise ValueError(f"Unknown aggregation: {aggregation!r}")
+        level = np.ascontiguousarray(values, dtype=np.float32)
+        if level.ndim != 1 or len(level) == 0:
+            raise ValueError("values must be a non-empty one-dimensional array")
+
+        self.binsize = binsize
+        self.aggregation = aggregation
+        self.tile_size = tile_size
+        self.name = name
+        self.inline = inline
+
+        # the highest zoom level comes first
+        counts = None
+        if aggregation in ("mean", "sum"):
+            counts = ~np.isnan(level)
+        self.levels = [level]
+        while len(level) > tile_size:
+            level, counts = _downsample(level, counts, aggregation)
+            self.levels.append(level)
+        self.max_zoom = len(self.levels) - 1
+
+    def info(self) -> TilesetInfo:
+        return {
+            "min_pos": [0],
+            "max_pos": [len(self.levels[0]) * self.binsize],
+            "max_width": self.tile_size * 2**self.max_zoom * self.binsize,
+            "tile_size": self.tile_size,
+            "max_zoom": self.max_zoom,
+        }
+
+    def tiles(self, tile_ids: typing.Sequence[str], /) -> list[dict]:
+        import numpy as np
+
+        tiles = []
+        for tile_id in tile_ids:
+            zoom, pos = map(int, tile_id.split(".")[1:3])
+            if not 0 <= zoom <= self.max_zoom:
+                raise ValueError(f"Invalid zoom level: {tile_id}")
+            level = self.levels[self.max_zoom - zoom]
+            start = pos * self.tile_size
+            dense = level[start : start + self.tile_size]
+            if len(dense) < self.tile_size:
+                # pad tiles that extend past the end of the data
+                padded = np.full(self.tile_size, np.nan, dtype=np.float32)
+                padded[: len(dense)] = dense
+                dense = padded
+            tiles.append((tile_id, {"dense": dense}))
+        return tiles
+
+    def inline_tiles(self) -> dict[str, dict]:
+        """All tiles, keyed by their position (like ``"3.1"``)."""
+        tile_ids = []
+        for zoom in range(self.max_zoom + 1):
+            count = -(-len(self.levels[self.max_zoom - zoom]) // self.tile_size)
+            tile_ids.extend(f"x.{zoom}.{pos}" for pos in range(count))
+        return {tile_id[2:]: tile for tile_id, tile in self.tiles(tile_ids)}
+
+
+def array(
+    values: npt.ArrayLike,
+    chromsizes: typing.Mapping[str, int]
+    | typing.Iterable[tuple[str, int]]
+    | None = None,
+    binsize: int = 1,
+    aggregation: Aggregation = "mean",
+    tile_size: int = 1024,
+    name: str | None = None,
+    inline: bool = False,
+) -> ArrayTileset:
+    """Create a vector tileset from an in-memory array.
+
+    Requires NumPy.
+
+    Parameters
+    ----------
+    values : array_like
+        The value of each bin. Missing values may be NaN.
+    chromsizes : Mapping[str, int] | Iterable[tuple[str, int]], optional
+        The chromosome sizes, if `values` are binned per chromosome (with a
+        partial last bin for each chromosome) rather than genome-wide. The
+        values are then laid out on a genome-wide grid of bins.
+    binsize : int, optional
+        The size of each bin in bp (default: 1).
+    aggregation : {"mean", "max", "min", "sum"}, optional
+        How bins are summarized at lower zoom levels (default: "mean").
+    tile_size : int, optional
+        The number of bins per tile (default: 1024).
+    name : str, optional
+        A name for the tileset.
+    inline : bool, optional
+        Whether to send all tiles along with the widget, so that it can be
+        zoomed without a kernel (default: False). Best suited to arrays of
+        up to a few million values.
+
+    Returns
+    -------
+    ArrayTileset
+        The tileset. Float32 arrays back the highest zoom level without a
+        copy, so they should not be modified afterwards.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import higlass as hg
+    >>> values = np.random.default_rng(0).random(100_000_000, dtype=np.float32)
+    >>> tileset = hg.array(values, binsize=10, aggregation="max")
+    >>> hg.view(tileset.track("horizontal-line"))
+    """
+    import numpy as np
+
+    values = np.asarray(values)
+    if chromsizes is not None:
+        values = _genome_bins(values, dict(chromsizes), binsize)
+    return ArrayTileset(values, binsize, aggregation, tile_size, name, inline)
+
+
+class IntervalTileset(Tileset):
+    """A bedlike tileset of the intervals in an in-memory table.
+
+    The intervals are indexed once, when the tileset is created (see
+    `IntervalIndex`). Each tile holds at most `max_per_tile` of the most
+    important intervals overlapping it, like those of a beddb file.
+
+    Use `intervals` to create one.
+
+    Parameters
+    ----------
+    columns : Mapping[str, numpy.ndarray]
+        The columns of the table. The values of each row, in column order,
+        are the ``fields`` of its interval (like the columns of a BED line).
+    starts, ends : numpy.ndarray
+        The absolute (genome-wide) start and end positions of the intervals.
+    chrom_offsets : numpy.ndarray
+        The absolute start position of the chromosome of each interval.
+    importance : numpy.ndarray
+        The importance of each interval.
+    chromsizes : Mapping[str, int]
+        The chromosome sizes.
+    max_per_tile : int
+        The maximum number of intervals per tile.
+    tile_size : int
+        The width of the tiles of the highest zoom level in bp.
+    name : str, optional
+        A name for the tileset.
+    """
+
+    datatype = "bedlike"
+    # pickling would ship the whole index to the worker processes
+    _process_safe = False
+
+    def __init__(
+        self,
+        columns: typing.Mapping[str, np.ndarray],
+        starts: np.ndarray,
+        ends: np.ndarray,
+        chrom_offsets: np.ndarray,
+        importance: np.ndarray,
+        chromsizes: typing.Mapping[str, int],
+        max_per_tile: int = 100,
+        tile_size: int = 1024,
+        name: str | None = None,
+    ):
+        from higlass._intervals import IntervalIndex
+
+        self.columns = dict(columns)
+        self.starts = starts
+        self.ends = ends
+        self.chrom_offsets = chrom_offsets
+        self.importance = importance
+        self.chromsizes = dict(chromsizes)
+        self.tile_size = tile_size
+        self.name = name
+
+        total = sum(self.chromsizes.values())
+        self.max_zoom = max(0, math.ceil(math.log2(max(total, 1) / tile_size)))
+        self.index = IntervalIndex(
+            starts, ends, importance, tile_size, self.max_zoom, max_per_tile
+        )
+
+    def info(self) -> TilesetInfo:
+        return {
+            "min_pos": [0],
+            "max_pos": [sum(self.chromsizes.values())],
+            "max_width": self.tile_size * 2**self.max_zoom,
+            "tile_size": self.tile_size,
+            "max_zoom": self.max_zoom,
+            "chromsizes": list(self.chromsizes.items()),
+            "header": "\t".join(self.columns),
+        }
+
+    def tiles(self, tile_ids: typing.Sequence[str], /) -> list[dict]:
+        tiles = []
+        for tile_id in tile_ids:
+            zoom, pos = map(int, tile_id.split(".")[1:3])
+            if not 0 <= zoom <= self.max_zoom:
+                raise ValueError(f"Invalid zoom level: {tile_id}")
+            rows = self.index.query(zoom, pos)
+            fields = zip(
+                *(map(str, column[rows].tolist()) for column in self.columns.values())
+            )
+            entries = [
+                {
+                    "xStart": start,
+                    "xEnd": end,
+                    "chrOffset": offset,
+                    "importance": importance,
+                    "uid": str(row),
+                    "fields": list(row_fields),
+                }
+                for row, start, end, offset, importance, row_fields in zip(
+                    rows.tolist(),
+                    self.starts[rows].tolist(),
+                    self.ends[rows].tolist(),
+                    self.chrom_offsets[rows].tolist(),
+                    self.importance[rows].tolist(),
+                    fields,
+                )
+            ]
+            tiles.append((tile_id, entries))
+        return tiles
+
+
+def _table_columns(table: typing.Any) -> dict[str, typing.Any]:
+    """The columns of a pandas DataFrame, Arrow table, or mapping of columns."""
+    if hasattr(table, "column_names"):
+        # pyarrow.Table
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+    return {str(name): table[name] for name in table.keys()}
+
+
+def intervals(
+    table: typing.Any,
+    chromsizes: typing.Mapping[str, int] | typing.Iterable[tuple[str, int]],
+    chrom: str | int | None = None,
+    start: str | int | None = None,
+    end: str | int | None = None,
+    importance: str | int | npt.ArrayLike | None = None,
+    max_per_tile: int = 100,
+    tile_size: int = 1024,
+    name: str | None = None,
+) -> IntervalTileset:
+    """Create a bedlike tileset from a table of intervals.
+
+    Requires NumPy.
+
+    Parameters
+    ----------
+    table : pandas.DataFrame | pyarrow.Table | Mapping[str, array_like]
+        The intervals, one per row. The values of each row, in column order,
+        are the ``fields`` of its interval, so tables laid out like BED files
+        (with names, scores, and strands) are displayed like them.
+    chromsizes : Mapping[str, int] | Iterable[tuple[str, int]]
+        The chromosome sizes (in the order of the genome-wide coordinates).
+    chrom, start, end : str | int, optional
+        The columns with the chromosomes, start, and (exclusive) end
+        positions of the intervals (default: the first three columns).
+    importance : str | int | array_like, optional
+        A column (or the values) by which to rank intervals. More important
+        intervals are shown at lower zoom levels. Defaults to the lengths
+        of the intervals.
+    max_per_tile : int, optional
+        The maximum number of intervals per tile (default: 100).
+    tile_size : int, optional
+        The width of the tiles of the highest zoom level in bp
+        (default: 1024).
+    name : str, optional
+        A name for the tileset.
+
+    Returns
+    -------
+    IntervalTileset
+        The tileset.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> import higlass as hg
+    >>> peaks = pd.read_csv("peaks.bed", sep="\t", header=None)
+    >>> tileset = hg.intervals(peaks, chromsizes, importance=4)
+    >>> hg.view(tileset.track("bedlike"))
+    """
+    import numpy as np
+
+    from higlass._scale import Scale
+
+    columns = _table_columns(table)
+    names = list(columns)
+    if len(names) < 3 and None in (chrom, start, end):
+        raise ValueError("Expected chrom, start, and end columns")
+    chrom = names[0] if chrom is None else str(chrom)
+    start = names[1] if start is None else str(start)
+    end = names[2] if end is None else str(end)
+
+    scale = Scale(chromsizes)
+    offsets, lengths, _ = scale._arrays
+    codes = scale._chrom_codes(columns[chrom])
+    chrom_offsets = offsets[codes]
+    # clipped to their chromosomes
+    starts = np.clip(np.asarray(columns[start], dtype=np.int64), 0, lengths[codes])
+    ends = np.clip(np.asarray(columns[end], dtype=np.int64), starts, lengths[codes])
+    starts += chrom_offsets
+    ends += chrom_offsets
+
+    if importance is None:
+        importance = ends - starts
+    elif isinstance(importance, (str, int)):
+        importance = columns[str(importance)]
+    importance = np.asarray(importance, dtype=np.float64)
+
+    columns = {key: np.asarray(column) for key, column in columns.items()}
+    return IntervalTileset(
+        columns,
+        starts,
+        ends,
+        chrom_offsets,
+        importance,
+        scale.chromsizes,
+        max_per_tile,
+        tile_size,
+        name,
+    )
+
+
+class PointTileset(Tileset):
+    """A 2D tileset of the points in in-memory coordinate arrays.
+
+    The points are indexed once, when the tileset is created (see
+    `PointIndex`). Each tile holds at most `max_per_tile` of the most
+    important points in it, as zero-sized rectangles, like the tiles of a
+    bed2ddb file.
+
+    Use `points` to create one.
+
+    Parameters
+    ----------
+    x, y : numpy.ndarray
+        The absolute (genome-wide) coordinates of the points.
+    importance : numpy.ndarray
+        The importance of each point.
+    columns : Mapping[str, numpy.ndarray]
+        Columns with the ``fields`` of the points.
+    max_pos : int
+        The extent of the coordinates (in both dimensions).
+    chromsizes : Mapping[str, int], optional
+        The chromosome sizes.
+    max_per_tile : int
+        The maximum number of points per tile.
+    tile_size : int
+        The width of the tiles of the highest zoom level in bp.
+    name : str, optional
+        A name for the tileset.
+    """
+
+    datatype = "2d-rectangle-domains"
+    # pickling would ship the whole index to the worker processes
+    _process_safe = False
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        importance: np.ndarray,
+        columns: typing.Mapping[str, np.ndarray],
+        max_pos: int,
+        chromsizes: typing.Mapping[str, int] | None = None,
+        max_per_tile: int = 100,
+        tile_size: int = 1024,
+        name: str | None = None,
+    ):
+        from higlass._quadtree import PointIndex
+
+        self.x = x
+        self.y = y
+        self.importance = importance
+        self.columns = dict(columns)
+        self.max_pos = max_pos
+        self.chromsizes = None if chromsizes is None else dict(chromsizes)
+        self.tile_size = tile_size
+        self.name = name
+
+        self.max_zoom = max(0, math.ceil(math.log2(max(max_pos, 1) / tile_size)))
+        self.index = PointIndex(
+            x, y, importance, tile_size, self.max_zoom, max_per_tile
+        )
+
+    def info(self) -> TilesetInfo:
+        info: TilesetInfo = {
+            "min_pos": [0, 0],
+            "max_pos": [self.max_pos, self.max_pos],
+            "max_width": self.tile_size * 2**self.max_zoom,
+            "tile_size": self.tile_size,
+            "max_zoom": self.max_zoom,
+        }
+        if self.chromsizes is not None:
+            info["chromsizes"] = list(self.chromsizes.items())
+        return info
+
+    def tiles(self, tile_ids: typing.Sequence[str], /) -> list[dict]:
+        tiles = []
+        for tile_id in tile_ids:
+            zoom, x, y = map(int, tile_id.split(".")[1:4])
+            if not 0 <= zoom <= self.max_zoom:
+                raise ValueError(f"Invalid zoom level: {tile_id}")
+            rows = self.index.query(zoom, x, y)
+            fields: typing.Iterable[tuple] = itertools.repeat(())
+            if self.columns:
+                fields = zip(
+                    *(map(str, col[rows].tolist()) for col in self.columns.values())
+                )
+            entries = [
+                {
+                    "xStart": px,
+                    "xEnd": px,
+                    "yStart": py,
+                    "yEnd": py,
+                    "chrOffset": 0,
+                    "importance": importance,
+                    "uid": str(row),
+                    "fields": list(row_fields),
+                }
+                for row, px, py, importance, row_fields in zip(
+                    rows.tolist(),
+                    self.x[rows].tolist(),
+                    self.y[rows].tolist(),
+                    self.importance[rows].tolist(),
+                    fields,
+                )
+            ]
+            tiles.append((tile_id, entries))
+        return tiles
+
+
+def points(
+    x: npt.ArrayLike,
+    y: npt.ArrayLike,
+    importance: npt.ArrayLike | None = None,
+    fields: typing.Any = None,
+    chromsizes: typing.Mapping[str, int]
+    | typing.Iterable[tuple[str, int]]
+    | None = None,
+    max_per_tile: int = 100,
+    tile_size: int = 1024,
+    name: str | None = None,
+) -> PointTileset:
+    """Create a 2D tileset from the coordinates of points.
+
+    Requires NumPy.
+
+    Parameters
+    ----------
+    x, y : array_like
+        The absolute (genome-wide) coordinates of the points, e.g., from
+        `higlass.tiles.region_domains`. Must be non-negative.
+    importance : array_like, optional
+        The importance of each point. More important points are shown at
+        lower zoom levels. Defaults to a (reproducible) random sample of
+        the points of each tile.
+    fields : pandas.DataFrame | pyarrow.Table | Mapping[str, array_like], optional
+        A table with a row of ``fields`` for each point.
+    chromsizes : Mapping[str, int] | Iterable[tuple[str, int]], optional
+        The chromosome sizes, which determine the extent of the tileset.
+        Defaults to the largest coordinate.
+    max_per_tile : int, optional
+        The maximum number of points per tile (default: 100).
+    tile_size : int, optional
+        The width of the tiles of the highest zoom level in bp
+        (default: 1024).
+    name : str, optional
+        A name for the tileset.
+
+    Returns
+    -------
+    PointTileset
+        The tileset.
+
+    Examples
+    --------
+    >>> import higlass as hg
+    >>> from higlass.tiles import region_domains
+    >>> x, _ = region_domains(chromsizes, df["chrom1"], df["pos1"], df["pos1"] + 1)
+    >>> y, _ = region_domains(chromsizes, df["chrom2"], df["pos2"], df["pos2"] + 1)
+    >>> tileset = hg.points(x, y, chromsizes=chromsizes)
+    >>> hg.view(tileset.track("2d-rectangle-domains"))
+    """
+    import numpy as np
+
+    x, y = np.asarray(x), np.asarray(y)
+    if x.shape != y.shape or x.ndim != 1:
+        raise ValueError("x and y must be one-dimensional arrays of equal length")
+    if len(x) and (x.min() < 0 or y.min() < 0):
+        raise ValueError("Coordinates must be non-negative")
+
+    if importance is None:
+        importance = np.random.default_rng(0).random(len(x))
+    importance = np.asarray(importance, dtype=np.float64)
+
+    if chromsizes is not None:
+        chromsizes = dict(chromsizes)
+        max_pos = sum(chromsizes.values())
+    else:
+        max_pos = math.floor(max(x.max(), y.max())) + 1 if len(x) else 1
+
+    columns = _table_columns(fields) if fields is not None else {}
+    columns = {key: np.asarray(column) for key, column in columns.items()}
+    return PointTileset(
+        x,
+        y,
+        importance,
+        columns,
+        max_pos,
+        chromsizes,
+        max_per_tile,
+        tile_size,
+        name,
+    )
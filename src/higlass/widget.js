@@ -96,7 +96,19 @@ function assert(expression, msg = "") {
  * 1. Process the message.
  * 2. Respond with the same `id` and a new payload.
  *
+ * Python may also send any number of partial responses (with `done: false`) before
+ * the final one. These are passed to the optional `onPartial` callback.
+ *
+ * An optional `widget` id is sent along so that Python can schedule requests fairly
+ * across widgets.
+ *
  * An `AbortSignal` can be used to adjust whether the promise should reject (default: a 3s timeout).
+ * When the signal aborts, a `{ type: "cancel" }` message with the same `id` is sent so
+ * that Python can drop the request if it is still pending.
+ *
+ * If the final response has `trace: true` (i.e., Python is recording a trace), a
+ * `{ type: "timing" }` message with the same `id` reports when the request was sent
+ * and its response received (as Unix times in milliseconds).
  *
  * **Example:**
  *
@@ -116,11 +128,12 @@ function assert(expression, msg = "") {
  *
  * @template T
  * @param {AnyModel} model
- * @param {{ payload: unknown, signal?: AbortSignal }} options
+ * @param {{ payload: unknown, widget?: string, signal?: AbortSignal, onPartial?: (response: { payload: T, buffers: Array<DataView> }) => void }} options
  * @return {Promise<{ payload: T, buffers: Array<DataView> }>}
  */
 function sendCustomMessage(model, options) {
   let id = uid();
+  let sent = performance.timeOrigin + performance.now();
   let signal = options.signal ?? AbortSignal.timeout(3000);
 
   return new Promise((resolve, reject) => {
@@ -128,33 +141,206 @@ function sendCustomMessage(model, options) {
       reject(signal.reason);
     }
 
-    signal.addEventListener("abort", () => {
+    function abort() {
       model.off("msg:custom", handler);
+      model.send({ id, payload: { type: "cancel" } });
       reject(signal.reason);
-    });
+    }
+
+    signal.addEventListener("abort", abort, { once: true });
 
     /**
-     * @param {{ id: string, payload: T }} msg
+     * @param {{ id: string, payload: T, done?: boolean, trace?: boolean }} msg
      * @param {DataView[]} buffers
      */
     function handler(msg, buffers) {
       if (!(msg.id === id)) return;
+      if (msg.done === false) {
+        options.onPartial?.({ payload: msg.payload, buffers });
+        return;
+      }
       resolve({ payload: msg.payload, buffers });
       model.off("msg:custom", handler);
+      signal.removeEventListener("abort", abort);
+      if (msg.trace) {
+        let received = performance.timeOrigin + performance.now();
+        model.send({ id, payload: { type: "timing", sent, received } });
+      }
     }
 
     model.on("msg:custom", handler);
-    model.send({ id, payload: options.payload });
+    model.send({ id, widget: options.widget, payload: options.payload });
   });
 }
 
+/** @type {Record<string, new (buffer: ArrayBuffer, byteOffset: number, length: number) => ArrayLike<number>>} */
+const TYPED_ARRAYS = {
+  float32: Float32Array,
+  float64: Float64Array,
+  int8: Int8Array,
+  int16: Int16Array,
+  int32: Int32Array,
+  uint8: Uint8Array,
+  uint16: Uint16Array,
+  uint32: Uint32Array,
+};
+
+/**
+ * Convert an IEEE 754 half-precision float (as uint16 bits) to a number.
+ *
+ * @param {number} bits
+ * @returns {number}
+ */
+function float16ToNumber(bits) {
+  let sign = bits & 0x8000 ? -1 : 1;
+  let exponent = (bits >> 10) & 0x1f;
+  let fraction = bits & 0x03ff;
+  if (exponent === 0) return sign * 2 ** -14 * (fraction / 1024);
+  if (exponent === 0x1f) return fraction ? NaN : sign * Infinity;
+  return sign * 2 ** (exponent - 15) * (1 + fraction / 1024);
+}
+
+/**
+ * Create a `Float32Array` from a binary buffer sent by Python.
+ *
+ * Avoids copying the data when it is already aligned float32.
+ *
+ * @param {DataView} view - The raw buffer.
+ * @param {string} dtype - The NumPy dtype name of the data.
+ * @returns {Float32Array}
+ */
+function toFloat32Array(view, dtype) {
+  // copy to a fresh (aligned) ArrayBuffer only if necessary
+  let buffer = view.buffer;
+  let byteOffset = view.byteOffset;
+  if (byteOffset % 8 !== 0) {
+    buffer = view.buffer.slice(byteOffset, byteOffset + view.byteLength);
+    byteOffset = 0;
+  }
+  if (dtype === "float32") {
+    return new Float32Array(buffer, byteOffset, view.byteLength / 4);
+  }
+  if (dtype === "float16") {
+    let bits = new Uint16Array(buffer, byteOffset, view.byteLength / 2);
+    return Float32Array.from(bits, float16ToNumber);
+  }
+  let TypedArray = TYPED_ARRAYS[dtype];
+  assert(TypedArray, `Unsupported dtype for binary tile: ${dtype}`);
+  // @ts-expect-error - all typed arrays have a BYTES_PER_ELEMENT
+  let length = view.byteLength / TypedArray.BYTES_PER_ELEMENT;
+  return Float32Array.from(new TypedArray(buffer, byteOffset, length));
+}
+
+/**
+ * Remove binary dense data from a tiles response.
+ *
+ * Python sends dense tile data as raw buffers, with `dense: { buffer: i }`
+ * referencing the buffer in the tile's JSON. These references are removed
+ * from `payload` (in place) so that the remaining tile data can be handled
+ * by HiGlass as usual.
+ *
+ * @param {Record<string, any>} payload - The tiles response payload.
+ * @param {Array<DataView>} buffers - The buffers sent with the response.
+ * @returns {Record<string, Float32Array>} The decoded dense data by tile id.
+ */
+function unpackDenseBuffers(payload, buffers) {
+  /** @type {Record<string, Float32Array>} */
+  let dense = {};
+  for (let [id, tile] of Object.entries(payload)) {
+    let index = tile?.dense?.buffer;
+    if (typeof index !== "number") continue;
+    dense[id] = toFloat32Array(buffers[index], tile.dtype);
+    delete tile.dense;
+  }
+  return dense;
+}
+
+/**
+ * The model of each rendered view of a widget, by widget id (see
+ * `resolveJupyterServers`), for looking up its inline tilesets.
+ *
+ * @type {Map<string, AnyModel<State>>}
+ */
+const RENDERED_MODELS = new Map();
+
+/**
+ * A tileset whose info and tiles were sent along with a widget.
+ *
+ * Its tiles are served without a round trip to Python, so widgets
+ * displaying it work without a kernel (e.g., in a saved notebook).
+ *
+ * @param {string | undefined} widgetId
+ * @param {string} uid - The tileset uid.
+ * @returns {InlineTileset | undefined}
+ */
+function inlineTileset(widgetId, uid) {
+  if (widgetId === undefined) return undefined;
+  return RENDERED_MODELS.get(widgetId)?.get("_inline_tilesets")?.[uid];
+}
+
+/**
+ * The tiles of inline tilesets, in the format of a binary tiles response.
+ *
+ * @param {Array<string>} tileIds - Tile ids (`uid.z.x`); others are skipped.
+ * @param {string | undefined} widgetId
+ * @returns {{ payload: Record<string, any>, buffers: Array<DataView> }}
+ */
+function inlineTiles(tileIds, widgetId) {
+  /** @type {Record<string, any>} */
+  let payload = {};
+  /** @type {Array<DataView>} */
+  let buffers = [];
+  for (let id of tileIds) {
+    let [uid, ...position] = id.split(".");
+    let tile = inlineTileset(widgetId, uid)?.tiles[position.join(".")];
+    if (!tile) continue;
+    if (tile.dense instanceof DataView) {
+      payload[id] = { ...tile, dense: { buffer: buffers.length } };
+      buffers.push(tile.dense);
+    } else {
+      payload[id] = { ...tile };
+    }
+  }
+  return { payload, buffers };
+}
+
+/**
+ * The smallest non-zero value of an array (matching HiGlass).
+ *
+ * @param {Float32Array} array
+ * @returns {number}
+ */
+function minNonZero(array) {
+  let min = Number.MAX_SAFE_INTEGER;
+  for (let value of array) {
+    if (value && value < min) min = value;
+  }
+  return min;
+}
+
+/**
+ * The largest non-zero value of an array (matching HiGlass).
+ *
+ * @param {Float32Array} array
+ * @returns {number}
+ */
+function maxNonZero(array) {
+  let max = Number.MIN_SAFE_INTEGER;
+  for (let value of array) {
+    if (value && value > max) max = value;
+  }
+  return max;
+}
+
 /**
  * Transforms the original view config into tracks recognized by the custom data fetcher.
  *
  * Finds tracks with `server: 'jupyter'`, removes the key, and adds a `data` object
- * with `type: dataFetcherId` and the track’s `tilesetUid`.
+ * with `type: dataFetcherId`, the track’s `tilesetUid`, and the id of the widget
+ * displaying it.
  *
  * @param {Viewconf} viewConfig - The original view configuration.
+ * @param {string} widgetId - The id of the widget model.
  * @returns {Viewconf} A modified deep copy of the view config.
  *
  * @example
@@ -165,11 +351,11 @@ function sendCustomMessage(model, options) {
  * );
  * // Returns:
  * // {
- * //   views: [{ tracks: { top: [{ tilesetUid: 'abc', data: { type: 'jupyter', tilesetUid: 'abc' } }] } }]
+ * //   views: [{ tracks: { top: [{ tilesetUid: 'abc', data: { type: 'jupyter', tilesetUid: 'abc', widget: 'jupyter-123' } }] } }]
  * // }
  * ```
  */
-function resolveJupyterServers(viewConfig) {
+function resolveJupyterServers(viewConfig, widgetId) {
   const copy = JSON.parse(JSON.stringify(viewConfig));
 
   for (const view of copy.views) {
@@ -189,12 +375,145 @@ function resolveJupyterServers(viewConfig) {
         track.data = track.data || {};
         track.data.type = NAME;
         track.data.tilesetUid = track.tilesetUid;
+        track.data.widget = widgetId;
       }
     }
   }
   return copy;
 }
 
+/**
+ * Like `resolveJupyterServers` for a single track (not a combined track).
+ *
+ * @param {any} track
+ * @param {string} widgetId
+ * @returns {any} The track, or a resolved copy of it.
+ */
+function resolveTrack(track, widgetId) {
+  if (track?.server !== NAME) {
+    return track;
+  }
+  let { server: _, ...copy } = track;
+  copy.data = {
+    ...copy.data,
+    type: NAME,
+    tilesetUid: copy.tilesetUid,
+    widget: widgetId,
+  };
+  return copy;
+}
+
+/**
+ * A copy of `tracks` with the track with the uid `uid` replaced by
+ * `update(track)`, or `undefined` if there is no such track.
+ *
+ * @param {Array<any>} tracks
+ * @param {string} uid
+ * @param {(track: any) => any} update
+ * @returns {Array<any> | undefined}
+ */
+function replaceTrack(tracks, uid, update) {
+  for (let [i, track] of tracks.entries()) {
+    let replacement;
+    if (track.uid === uid) {
+      replacement = update(track);
+    } else if (track.contents) {
+      let contents = replaceTrack(track.contents, uid, update);
+      replacement = contents && { ...track, contents };
+    }
+    if (replacement) {
+      return tracks.with(i, replacement);
+    }
+  }
+  return undefined;
+}
+
+/**
+ * Applies patches sent by `HiGlassWidget` (see `_apply_patch` in Python) to a
+ * view config.
+ *
+ * Only the changed views, track lists, and tracks are copied, so that the
+ * viewer can tell the unchanged tracks (and their tiles) apart.
+ *
+ * @param {Viewconf} viewConfig
+ * @param {Array<any>} patches
+ * @param {(track: any) => any} resolve - Resolves a new or updated track.
+ * @returns {Viewconf} The patched view config.
+ */
+function applyPatches(viewConfig, patches, resolve) {
+  let views = viewConfig.views.slice();
+  for (let patch of patches) {
+    if (patch.op === "add_view") {
+      let view = patch.view;
+      let tracks = Object.fromEntries(
+        Object.entries(view.tracks ?? {}).map(([position, tracks]) => [
+          position,
+          tracks.map((/** @type {any} */ track) =>
+            track.contents
+              ? { ...track, contents: track.contents.map(resolve) }
+              : resolve(track)
+          ),
+        ]),
+      );
+      views.push({ ...view, tracks });
+      continue;
+    }
+    /** @type {(track: any) => any} */
+    let update = patch.op === "set_options"
+      ? (track) => ({
+        ...track,
+        options: { ...track.options, ...patch.options },
+      })
+      : (track) => resolve({ ...track, ...patch.properties });
+    let found = views.some((view, i) => {
+      for (let [position, tracks] of Object.entries(view.tracks ?? {})) {
+        let replaced = replaceTrack(tracks ?? [], patch.track, update);
+        if (replaced) {
+          let tracks = { ...view.tracks, [position]: replaced };
+          views[i] = { ...view, tracks };
+          return true;
+        }
+      }
+      return false;
+    });
+    assert(found, `No track with uid ${patch.track}`);
+  }
+  return { ...viewConfig, views };
+}
+
+/**
+ * Resolves the pending tile requests whose tiles have all been received.
+ *
+ * Resolved requests are removed from `pending`. Tiles that were received
+ * empty are left out of the responses.
+ *
+ * @param {Set<WithResolvers<{ tileIds: Array<string> }, Record<string, any>>>} pending
+ * @param {Record<string, unknown>} received - The tiles received so far, by id.
+ * @param {boolean} done - Whether to resolve all remaining requests.
+ */
+function settle(pending, received, done) {
+  for (let request of pending) {
+    let ids = request.data.tileIds;
+    if (!done && !ids.every((id) => id in received)) continue;
+    /** @type {Record<string, unknown>} */
+    const requestData = {};
+    for (let id of ids) {
+      let tileData = received[id];
+      if (tileData) requestData[id] = tileData;
+    }
+    request.resolve(requestData);
+    pending.delete(request);
+  }
+}
+
+/**
+ * The view config of each widget model with the patches applied so far, for
+ * views of the widget that are rendered after the patches were sent.
+ *
+ * @type {WeakMap<AnyModel<State>, { viewconf: Viewconf, version: number }>}
+ */
+const PATCHED_VIEWCONFS = new WeakMap();
+
 /**
  * @param {AnyModel<State>} model */
 async function registerJupyterHiGlassDataFetcher(model) {
@@ -213,8 +532,11 @@ async function registerJupyterHiGlassDataFetcher(model) {
     return new hgc.dataFetchers.DataFetcher(config, pubSub, {
       async fetchTilesetInfo({ server, tilesetUid }) {
         assert(server === NAME, "must be a jupyter server");
+        let inline = inlineTileset(dataConfig.widget, tilesetUid);
+        if (inline) return inline.info;
         let response = await sendCustomMessage(tModel, {
           payload: { type: "tileset_info", tilesetUid },
+          widget: dataConfig.widget,
         });
         return response.payload;
       },
@@ -222,23 +544,55 @@ async function registerJupyterHiGlassDataFetcher(model) {
         /** @param {Array<WithResolvers<{ tileIds: Array<string> }, Record<string, any>>>} requests */
         async (requests) => {
           let tileIds = [...new Set(requests.flatMap((r) => r.data.tileIds))];
-          let response = await sendCustomMessage(tModel, {
-            payload: { type: "tiles", tileIds },
-          });
-          let tiles = hgc.services.tileResponseToData(
-            response.payload,
-            NAME,
-            tileIds,
+          /** @type {Record<string, unknown>} */
+          let received = {};
+          let pending = new Set(requests);
+
+          /** @param {{ payload: Record<string, any>, buffers: Array<DataView> }} response */
+          function receive({ payload, buffers }) {
+            let dense = unpackDenseBuffers(payload, buffers);
+            let tiles = hgc.services.tileResponseToData(
+              payload,
+              NAME,
+              Object.keys(payload),
+            );
+            for (let [id, array] of Object.entries(dense)) {
+              /** @type {Record<string, any>} */
+              let tile = tiles[id];
+              tile.dense = array;
+              tile.minNonZero = minNonZero(array);
+              tile.maxNonZero = maxNonZero(array);
+            }
+            Object.assign(received, tiles);
+            settle(pending, received, false);
+          }
+
+          receive(inlineTiles(tileIds, dataConfig.widget));
+          let requested = tileIds.filter(
+            (id) => !inlineTileset(dataConfig.widget, id.split(".")[0]),
           );
-          for (let request of requests) {
-            /** @type {Record<string, unknown>} */
-            const requestData = {};
-            for (let id of request.data.tileIds) {
-              let tileData = tiles[id];
-              if (tileData) requestData[id] = tileData;
+          try {
+            // tracks whose tiles arrive early are resolved immediately
+            if (requested.length > 0) {
+              receive(
+                await sendCustomMessage(tModel, {
+                  payload: { type: "tiles", tileIds: requested },
+                  widget: dataConfig.widget,
+                  onPartial: receive,
+                }),
+              );
             }
-            request.resolve(requestData);
+          } catch (err) {
+            for (let request of pending) request.reject(err);
+            return;
           }
+          // fills in errors for any tiles that were never sent
+          let missing = tileIds.filter((id) => !(id in received));
+          Object.assign(
+            received,
+            hgc.services.tileResponseToData({}, NAME, missing),
+          );
+          settle(pending, received, true);
         },
       ),
       registerTileset() {
@@ -265,6 +619,62 @@ function locationToCoordinates({ xDomain, yDomain }) {
   return [x, xe, y, ye];
 }
 
+/**
+ * The `location` of a widget with `count` views.
+ *
+ * A widget with a single view has a flat location (`[x0, x1, y0, y1]`), and
+ * otherwise one location per view (empty until the view reports it).
+ *
+ * @param {Array<number> | Array<Array<number>>} location
+ * @param {number} count - The number of views.
+ * @returns {Array<number> | Array<Array<number>>}
+ */
+function resizeLocation(location, count) {
+  /** @type {Array<Array<number>>} */
+  let locations = Array.isArray(location[0])
+    ? /** @type {Array<Array<number>>} */ (location)
+    : [/** @type {Array<number>} */ (location)];
+  if (count === 1) {
+    return locations[0] ?? [];
+  }
+  return Array.from({ length: count }, (_, i) => locations[i] ?? []);
+}
+
+/**
+ * Syncs the `location` of a widget model with the views of a viewer.
+ *
+ * @param {any} api - The HiGlass viewer API.
+ * @param {AnyModel<State>} model
+ * @param {Viewconf["views"]} views - The views of the viewer.
+ * @returns {() => void} unlisten
+ */
+function listenToLocation(api, model, views) {
+  let listeners = views.map((view, idx) =>
+    api.on(
+      "location",
+      (/** @type {GenomicLocation} */ loc) => {
+        if (views.length === 1) {
+          model.set("location", locationToCoordinates(loc));
+        } else {
+          let locations = /** @type {Array<Array<number>>} */ (
+            resizeLocation(model.get("location"), views.length)
+          );
+          locations[idx] = locationToCoordinates(loc);
+          model.set("location", locations);
+        }
+        model.save_changes();
+      },
+      view.uid,
+      undefined,
+    )
+  );
+  return () => {
+    views.forEach((view, idx) => {
+      api.off("location", listeners[idx], view.uid);
+    });
+  };
+}
+
 /**
  * @param {HTMLElement} el
  * @returns {() => void} unlisten
@@ -296,8 +706,25 @@ function addEventListenersTo(el) {
  * @property {`IPY_MODEL_${string}`} _tileset_client
  * @property {Array<number> | Array<Array<number>>} location
  * @property {Array<string>} _plugin_urls
+ * @property {Record<string, InlineTileset>} [_inline_tilesets]
  */
 
+/**
+ * @typedef InlineTileset
+ * @property {Record<string, unknown>} info
+ * @property {Record<string, { dense?: DataView | string, dtype?: string }>} tiles - By position (`z.x`).
+ */
+
+export {
+  applyPatches,
+  float16ToNumber,
+  replaceTrack,
+  resizeLocation,
+  resolveTrack,
+  settle,
+  unpackDenseBuffers,
+};
+
 export default {
   /** @type {import("@anywidget/types").Render<State>} */
   async render({ model, el }) {
@@ -305,8 +732,13 @@ export default {
       requireScripts(model.get("_plugin_urls")),
       registerJupyterHiGlassDataFetcher(model),
     ]);
+
+    // identifies this view of the widget for fair scheduling in Python
+    let widgetId = uid();
+    RENDERED_MODELS.set(widgetId, model);
     let viewconf = resolveJupyterServers(
-      model.get("_viewconf"),
+      PATCHED_VIEWCONFS.get(model)?.viewconf ?? model.get("_viewconf"),
+      widgetId,
     );
     let options = model.get("_options") ?? {};
 
@@ -322,37 +754,44 @@ export default {
     model.on("msg:custom", (msg) => {
       msg = JSON.parse(msg);
       let [fn, ...args] = msg;
+      if (fn === "patch") {
+        let [version, patches] = args;
+        let patched = PATCHED_VIEWCONFS.get(model) ??
+          { viewconf: model.get("_viewconf"), version: 0 };
+        if (patched.version < version) {
+          PATCHED_VIEWCONFS.set(model, {
+            viewconf: applyPatches(patched.viewconf, patches, (t) => t),
+            version,
+          });
+        }
+        let count = viewconf.views.length;
+        viewconf = applyPatches(
+          viewconf,
+          patches,
+          (track) => resolveTrack(track, widgetId),
+        );
+        api.setViewConfig(viewconf);
+        if (viewconf.views.length !== count) {
+          // added views report their location too
+          unlistenLocation();
+          model.set(
+            "location",
+            resizeLocation(model.get("location"), viewconf.views.length),
+          );
+          model.save_changes();
+          unlistenLocation = listenToLocation(api, model, viewconf.views);
+        }
+        return;
+      }
       /** @type {any} */ (api)[fn](...args);
     });
 
-    if (viewconf.views.length === 1) {
-      api.on(
-        "location",
-        (/** @type {GenomicLocation} */ loc) => {
-          model.set("location", locationToCoordinates(loc));
-          model.save_changes();
-        },
-        viewconf.views[0].uid,
-        undefined,
-      );
-    } else {
-      viewconf.views.forEach((view, idx) => {
-        api.on(
-          "location",
-          (/** @type{GenomicLocation} */ loc) => {
-            let location = model.get("location").slice();
-            location[idx] = locationToCoordinates(loc);
-            model.set("location", location);
-            model.save_changes();
-          },
-          view.uid,
-          undefined,
-        );
-      });
-    }
+    let unlistenLocation = listenToLocation(api, model, viewconf.views);
 
     return () => {
       unlisten();
+      unlistenLocation();
+      RENDERED_MODELS.delete(widgetId);
     };
   },
 };
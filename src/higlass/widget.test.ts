@@ -64,3 +64,207 @@ test("render creates a HiGlass viewer with a simple viewconf", async () => {
   expect(typeof cleanup).toBe("function");
   cleanup?.();
 });
+
+test("resolveTrack resolves jupyter tracks only", async () => {
+  const { resolveTrack } = await import("./widget.js");
+
+  const remote = { uid: "a", server: "https://higlass.io/api/v1" };
+  expect(resolveTrack(remote, "w")).toBe(remote);
+
+  const track = { uid: "b", server: "jupyter", tilesetUid: "ts", data: {} };
+  expect(resolveTrack(track, "w")).toEqual({
+    uid: "b",
+    tilesetUid: "ts",
+    data: { type: "jupyter", tilesetUid: "ts", widget: "w" },
+  });
+  // the original track is left as is
+  expect(track.server).toBe("jupyter");
+  expect(track.data).toEqual({});
+});
+
+test("replaceTrack replaces tracks and tracks of combined tracks", async () => {
+  const { replaceTrack } = await import("./widget.js");
+  const update = (track: { uid: string }) => ({ ...track, height: 10 });
+
+  const other = { uid: "other" };
+  const inner = { uid: "inner" };
+  const combined = { uid: "combined", contents: [inner, { uid: "x" }] };
+  const tracks = [other, combined];
+
+  const replaced = replaceTrack(tracks, "other", update);
+  expect(replaced).toEqual([{ uid: "other", height: 10 }, combined]);
+  expect(replaced?.[1]).toBe(combined);
+
+  const nested = replaceTrack(tracks, "inner", update);
+  expect(nested?.[0]).toBe(other);
+  expect(nested?.[1].contents).toEqual([
+    { uid: "inner", height: 10 },
+    { uid: "x" },
+  ]);
+  expect(nested?.[1].contents[1]).toBe(combined.contents[1]);
+  // copies only
+  expect(tracks).toEqual([other, combined]);
+  expect(combined.contents[0]).toBe(inner);
+
+  expect(replaceTrack(tracks, "missing", update)).toBeUndefined();
+});
+
+test("applyPatches updates tracks and adds views", async () => {
+  const { applyPatches } = await import("./widget.js");
+  const resolve = vi.fn((track) => ({ ...track, resolved: true }));
+
+  const first = {
+    uid: "v1",
+    tracks: {
+      top: [{ uid: "a", options: { color: "red", width: 1 } }],
+      left: [{ uid: "b" }],
+    },
+  };
+  const second = { uid: "v2", tracks: { top: [{ uid: "c" }] } };
+  const viewconf = { views: [first, second] };
+
+  const patched = applyPatches(viewconf, [
+    { op: "set_options", track: "a", options: { color: "blue" } },
+    { op: "update_track", track: "c", properties: { height: 20 } },
+    {
+      op: "add_view",
+      view: {
+        uid: "v3",
+        tracks: {
+          top: [
+            { uid: "d" },
+            { uid: "e", type: "combined", contents: [{ uid: "f" }] },
+          ],
+        },
+      },
+    },
+  ], resolve);
+
+  const [v1, v2, v3] = patched.views as Array<any>;
+  expect(v1.tracks.top[0].options).toEqual({ color: "blue", width: 1 });
+  expect(v1.tracks.left).toBe(first.tracks.left);
+  expect(v2.tracks.top[0]).toEqual({ uid: "c", height: 20, resolved: true });
+  expect(v3.tracks.top).toEqual([
+    { uid: "d", resolved: true },
+    { uid: "e", type: "combined", contents: [{ uid: "f", resolved: true }] },
+  ]);
+  // the original view config is left as is
+  expect(viewconf.views).toEqual([first, second]);
+  expect(first.tracks.top[0].options).toEqual({ color: "red", width: 1 });
+
+  expect(() =>
+    applyPatches(viewconf, [
+      { op: "set_options", track: "missing", options: {} },
+    ], resolve)
+  ).toThrow("missing");
+});
+
+test("settle resolves requests once their tiles are received", async () => {
+  const { settle } = await import("./widget.js");
+  const request = (tileIds: Array<string>) => ({
+    data: { tileIds },
+    resolve: vi.fn(),
+    reject: vi.fn(),
+  });
+  const early = request(["a.0.0"]);
+  const late = request(["a.0.0", "b.0.0", "b.1.0"]);
+  const pending = new Set([early, late]);
+  const received: Record<string, unknown> = {};
+
+  received["a.0.0"] = { dense: [1] };
+  settle(pending, received, false);
+  expect(early.resolve).toHaveBeenCalledWith({ "a.0.0": { dense: [1] } });
+  expect(late.resolve).not.toHaveBeenCalled();
+  expect([...pending]).toEqual([late]);
+
+  received["b.0.0"] = undefined;
+  settle(pending, received, false);
+  expect(late.resolve).not.toHaveBeenCalled();
+
+  // the remaining requests get the tiles received so far
+  settle(pending, received, true);
+  expect(late.resolve).toHaveBeenCalledWith({ "a.0.0": { dense: [1] } });
+  expect(pending.size).toBe(0);
+  expect(early.resolve).toHaveBeenCalledTimes(1);
+});
+
+test("float16ToNumber decodes half-precision floats", async () => {
+  const { float16ToNumber } = await import("./widget.js");
+  expect(float16ToNumber(0x0000)).toBe(0);
+  expect(float16ToNumber(0x8000)).toBe(-0);
+  expect(float16ToNumber(0x3c00)).toBe(1);
+  expect(float16ToNumber(0xc000)).toBe(-2);
+  expect(float16ToNumber(0x3555)).toBeCloseTo(1 / 3, 3);
+  expect(float16ToNumber(0x7bff)).toBe(65504);
+  expect(float16ToNumber(0x0400)).toBe(2 ** -14);
+  expect(float16ToNumber(0x0001)).toBe(2 ** -24);
+  expect(float16ToNumber(0x7c00)).toBe(Infinity);
+  expect(float16ToNumber(0xfc00)).toBe(-Infinity);
+  expect(float16ToNumber(0x7e00)).toBeNaN();
+});
+
+test("unpackDenseBuffers decodes dense data of any dtype", async () => {
+  const { unpackDenseBuffers } = await import("./widget.js");
+
+  // buffers of a message share a single ArrayBuffer, at any offset
+  const bytes = new ArrayBuffer(64);
+  const view = (offset: number, array: ArrayBufferView) => {
+    new Uint8Array(bytes, offset, array.byteLength).set(
+      new Uint8Array(array.buffer, array.byteOffset, array.byteLength),
+    );
+    return new DataView(bytes, offset, array.byteLength);
+  };
+  const buffers = [
+    view(0, new Float32Array([1, 2.5, 3, 4, 5, 6])),
+    view(24, new Uint16Array([0x3c00, 0xc000])),
+    view(29, new Int16Array([-3, 7])),
+    view(33, new Uint8Array([0, 255])),
+    view(40, new Float64Array([0.5])),
+  ];
+  const payload: Record<string, any> = {
+    "t.0.0": { dense: { buffer: 0 }, dtype: "float32", shape: [2, 3] },
+    "t.1.0": { dense: { buffer: 1 }, dtype: "float16" },
+    "t.1.1": { dense: { buffer: 2 }, dtype: "int16" },
+    "t.2.0": { dense: { buffer: 3 }, dtype: "uint8" },
+    "t.2.1": { dense: { buffer: 4 }, dtype: "float64" },
+    "t.3.0": { dense: "AAAA", dtype: "float16" },
+  };
+
+  const dense = unpackDenseBuffers(payload, buffers);
+  expect(Object.keys(dense)).toEqual([
+    "t.0.0",
+    "t.1.0",
+    "t.1.1",
+    "t.2.0",
+    "t.2.1",
+  ]);
+  for (const array of Object.values(dense)) {
+    expect(array).toBeInstanceOf(Float32Array);
+  }
+  expect([...dense["t.0.0"]]).toEqual([1, 2.5, 3, 4, 5, 6]);
+  // aligned float32 data is not copied
+  expect(dense["t.0.0"].buffer).toBe(bytes);
+  expect([...dense["t.1.0"]]).toEqual([1, -2]);
+  expect([...dense["t.1.1"]]).toEqual([-3, 7]);
+  expect([...dense["t.2.0"]]).toEqual([0, 255]);
+  expect([...dense["t.2.1"]]).toEqual([0.5]);
+
+  // buffer references are removed, the rest is left for HiGlass
+  expect(payload["t.0.0"]).toEqual({ dtype: "float32", shape: [2, 3] });
+  expect(payload["t.3.0"]).toEqual({ dense: "AAAA", dtype: "float16" });
+
+  expect(() =>
+    unpackDenseBuffers({ "t.0.0": { dense: { buffer: 0 }, dtype: "int64" } }, [
+      new DataView(new ArrayBuffer(8)),
+    ])
+  ).toThrow("int64");
+});
+
+test("resizeLocation matches the number of views", async () => {
+  const { resizeLocation } = await import("./widget.js");
+  const flat = [0, 10, 20, 30];
+  expect(resizeLocation(flat, 1)).toBe(flat);
+  expect(resizeLocation(flat, 3)).toEqual([flat, [], []]);
+  expect(resizeLocation([], 2)).toEqual([[], []]);
+  expect(resizeLocation([flat, [1, 2, 3, 4]], 1)).toBe(flat);
+});
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import typing
+
+import pytest
+
+from higlass._tileset_registry import TilesetInfo
+from higlass._widget import JupyterTilesetClient
+from higlass.tilesets import Tileset
+
+
+class FunctionTileset(Tileset):
+    """A tileset serving the tiles returned by a function of the tile ids."""
+
+    def __init__(
+        self, fetch: typing.Callable[[typing.Sequence[str]], list[typing.Any]]
+    ) -> None:
+        self.fetch = fetch
+
+    def tiles(self, tile_ids: typing.Sequence[str], /) -> list[typing.Any]:
+        return self.fetch(tile_ids)
+
+    def info(self) -> TilesetInfo:
+        return {"min_pos": [0], "max_pos": [1]}
+
+
+@pytest.fixture
+def make_tileset():
+    """Create tilesets from functions of the requested tile ids."""
+    return FunctionTileset
+
+
+@pytest.fixture
+def make_client():
+    """Create tileset clients, closing them after the test."""
+    clients: list[JupyterTilesetClient] = []
+
+    def make(**kwargs: typing.Any) -> JupyterTilesetClient:
+        client = JupyterTilesetClient(**kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import functools
 from typing import ClassVar, Literal
 
 import pytest
+from pydantic import ValidationError
 
 import higlass as hg
+from higlass.api import _TrackCreator
 
 
 @pytest.mark.parametrize(
@@ -90,6 +93,46 @@ def test_creates_correct_track(args: str | tuple, expected: hg.Track):
     assert track.type == track_type
 
 
+@pytest.mark.parametrize(
+    "args,expected",
+    [
+        # valid for the union only as a plugin track
+        (("heatmap", {"position": 1}), hg.PluginTrack),
+        (("line", {"chromInfoPath": 1}), hg.PluginTrack),
+        # coerced by the specific track
+        (("heatmap", {"height": "100"}), hg.HeatmapTrack),
+        # viewport projections from another view
+        (("viewport-projection-center", {"fromViewUid": "a"}), hg.EnumTrack),
+    ],
+)
+def test_track_matches_union(args: tuple, expected: hg.Track):
+    track_type, kwargs = args
+    track = hg.track(track_type, uid="a", **kwargs)
+    union = _TrackCreator.model_validate(dict(type=track_type, uid="a", **kwargs))
+    assert isinstance(track, expected)  # type: ignore
+    assert type(track) is type(union.root)
+    assert track.model_dump() == union.root.model_dump()
+
+
+def test_invalid_track():
+    with pytest.raises(ValidationError):
+        hg.track("heatmap", height=1.5)
+
+
+def test_combine():
+    line = hg.track("line", tilesetUid="a").opts(color="red")
+    heatmap = hg.track("heatmap", tilesetUid="b")
+    combined = hg.combine(line, heatmap, uid="c", height=100)
+    assert combined.uid == "c" and combined.height == 100
+    assert [type(t) for t in combined.contents] == [hg.EnumTrack, hg.HeatmapTrack]
+    assert combined.contents[0] == line and combined.contents[0] is not line
+
+    axis = hg.track("top-axis")
+    extended = hg.combine(combined, axis)
+    assert [t.uid for t in extended.contents] == [line.uid, heatmap.uid, axis.uid]
+    assert len(combined.contents) == 2
+
+
 def test_viewport_projection():
     v1 = hg.view(hg.track("heatmap"))
     v2 = hg.view(hg.track("heatmap"))
@@ -143,6 +186,46 @@ def test_concat_viewconfs():
     hg.view(hg.track("heatmap"), width=5, height=3).viewconf()
 
 
+def test_concat_many():
+    views = [hg.view(hg.track("heatmap"), width=i + 1, height=2) for i in range(5)]
+    viewconf = hg.hconcat(*views)
+    assert [v.layout.x for v in viewconf.views] == [0, 1, 3, 6, 10]
+    assert [v.uid for v in viewconf.views] == [v.uid for v in views]
+    assert viewconf == functools.reduce(hg.hconcat, views)
+
+    first = views[0].viewconf()
+    stacked = hg.vconcat(first, *views[1:])
+    assert [v.layout.y for v in stacked.views] == [0, 2, 4, 6, 8]
+    assert len(first.views) == 1
+    assert all(v.layout.y == 0 for v in views)
+
+    with pytest.raises(ValueError):
+        hg.hconcat()
+
+
+def test_concat_merges_locks():
+    v1, v2, v3, v4 = (hg.view(hg.track("heatmap")) for _ in range(4))
+    a = (v1 | v2).locks(hg.lock(v1, v2, uid="a"))
+    b = (v3 | v4).locks(zoom=hg.lock(v3, v4, uid="b"))
+    viewconf = hg.hconcat(a, b, hg.view(hg.track("heatmap")))
+    assert viewconf.zoomLocks
+    assert set(viewconf.zoomLocks.locksDict) == {"a", "b"}
+    assert viewconf.zoomLocks.locksByViewUid[v4.uid] == "b"
+    assert set(viewconf.locationLocks.locksDict) == {"a"}
+    assert set(a.zoomLocks.locksDict) == {"a"}
+
+
+def test_grid():
+    views = [hg.view(hg.track("heatmap"), width=3, height=i + 1) for i in range(6)]
+    viewconf = hg.grid(*views, columns=4)
+    assert viewconf.views is not None
+    layouts = [(v.layout.x, v.layout.y) for v in viewconf.views]
+    assert layouts == [(0, 0), (3, 0), (6, 0), (9, 0), (0, 4), (3, 4)]
+
+    with pytest.raises(ValueError):
+        hg.grid(*views, columns=0)
+
+
 def test_lock():
     # empty lock throws
     with pytest.raises(AssertionError):
@@ -209,6 +292,49 @@ def test_options_mixin():
     assert track.options and track.options["foo"] == "bar"
 
 
+def test_derived_objects_are_independent():
+    t = hg.track("heatmap", uid="t")
+    v1 = hg.view(hg.track("top-axis"), t)
+    v2 = v1.domain(x=(0, 10))
+    assert v1.tracks.top is not None and v2.tracks.top is not None
+    v2.tracks.top.append(hg.track("top-axis"))
+    assert len(v1.tracks.top) == 1
+    assert v1.initialXDomain is None
+
+    h = t.opts(colorRange=["white", "black"])
+    derived = h.opts(name="heatmap")
+    assert derived.options is not None
+    derived.options["colorRange"].append("red")
+    assert h.options == {"colorRange": ["white", "black"]}
+
+    vc = hg.hconcat(v1, hg.view(t))
+    vc.properties(editable=False).views[0].layout.x = 5
+    assert vc.views[0].layout.x == 0
+
+    track = hg.track("horizontal-line", server="https://example.com", tilesetUid="a")
+    track = track.opts(colorRange=["white", "black"])
+    divided = hg.divide(track, track.properties(tilesetUid="b"))
+    assert divided.options is not None
+    divided.options["colorRange"].append("red")
+    assert track.options == {"colorRange": ["white", "black"]}
+
+
+def test_derived_objects_are_not_modified_in_place():
+    v1 = hg.view(hg.track("heatmap"))
+    v2 = hg.view(hg.track("heatmap"))
+    derived = v1.properties(zoomFixed=True)
+    derived.project(v2, inplace=True)
+    assert derived.tracks.center is not None and v1.tracks.center is not None
+    assert len(derived.tracks.center) == 2
+    assert len(v1.tracks.center) == 1
+
+    viewconf = v1 | v2
+    locked = viewconf.locks(hg.lock(v1, v2))
+    locked.locks(zoom=hg.lock(v2, v1), inplace=True)
+    assert len(locked.zoomLocks.locksDict) == 2
+    assert len(viewconf.locks(hg.lock(v1, v2)).zoomLocks.locksDict) == 1
+
+
 def test_local_data_tileset():
     tsinfo = {"min_pos": [0, 0], "max_pos": [100, 100]}
     data = [{"x": 1, "y": 2}]
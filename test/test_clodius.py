@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import pytest
+
+from higlass import _clodius
+from higlass._handles import handle_pool
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("clodius")
+
+
+@pytest.fixture(autouse=True)
+def close_handles():
+    yield
+    handle_pool.clear()
+
+
+def test_hitile_tiles(tmp_path):
+    from clodius.tiles.hitile import array_to_hitile, tiles
+
+    path = tmp_path / "data.hitile"
+    values = np.random.default_rng(0).random(5000).astype(np.float32)
+    array_to_hitile(values, str(path), zoom_step=2, chunks=(1000,))
+
+    tile_ids = ["x.0.0", "x.1.1", "x.2.3", "x.3.4"]
+    expected = tiles(str(path), tile_ids)
+    assert _clodius.hitile_tiles(path, tile_ids) == expected
+    # with a reused handle
+    assert _clodius.hitile_tiles(path, tile_ids) == expected
+
+
+def test_multivec_tiles(tmp_path):
+    from clodius.multivec import create_multivec_multires
+    from clodius.tiles.multivec import tiles
+
+    def agg(x):
+        return x.T.reshape((x.shape[1], -1, 2)).sum(axis=2).T
+
+    path = tmp_path / "data.multires"
+    rng = np.random.default_rng(0)
+    chromsizes = [("chr1", 3000), ("chr2", 2000)]
+    data = {chrom: rng.random((size, 3)) for chrom, size in chromsizes}
+    create_multivec_multires(data, chromsizes, agg, tile_size=256, output_file=path)
+
+    # the last tile extends past the end of the data
+    tile_ids = ["x.0.0", "x.1.1", "x.2.2", "x.3.4", "x.4.9"]
+    expected = tiles(str(path), tile_ids)
+    assert _clodius.multivec_tiles(path, tile_ids) == expected
+    assert _clodius.multivec_tiles(path, tile_ids) == expected
+
+
+def test_bigwig_tiles(tmp_path):
+    pybigtools = pytest.importorskip("pybigtools")
+    from clodius.tiles.bigwig import tiles
+
+    path = tmp_path / "data.bw"
+    intervals = [("chr1", i * 10, i * 10 + 10, float(i)) for i in range(300)]
+    intervals += [("chr2", i * 20, i * 20 + 5, float(-i)) for i in range(100)]
+    pybigtools.open(str(path), "w").write({"chr1": 3000, "chr2": 2000}, intervals)
+
+    tile_ids = ["x.0.0", "x.2.1", "x.3.2", "x.3.7.min", "x.2.1.max.minMax"]
+    expected = tiles(str(path), tile_ids)
+    assert _clodius.bigwig_tiles(path, tile_ids) == expected
+    assert _clodius.bigwig_tiles(path, tile_ids) == expected
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+
+import numpy as np
+
+from higlass._disk_cache import DiskTileCache, dumps, loads
+from higlass._tileset_registry import TilesetRegistry
+from higlass._widget import JupyterTilesetClient
+from higlass.tilesets import ClodiusTileset, Tileset
+
+
+def test_dumps_loads_roundtrip():
+    tile = {
+        "dense": np.arange(6, dtype=np.float16).reshape(2, 3),
+        "min_value": 0.0,
+        "tile_pos": [1, 2],
+    }
+    loaded = loads(dumps(tile))
+    assert loaded["dense"].dtype == np.float16
+    np.testing.assert_array_equal(loaded["dense"], tile["dense"])
+    assert loaded["min_value"] == 0.0
+    assert loaded["tile_pos"] == [1, 2]
+
+
+def test_get_and_put(tmp_path):
+    cache = DiskTileCache(tmp_path / "tiles.sqlite")
+    assert cache.get_many("abc", ["0.0"]) == {}
+    cache.put_many("abc", [("0.0", {"dense": "AAAA"}), ("1.0", {"dense": "BBBB"})])
+    assert cache.get_many("abc", ["0.0", "1.1"]) == {"0.0": {"dense": "AAAA"}}
+    assert cache.get_many("xyz", ["0.0"]) == {}
+
+    # shared between instances (e.g., kernels) using the same file
+    other = DiskTileCache(tmp_path / "tiles.sqlite")
+    assert other.get_many("abc", ["1.0"]) == {"1.0": {"dense": "BBBB"}}
+    assert other.stats()["tiles"] == 2
+
+    other.clear()
+    assert cache.get_many("abc", ["0.0", "1.0"]) == {}
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = DiskTileCache(tmp_path / "tiles.sqlite", max_bytes=100)
+    cache.put_many("abc", [("0.0", "x" * 40)])
+    cache.put_many("abc", [("1.0", "x" * 40)])
+    cache.get_many("abc", ["0.0"])
+    cache.put_many("abc", [("1.1", "x" * 40)])
+    cache.evict()
+    assert cache.stats()["nbytes"] <= 100
+    assert set(cache.get_many("abc", ["0.0", "1.0", "1.1"])) == {"0.0", "1.1"}
+
+
+def test_clodius_fingerprint(tmp_path):
+    path = tmp_path / "data.bw"
+    path.write_bytes(b"data")
+
+    def tileset(**kwargs):
+        return ClodiusTileset(
+            datatype="vector",
+            tiles_impl=lambda tile_ids: [],
+            info_impl=lambda: {},
+            **kwargs,
+        )
+
+    assert tileset().fingerprint() is None
+    fingerprint = tileset(filepath=path, kind="bigwig").fingerprint()
+    assert fingerprint == tileset(filepath=str(path), kind="bigwig").fingerprint()
+    assert fingerprint != tileset(filepath=path, kind="hitile").fingerprint()
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert fingerprint != tileset(filepath=path, kind="bigwig").fingerprint()
+
+
+def test_client_uses_disk_cache(tmp_path):
+    calls = []
+
+    class FingerprintedTileset(Tileset):
+        def tiles(self, tile_ids):
+            calls.append(list(tile_ids))
+            return [(tile_id, {"dense": "AAAA"}) for tile_id in tile_ids]
+
+        def info(self):
+            return {}
+
+        def fingerprint(self):
+            return "abc"
+
+    client = JupyterTilesetClient.get_instance()
+    client.enable_disk_cache(tmp_path / "tiles.sqlite")
+    try:
+        ts = FingerprintedTileset()
+        uid = TilesetRegistry.add(ts)
+        client._fetch_tiles(uid, [f"{uid}.0.0"])
+        assert calls == [[f"{uid}.0.0"]]
+
+        # a different registry uid (e.g., in another kernel) for the same data
+        other_ts = FingerprintedTileset()
+        other = TilesetRegistry.add(other_ts)
+        tiles = client._fetch_tiles(other, [f"{other}.0.0", f"{other}.1.0"])
+        assert dict(tiles) == {
+            f"{other}.0.0": {"dense": "AAAA"},
+            f"{other}.1.0": {"dense": "AAAA"},
+        }
+        assert calls == [[f"{uid}.0.0"], [f"{other}.1.0"]]
+    finally:
+        client.disable_disk_cache()
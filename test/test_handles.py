@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import pathlib
+import threading
+
+import pytest
+
+from higlass._handles import FileHandlePool
+
+
+class Handle:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def opened() -> list[Handle]:
+    return []
+
+
+@pytest.fixture
+def opener(opened: list[Handle]):
+    def open_handle(path: str) -> Handle:
+        handle = Handle(path)
+        opened.append(handle)
+        return handle
+
+    return open_handle
+
+
+def test_reuses_handles(opener, opened: list[Handle]) -> None:
+    pool = FileHandlePool()
+    with pool.open("a", opener) as first:
+        pass
+    with pool.open(pathlib.Path("a"), opener) as second:
+        pass
+    assert first is second
+    assert len(opened) == 1
+    assert not first.closed
+
+
+def test_handles_are_not_shared_between_threads(opener, opened) -> None:
+    pool = FileHandlePool()
+    with pool.open("a", opener):
+        thread = threading.Thread(target=lambda: pool.open("a", opener).__enter__())
+        thread.start()
+        thread.join()
+    assert len(opened) == 2
+
+
+def test_handles_are_reused_across_threads(opener, opened) -> None:
+    pool = FileHandlePool()
+    with pool.open("a", opener):
+        pass
+    thread = threading.Thread(target=lambda: pool.open("a", opener).__enter__())
+    thread.start()
+    thread.join()
+    assert len(opened) == 1
+
+
+def test_returning_concurrent_handles(opener, opened) -> None:
+    pool = FileHandlePool()
+    with pool.open("a", opener), pool.open("a", opener):
+        pass
+    assert [h.closed for h in opened] == [False, True]
+    assert len(pool) == 1
+
+
+def test_modified_files_are_reopened(tmp_path, opener, opened) -> None:
+    path = tmp_path / "data"
+    path.write_bytes(b"a")
+    pool = FileHandlePool()
+    with pool.open(path, opener):
+        pass
+    path.write_bytes(b"ab")
+    with pool.open(path, opener) as handle:
+        assert handle is opened[1]
+    assert opened[0].closed
+    assert len(pool) == 1
+
+
+def test_max_idle(opener, opened: list[Handle]) -> None:
+    pool = FileHandlePool(max_idle=2)
+    for path in ["a", "b", "a", "c"]:
+        with pool.open(path, opener):
+            pass
+    assert [h.path for h in opened] == ["a", "b", "c"]
+    assert [h.closed for h in opened] == [False, True, False]
+    assert len(pool) == 2
+
+
+def test_handles_in_use_are_not_limited(opener, opened: list[Handle]) -> None:
+    pool = FileHandlePool(max_idle=1)
+    with pool.open("a", opener), pool.open("b", opener), pool.open("c", opener):
+        assert not any(h.closed for h in opened)
+    # returned in reverse, "a" last
+    assert [h.closed for h in opened] == [False, True, True]
+    assert len(pool) == 1
+
+
+def test_idle_timeout(opener, opened: list[Handle]) -> None:
+    pool = FileHandlePool(idle_timeout=0)
+    with pool.open("a", opener):
+        pass
+    assert opened[0].closed
+    assert len(pool) == 0
+
+
+def test_handle_is_closed_on_error(opener, opened: list[Handle]) -> None:
+    pool = FileHandlePool()
+    with pytest.raises(ValueError), pool.open("a", opener):
+        raise ValueError
+    assert opened[0].closed
+    assert len(pool) == 0
+
+
+def test_clear(opener, opened: list[Handle]) -> None:
+    pool = FileHandlePool()
+    with pool.open("a", opener):
+        pass
+    pool.clear()
+    assert opened[0].closed
+    assert len(pool) == 0
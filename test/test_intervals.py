@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import numpy as np
+
+from higlass._intervals import IntervalIndex, _top_per_group
+
+
+def overlapping(starts, ends, width, pos):
+    tile_start, tile_end = pos * width, (pos + 1) * width
+    return np.flatnonzero((starts < tile_end) & (ends > tile_start))
+
+
+def test_top_per_group():
+    groups = np.array([0, 0, 0, 1, 1, 2])
+    ranks = np.array([5, 0, 3, 1, 4, 2])
+    keep = _top_per_group(groups, ranks, 2)
+    assert keep is not None
+    assert keep.tolist() == [False, True, True, True, True, True]
+    assert _top_per_group(groups, ranks, 3) is None
+
+
+def test_query_without_truncation():
+    rng = np.random.default_rng(0)
+    starts = rng.integers(0, 10_000, 500)
+    ends = starts + rng.integers(0, 300, 500)
+    index = IntervalIndex(starts, ends, rng.random(500), 16, 10, k=1000)
+    for zoom, pos in [(10, 3), (7, 20), (3, 1), (0, 0)]:
+        width = 16 * 2 ** (10 - zoom)
+        expected = overlapping(starts, ends, width, pos)
+        assert sorted(index.query(zoom, pos).tolist()) == expected.tolist()
+
+
+def test_query_keeps_most_important():
+    starts = np.arange(1000)
+    ends = starts + 1
+    importance = np.arange(1000) % 100
+    index = IntervalIndex(starts, ends, importance, 1024, 0, k=10)
+    rows = index.query(0, 0)
+    assert len(rows) == 10
+    # ties are broken in favor of earlier intervals
+    assert rows.tolist() == [99, 199, 299, 399, 499, 599, 699, 799, 899, 999]
+
+
+def test_levels_hold_at_most_k_per_tile():
+    rng = np.random.default_rng(1)
+    starts = rng.integers(0, 2**16, 10_000)
+    ends = starts + 10
+    index = IntervalIndex(starts, ends, rng.random(10_000), 256, 8, k=20)
+    for zoom in range(9):
+        positions = index.levels[zoom][0]
+        tiles = index.starts[positions] // index.tile_width(zoom)
+        assert np.max(np.bincount(tiles)) <= 20
+    assert len(index.levels[0][0]) == 20
+
+
+def test_long_intervals_reach_later_tiles():
+    starts = np.array([0, 5000, 5001])
+    ends = np.array([100_000, 5002, 5003])
+    index = IntervalIndex(starts, ends, np.ones(3), 1024, 7, k=10)
+    assert index.query(7, 50).tolist() == [0]
+    assert index.query(7, 4).tolist() == [0, 1, 2]
+
+
+def test_intervals_ending_on_a_tile_boundary():
+    starts = np.array([0, 0])
+    ends = np.array([1024, 1025])
+    index = IntervalIndex(starts, ends, np.ones(2), 1024, 2, k=10)
+    assert index.query(2, 0).tolist() == [0, 1]
+    assert index.query(2, 1).tolist() == [1]
+
+
+def test_query_with_intervals_of_any_length():
+    rng = np.random.default_rng(2)
+    starts = rng.integers(0, 2**16, 2000)
+    ends = starts + (2 ** rng.uniform(0, 17, 2000)).astype(np.int64)
+    ends[0] = starts[0]  # empty
+    starts[1], ends[1] = 0, 2**17  # spans everything
+    index = IntervalIndex(starts, ends, rng.random(2000), 16, 12, k=10_000)
+    for zoom in [12, 9, 4, 0]:
+        width = 16 * 2 ** (12 - zoom)
+        for pos in rng.integers(0, 2**zoom, 20):
+            expected = overlapping(starts, ends, width, pos)
+            assert sorted(index.query(zoom, pos).tolist()) == expected.tolist()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import pytest
+
+from higlass._metrics import Histogram, Metrics
+
+
+def test_histogram():
+    histogram = Histogram()
+    assert histogram.summary() == {"count": 0}
+    for ms in range(1, 101):
+        histogram.add(ms / 1000)
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert summary["total"] == pytest.approx(5.05)
+    assert summary["min"] == pytest.approx(0.001)
+    assert summary["max"] == pytest.approx(0.1)
+    # accurate to within a factor of two
+    assert 0.05 <= summary["p50"] <= 0.1
+    assert 0.09 <= summary["p99"] <= 0.1
+
+
+def test_metrics_roll_up_tilesets():
+    metrics = Metrics()
+    metrics.count("tiles", 2, tileset="a")
+    metrics.count("tiles", 3, tileset="b")
+    metrics.count("shed")
+    metrics.observe("tiles", 0.01, tileset="a")
+    snapshot = metrics.snapshot()
+    assert snapshot["total"]["counters"] == {"tiles": 5, "shed": 1}
+    assert snapshot["total"]["latency"]["tiles"]["count"] == 1
+    assert snapshot["tilesets"]["a"]["counters"] == {"tiles": 2}
+    assert snapshot["tilesets"]["a"]["latency"]["tiles"]["count"] == 1
+    assert snapshot["tilesets"]["b"]["latency"] == {}
+
+    metrics.reset()
+    assert metrics.snapshot() == {
+        "total": {"counters": {}, "latency": {}},
+        "tilesets": {},
+    }
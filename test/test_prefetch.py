@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import typing
+from types import SimpleNamespace
+
+from higlass._prefetch import TilePrefetcher, neighboring_tiles
+from higlass._scheduler import TILES
+from higlass._tileset_registry import TilesetRegistry
+from higlass._widget import HiGlassWidget, JupyterTilesetClient
+from higlass.tilesets import Tileset
+
+INFO_1D = {
+    "min_pos": [0],
+    "max_pos": [2**20],
+    "max_width": 2**20,
+    "max_zoom": 10,
+    "tile_size": 1024,
+}
+
+INFO_2D = {
+    "min_pos": [0, 0],
+    "max_pos": [1_000_000, 1_000_000],
+    "resolutions": [1000, 4000, 16000],
+    "tile_size": 256,
+}
+
+
+def test_neighboring_tiles_1d():
+    assert neighboring_tiles(INFO_1D, [(0, 2**16)], width=800) == [
+        "4.1",
+        "5.0",
+        "5.1",
+    ]
+
+
+def test_neighboring_tiles_2d():
+    domains = [(0, 200_000), (300_000, 500_000)]
+    assert neighboring_tiles(INFO_2D, domains, width=800, suffix=".default") == [
+        "2.0.0.default",
+        "2.0.2.default",
+        "2.1.0.default",
+        "2.1.1.default",
+        "2.1.2.default",
+    ]
+
+
+def test_prefetcher_fills_tile_cache():
+    requested = []
+
+    class VectorTileset(Tileset):
+        datatype = "vector"
+
+        def tiles(self, tile_ids: typing.Sequence[str]) -> list[typing.Any]:
+            requested.extend(tile_ids)
+            return [(tile_id, {"dense": "AAAA"}) for tile_id in tile_ids]
+
+        def info(self) -> typing.Any:
+            return INFO_1D
+
+    ts = VectorTileset()
+    track = ts.track("horizontal-line").model_dump(exclude_none=True)
+    uid = TilesetRegistry.add(ts)
+    viewconf = {"views": [{"uid": "v", "tracks": {"top": [track]}}]}
+    widget = HiGlassWidget(viewconf, plugin_urls=[])
+    client = JupyterTilesetClient.get_instance()
+    client.reset_stats()
+
+    prefetcher = widget.enable_prefetching()
+    assert isinstance(prefetcher, TilePrefetcher)
+    widget.set_trait("location", [0, 2**16, 0, 2**16])
+    assert prefetcher._future is not None
+    prefetcher._future.result()
+
+    expected = [f"{uid}.4.1", f"{uid}.5.0", f"{uid}.5.1"]
+    assert requested == expected
+    assert all((uid, tile_id) in client.tile_cache for tile_id in expected)
+    # prefetched tiles are counted separately from those served
+    stats = client.stats()
+    assert stats["prefetch"]["counters"]["tiles"] == 3
+    assert "tiles" not in stats["total"]["counters"]
+
+    widget.disable_prefetching()
+    widget.set_trait("location", [0, 2**17, 0, 2**17])
+    assert requested == expected
+
+
+def test_prefetching_runs_after_tile_requests(monkeypatch):
+    class VectorTileset(Tileset):
+        datatype = "vector"
+
+        def tiles(self, tile_ids: typing.Sequence[str]) -> list[typing.Any]:
+            order.append("prefetch")
+            return [(tile_id, {"dense": "AAAA"}) for tile_id in tile_ids]
+
+        def info(self) -> typing.Any:
+            return INFO_1D
+
+    order = []
+    ts = VectorTileset()
+    track = ts.track("horizontal-line").model_dump(exclude_none=True)
+    TilesetRegistry.add(ts)
+    viewconf = {"views": [{"uid": "v", "tracks": {"top": [track]}}]}
+    widget = HiGlassWidget(viewconf, plugin_urls=[])
+    client = JupyterTilesetClient.get_instance()
+    # run queued requests by hand
+    monkeypatch.setattr(client, "_executor", SimpleNamespace(submit=lambda fn: None))
+
+    prefetcher = widget.enable_prefetching()
+    widget.set_trait("location", [0, 2**16, 0, 2**16])
+    client.scheduler.put(lambda: order.append("tiles"), priority=TILES)
+    client.scheduler.run_next()
+    client.scheduler.run_next()
+    assert order == ["tiles", "prefetch"]
+
+    # prefetching that hasn't started is dropped when stopped
+    widget.set_trait("location", [0, 2**17, 0, 2**17])
+    assert len(client.scheduler) == 1
+    widget.disable_prefetching()
+    client.scheduler.run_next()
+    assert order == ["tiles", "prefetch"]
+    assert prefetcher._future is not None and prefetcher._future.cancelled()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+import sys
+import typing
+from dataclasses import dataclass
+
+import pytest
+
+from higlass._process_pool import ProcessPool
+from higlass.tilesets import Tileset
+
+
+@dataclass
+class PidTileset(Tileset):
+    name: str
+
+    def tiles(self, tile_ids: typing.Sequence[str]) -> list[typing.Any]:
+        return [(tile_id, {"pid": os.getpid()}) for tile_id in tile_ids]
+
+    def info(self) -> typing.Any:
+        return {}
+
+
+# the number of tilesets rebuilt (in a worker process)
+_loads = 0
+
+
+@dataclass
+class LoadCountingTileset(Tileset):
+    name: str
+
+    def __setstate__(self, state: dict) -> None:
+        global _loads
+        _loads += 1
+        self.__dict__.update(state)
+
+    def tiles(self, tile_ids: typing.Sequence[str]) -> list[typing.Any]:
+        return [(tile_id, {"loads": _loads}) for tile_id in tile_ids]
+
+    def info(self) -> typing.Any:
+        return {}
+
+
+@pytest.fixture
+def pool() -> typing.Generator[ProcessPool]:
+    pool = ProcessPool(max_workers=1)
+    yield pool
+    pool.shutdown()
+
+
+def test_tiles_in_worker_process(pool: ProcessPool) -> None:
+    tiles = pool.tiles("a", PidTileset("a"), ["a.0.0"])
+    assert len(tiles) == 1
+    tile_id, tile = tiles[0]
+    assert tile_id == "a.0.0"
+    assert tile["pid"] != os.getpid()
+
+
+def test_unpicklable_tileset_uses_current_thread(pool: ProcessPool) -> None:
+    tileset = PidTileset("a")
+    tileset.unpicklable = lambda: None  # ty:ignore[unresolved-attribute]
+    assert pool.tiles("a", tileset, ["a.0.0"]) == [("a.0.0", {"pid": os.getpid()})]
+    assert pool._executor is None
+
+    # can be pickled again after the tileset is forgotten
+    pool.forget("a")
+    assert pool.tiles("a", PidTileset("a"), ["a.0.0"])[0][1]["pid"] != os.getpid()
+
+
+def test_tilesets_are_rebuilt_once_per_worker(pool: ProcessPool) -> None:
+    tileset = LoadCountingTileset("a")
+    assert pool.tiles("a", tileset, ["a.0.0"]) == [("a.0.0", {"loads": 1})]
+    assert pool.tiles("a", tileset, ["a.1.0"]) == [("a.1.0", {"loads": 1})]
+
+    # a different tileset with the same uid is rebuilt
+    pool.forget("a")
+    other = LoadCountingTileset("b")
+    assert pool.tiles("a", other, ["a.0.0"]) == [("a.0.0", {"loads": 2})]
+
+
+def test_tileset_defined_in_main_uses_current_thread(
+    pool: ProcessPool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class NotebookTileset(PidTileset):
+        pass
+
+    # like a class defined in a notebook, which the workers can't import
+    NotebookTileset.__module__ = "__main__"
+    NotebookTileset.__qualname__ = "NotebookTileset"
+    monkeypatch.setattr(
+        sys.modules["__main__"], "NotebookTileset", NotebookTileset, raising=False
+    )
+    tileset = NotebookTileset("a")
+    assert pool.tiles("a", tileset, ["a.0.0"]) == [("a.0.0", {"pid": os.getpid()})]
+    # pickled fine, but failed to load in the worker
+    assert pool._executor is not None
+    assert pool._pickled["a"] is None
+
+
+def test_process_unsafe_tileset_uses_current_thread(pool: ProcessPool) -> None:
+    class ThreadTileset(PidTileset):
+        _process_safe = False
+
+    tileset = ThreadTileset("a")
+    assert pool.tiles("a", tileset, ["a.0.0"]) == [("a.0.0", {"pid": os.getpid()})]
+    assert pool._executor is None
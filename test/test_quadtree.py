@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import numpy as np
+
+from higlass._quadtree import PointIndex, morton
+
+
+def test_morton():
+    codes = morton(np.array([0, 1, 0, 1, 2, 3]), np.array([0, 0, 1, 1, 0, 3]))
+    assert codes.tolist() == [0, 1, 2, 3, 4, 15]
+
+
+def test_query_matches_brute_force():
+    rng = np.random.default_rng(0)
+    x = rng.integers(0, 2**14, 2000)
+    y = rng.integers(0, 2**14, 2000)
+    index = PointIndex(x, y, rng.random(2000), 16, 10, k=5000)
+    for zoom, tx, ty in [(10, 3, 5), (6, 10, 2), (2, 1, 3), (0, 0, 0)]:
+        width = 16 * 2 ** (10 - zoom)
+        expected = np.flatnonzero((x // width == tx) & (y // width == ty))
+        assert sorted(index.query(zoom, tx, ty).tolist()) == expected.tolist()
+
+
+def test_query_keeps_most_important():
+    rng = np.random.default_rng(1)
+    x = rng.integers(0, 2**12, 10_000)
+    y = rng.integers(0, 2**12, 10_000)
+    importance = rng.random(10_000)
+    index = PointIndex(x, y, importance, 16, 8, k=20)
+    for zoom in range(9):
+        tiles = index.levels[zoom][1] >> 2 * (8 - zoom)
+        assert np.max(np.bincount(tiles)) <= 20
+    rows = index.query(0, 0, 0)
+    assert sorted(rows.tolist()) == sorted(np.argsort(-importance)[:20].tolist())
+    # the tile at (1, 0) is to the right of the one at (0, 0)
+    rows = index.query(4, 1, 0)
+    assert ((x[rows] >= 256) & (x[rows] < 512) & (y[rows] < 256)).all()
+
+
+def test_query_out_of_range():
+    index = PointIndex(np.array([1]), np.array([1]), np.ones(1), 16, 2, k=10)
+    assert index.query(1, 2, 0).tolist() == []
+    assert index.query(0, 0, 0).tolist() == [0]
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from higlass._scale import Scale
@@ -85,3 +86,79 @@ def test_rebin(scale):
     assert len(scale) == 60
     assert new_scale.binsize == 500
     assert len(new_scale) == 120
+
+
+def test_bins(scale):
+    data = get_data()
+    chroms = [gpos[0] for gpos, _, _ in data]
+    positions = [gpos[1] for gpos, _, _ in data]
+    expected = [offset for _, offset, _ in data]
+    np.testing.assert_array_equal(scale.bins(chroms, positions), expected)
+
+    codes = [int(chrom[-1]) - 1 for chrom in chroms]
+    np.testing.assert_array_equal(scale.bins(codes, positions), expected)
+
+
+def test_bins_out_of_bounds(scale):
+    bins = scale.bins(np.array(["chr1", "chr3"]), np.array([-1, 30000]))
+    np.testing.assert_array_equal(bins, [0, 59])
+
+
+def test_bins_unknown_chromosome(scale):
+    with pytest.raises(KeyError):
+        scale.bins(["chr1", "chrX"], [0, 0])
+    with pytest.raises(IndexError):
+        scale.bins([0, 3], [0, 0])
+
+
+def test_bins_categorical(scale):
+    pd = pytest.importorskip("pandas")
+    chroms = pd.Categorical(["chr3", "chr1", "chr3"], categories=["chr3", "chr1"])
+    np.testing.assert_array_equal(scale.bins(chroms, [1000, 0, 0]), [31, 0, 30])
+    series = pd.Series(chroms)
+    np.testing.assert_array_equal(scale.bins(series, [1000, 0, 0]), [31, 0, 30])
+
+
+def test_invert_bins(scale):
+    data = get_data()
+    indices = [offset for _, offset, _ in data]
+    chroms, positions = scale.invert_bins(indices)
+    assert list(zip(chroms.tolist(), positions.tolist())) == [
+        binstart for _, _, binstart in data
+    ]
+
+    codes, _ = scale.invert_bins(indices, codes=True)
+    assert codes.tolist() == [int(c[-1]) - 1 for c in chroms]
+
+
+def test_invert_bins_out_of_bounds(scale):
+    chroms, positions = scale.invert_bins(np.array([-1, 60]))
+    assert chroms.tolist() == ["chr1", "chr3"]
+    assert positions.tolist() == [0, 29000]
+
+
+def test_vectorized_matches_scalar():
+    scale = Scale([("chr1", 2500), ("chrM", 0), ("chr2", 999)], binsize=1000)
+    rng = np.random.default_rng(0)
+    chroms = rng.choice(list(scale.chromsizes), 1000)
+    positions = rng.integers(-100, 3000, 1000)
+    expected = [scale((c, p)) for c, p in zip(chroms.tolist(), positions.tolist())]
+    assert scale.bins(chroms, positions).tolist() == expected
+
+    indices = rng.integers(-2, len(scale) + 2, 1000)
+    chroms, positions = scale.invert_bins(indices)
+    expected = [scale.invert(i) for i in indices.tolist()]
+    assert list(zip(chroms.tolist(), positions.tolist())) == expected
+
+
+def test_bins_names_as_arrays():
+    scale = Scale([("chr10", 2000), ("chr1", 1000), ("chr2", 1000)], binsize=1000)
+    for chroms in (
+        np.array(["chr1", "chr2"]),
+        np.array([b"chr1", b"chr2"]),
+        np.array(["chr1", "chr2"], dtype=object),
+        ("chr1", "chr2"),
+    ):
+        assert scale.bins(chroms, [0, 0]).tolist() == [2, 3]
+    with pytest.raises(KeyError):
+        scale.bins(np.array(["chr1", "chr3"]), [0, 0])
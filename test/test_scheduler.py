@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+
+from higlass._scheduler import INFO, TILES, RequestScheduler
+from higlass._tileset_registry import TilesetRegistry
+
+
+def run_all(scheduler: RequestScheduler, items) -> list:
+    order = []
+    futures = [
+        scheduler.put(lambda name=name: order.append(name), **kwargs)
+        for name, kwargs in items
+    ]
+    for _ in futures:
+        scheduler.run_next()
+    return order
+
+
+def test_info_before_tiles():
+    scheduler = RequestScheduler()
+    order = run_all(
+        scheduler,
+        [
+            ("tiles", {"priority": TILES}),
+            ("info", {"priority": INFO}),
+        ],
+    )
+    assert order == ["info", "tiles"]
+
+
+def test_newest_first_within_group():
+    scheduler = RequestScheduler()
+    order = run_all(scheduler, [(i, {}) for i in range(3)])
+    assert order == [2, 1, 0]
+
+
+def test_groups_take_turns():
+    scheduler = RequestScheduler()
+    items = [(f"a{i}", {"group": "a"}) for i in range(3)]
+    items += [(f"b{i}", {"group": "b"}) for i in range(2)]
+    order = run_all(scheduler, items)
+    assert order == ["a2", "b1", "a1", "b0", "a0"]
+    assert len(scheduler) == 0
+
+
+def test_sheds_oldest_lowest_priority():
+    scheduler = RequestScheduler(max_queued=2)
+    info = scheduler.put(lambda: "info", priority=INFO)
+    old = scheduler.put(lambda: "old", priority=TILES, group="a")
+    new = scheduler.put(lambda: "new", priority=TILES, group="b")
+    assert old.cancelled()
+    assert len(scheduler) == 2
+    scheduler.run_next()
+    scheduler.run_next()
+    assert info.result() == "info"
+    assert new.result() == "new"
+
+
+def test_skips_cancelled():
+    scheduler = RequestScheduler()
+    first = scheduler.put(lambda: 1)
+    second = scheduler.put(lambda: 2)
+    second.cancel()
+    scheduler.run_next()
+    assert first.result() == 1
+    scheduler.run_next()
+
+
+def test_exceptions_are_set_on_future():
+    scheduler = RequestScheduler()
+    future = scheduler.put(lambda: 1 / 0)
+    scheduler.run_next()
+    assert isinstance(future.exception(), ZeroDivisionError)
+
+
+def test_client_schedules_info_first(monkeypatch, make_client, make_tileset):
+    started = threading.Event()
+    release = threading.Event()
+    sent = []
+
+    def fetch(tile_ids):
+        started.set()
+        release.wait()
+        return [(tile_id, {}) for tile_id in tile_ids]
+
+    client = make_client(stream_tiles=False)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(client, "_executor", executor)
+    monkeypatch.setattr(client, "send", lambda msg, buffers=None: sent.append(msg))
+
+    ts = make_tileset(fetch)
+    uid = TilesetRegistry.add(ts)
+    tiles = {"type": "tiles", "tileIds": [f"{uid}.0.0"]}
+    info = {"type": "tileset_info", "tilesetUid": uid}
+    client._handle_custom_message(client, {"id": "1", "payload": tiles}, [])
+    started.wait()
+    # queued behind the running request
+    client._handle_custom_message(client, {"id": "2", "payload": tiles}, [])
+    client._handle_custom_message(client, {"id": "3", "payload": info}, [])
+    release.set()
+    executor.shutdown(wait=True)
+
+    assert [msg["id"] for msg in sent] == ["1", "3", "2"]
+
+
+def test_client_responds_to_shed_requests(monkeypatch, make_client, make_tileset):
+    started = threading.Event()
+    release = threading.Event()
+    sent = []
+
+    def fetch(tile_ids):
+        started.set()
+        release.wait()
+        return [(tile_id, {}) for tile_id in tile_ids]
+
+    client = make_client(stream_tiles=False)
+    client.scheduler.max_queued = 1
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(client, "_executor", executor)
+    monkeypatch.setattr(client, "send", lambda msg, buffers=None: sent.append(msg))
+
+    ts = make_tileset(fetch)
+    uid = TilesetRegistry.add(ts)
+    tiles = {"type": "tiles", "tileIds": [f"{uid}.0.0"]}
+    client._handle_custom_message(
+        client, {"id": "1", "widget": "a", "payload": tiles}, []
+    )
+    started.wait()
+    client._handle_custom_message(
+        client, {"id": "2", "widget": "a", "payload": tiles}, []
+    )
+    client._handle_custom_message(
+        client, {"id": "3", "widget": "b", "payload": tiles}, []
+    )
+    # the oldest queued request is answered right away, without tiles
+    assert sent == [{"id": "2", "payload": {}, "done": True}]
+    release.set()
+    executor.shutdown(wait=True)
+
+    assert [msg["id"] for msg in sent] == ["2", "1", "3"]
+    assert client._pending == {}
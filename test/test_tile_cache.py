@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+
+import numpy as np
+import pytest
+
+from higlass._tile_cache import InfoCache, TileCache, sizeof
+
+
+def test_sizeof():
+    assert sizeof(np.zeros(10, dtype=np.float32)) == 40
+    assert sizeof({"dense": "abcd"}) == 9
+    assert sizeof(["ab", b"cd"]) == 4
+
+
+def test_hits_and_misses():
+    cache = TileCache()
+    assert cache.get(("a", "a.0.0")) is None
+    cache.put(("a", "a.0.0"), {"dense": "xyz"})
+    assert cache.get(("a", "a.0.0")) == {"dense": "xyz"}
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 1,
+        "tiles": 1,
+        "nbytes": 8,
+        "max_bytes": cache.max_bytes,
+    }
+
+
+def test_evicts_least_recently_used():
+    cache = TileCache(max_bytes=100)
+    cache.put(("a", "a.0.0"), np.zeros(10, dtype=np.float32))
+    cache.put(("a", "a.1.0"), np.zeros(10, dtype=np.float32))
+    cache.get(("a", "a.0.0"))
+    cache.put(("a", "a.1.1"), np.zeros(10, dtype=np.float32))
+    assert ("a", "a.0.0") in cache
+    assert ("a", "a.1.0") not in cache
+    assert ("a", "a.1.1") in cache
+    assert cache.nbytes == 80
+
+    cache.max_bytes = 40
+    assert len(cache) == 1
+    assert ("a", "a.1.1") in cache
+
+
+def test_oversized_tiles_are_not_cached():
+    cache = TileCache(max_bytes=10)
+    cache.put(("a", "a.0.0"), np.zeros(10, dtype=np.float32))
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_invalidate():
+    cache = TileCache()
+    cache.put(("a", "a.0.0"), "x")
+    cache.put(("b", "b.0.0"), "y")
+    cache.invalidate("a")
+    assert ("a", "a.0.0") not in cache
+    assert ("b", "b.0.0") in cache
+    assert cache.nbytes == 1
+
+
+def test_invalidate_after_eviction():
+    cache = TileCache(max_bytes=2)
+    cache.put(("a", "a.0.0"), "x")
+    cache.put(("b", "b.0.0"), "y")
+    cache.put(("a", "a.1.0"), "z")  # evicts a.0.0
+    assert ("a", "a.0.0") not in cache
+    cache.invalidate("a")
+    assert len(cache) == 1
+    assert cache.nbytes == 1
+    cache.invalidate("b")
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+    assert cache._tile_ids == {}
+
+
+def test_info_cache():
+    cache = InfoCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"max_zoom": 3}
+
+    assert cache.get("a", compute) == {"max_zoom": 3}
+    assert cache.get("a", compute) == {"max_zoom": 3}
+    assert len(calls) == 1
+
+    cache.invalidate("a")
+    assert "a" not in cache
+    cache.get("a", compute)
+    assert len(calls) == 2
+
+
+def test_info_cache_errors_are_not_cached():
+    cache = InfoCache()
+
+    def fail():
+        raise KeyError("a")
+
+    with pytest.raises(KeyError):
+        cache.get("a", fail)
+    assert cache.get("a", lambda: 1) == 1
+
+
+def test_info_cache_coalesces_concurrent_requests():
+    cache = InfoCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return "info"
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+        first = executor.submit(cache.get, "a", compute)
+        started.wait()
+        rest = [executor.submit(cache.get, "a", compute) for _ in range(3)]
+        release.set()
+        results = [f.result() for f in [first, *rest]]
+
+    assert results == ["info"] * 4
+    assert len(calls) == 1
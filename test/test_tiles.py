@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from higlass._scale import Scale
+from higlass.tiles import (
+    plan_tiles,
+    region_domains,
+    region_tile_ids,
+    tile_ids,
+    tile_range,
+    zoom_level,
+)
+
+POWER_OF_TWO = {
+    "min_pos": [0],
+    "max_pos": [3_000_000_000],
+    "max_width": 2**32,
+    "max_zoom": 22,
+    "tile_size": 1024,
+}
+
+RESOLUTIONS = {
+    "min_pos": [0, 0],
+    "max_pos": [3_000_000_000, 3_000_000_000],
+    "resolutions": [1000, 10_000, 100_000, 1_000_000],
+    "tile_size": 256,
+}
+
+CHROMSIZES = {"chr1": 248_956_422, "chr2": 242_193_529}
+
+
+def test_tile_ids_1d():
+    assert tile_ids(POWER_OF_TWO, [(0, 1_000_000)], width=800) == ["12.0"]
+    # tiles at zoom level 10 span 2**22 bp
+    assert tile_ids(POWER_OF_TWO, [(3e6, 6e6)], width=800, uid="a") == [
+        "a.10.0",
+        "a.10.1",
+    ]
+    assert tile_ids(POWER_OF_TWO, [(0, 1_000_000)], width=800, zoom=0) == ["0.0"]
+
+
+def test_tile_ids_2d():
+    assert tile_ids(RESOLUTIONS, [(0, 1e6), (0, 1e6)], width=800) == ["2.0.0"]
+    assert tile_ids(RESOLUTIONS, [(0, 1e6), (2e6, 3e6)], width=800, zoom=3) == [
+        f"3.{x}.{y}" for x in range(4) for y in range(7, 12)
+    ]
+
+
+@pytest.mark.parametrize("info", [POWER_OF_TWO, RESOLUTIONS], ids=["pow2", "res"])
+def test_plan_tiles_matches_scalar(info):
+    rng = np.random.default_rng(0)
+    starts = rng.uniform(-1e6, 3e9, 500)
+    ends = starts + 10 ** rng.uniform(2, 9.5, 500)
+    widths = rng.choice([200, 800, 1500], 500)
+
+    zooms, tile_starts, tile_stops = plan_tiles(info, starts, ends, widths)
+    for i in range(500):
+        domain = (starts[i], ends[i])
+        zoom = zoom_level(info, domain, widths[i])
+        assert zooms[i] == zoom
+        tiles = tile_range(info, zoom, domain)
+        assert (tile_starts[i], tile_stops[i]) == (tiles.start, tiles.stop)
+
+    zooms, tile_starts, tile_stops = plan_tiles(info, starts, ends, 800, zoom=1)
+    assert (zooms == 1).all()
+    for i in range(500):
+        tiles = tile_range(info, 1, (starts[i], ends[i]))
+        assert (tile_starts[i], tile_stops[i]) == (tiles.start, tiles.stop)
+
+
+def test_region_domains():
+    starts, ends = region_domains(
+        CHROMSIZES, ["chr1", "chr2", "chr2"], [0, 100, 0], [1000, 200, 10**10]
+    )
+    assert starts.tolist() == [0, 248_956_522, 248_956_422]
+    assert ends.tolist() == [1000, 248_956_622, 248_956_422 + 242_193_529]
+    # binned scales are converted to base pairs
+    scale = Scale(CHROMSIZES, binsize=1000)
+    starts, ends = region_domains(scale, ["chr2"], [100], [200])
+    assert (starts.tolist(), ends.tolist()) == ([248_956_522], [248_956_622])
+
+
+def test_region_tile_ids():
+    ids = region_tile_ids(
+        POWER_OF_TWO,
+        CHROMSIZES,
+        ["chr1", "chr2"],
+        [0, 0],
+        [1_000_000, 1_000_000],
+        width=800,
+        uid="a",
+    )
+    assert ids == [["a.12.0"], ["a.12.237", "a.12.238"]]
+
+    ids = region_tile_ids(RESOLUTIONS, CHROMSIZES, ["chr1"], [0], [1_000_000], 800)
+    assert ids == [["2.0.0"]]
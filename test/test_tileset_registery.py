@@ -62,3 +62,21 @@ def test_custom_tileset_without_uid(Registry: type[TilesetRegistry]) -> None:
     ts2 = MyTileset()
     ts2.track("heatmap")
     assert len(Registry._registry) == 2
+
+
+def test_on_remove(Registry: type[TilesetRegistry]) -> None:
+    removed = []
+    Registry.on_remove(removed.append)
+    try:
+        ts = mock_tileset()
+        uid = Registry.add(ts)
+        Registry.add(ts)
+        del ts
+        assert removed == [uid]
+
+        ts = mock_tileset()
+        uid = Registry.add(ts)
+        Registry.clear()
+        assert removed[-1] == uid
+    finally:
+        Registry.remove_callback(removed.append)
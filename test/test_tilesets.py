@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import copy
+import pickle
+
+import higlass_schema as hgs
+import numpy as np
+import pytest
+
+import higlass as hg
+from higlass.tiles import tile_ids
+
+
+def dense(tileset: hg.ArrayTileset, tile_id: str) -> np.ndarray:
+    [(_, tile)] = tileset.tiles([tile_id])
+    return tile["dense"]
+
+
+def test_array_info():
+    tileset = hg.array(np.ones(5000), binsize=10, tile_size=1024)
+    assert tileset.info() == {
+        "min_pos": [0],
+        "max_pos": [50_000],
+        "max_width": 1024 * 2**3 * 10,
+        "tile_size": 1024,
+        "max_zoom": 3,
+    }
+    assert [len(level) for level in tileset.levels] == [5000, 2500, 1250, 625]
+
+
+def test_array_tiles_are_views():
+    values = np.arange(4096, dtype=np.float32)
+    tileset = hg.array(values, tile_size=1024)
+    tile = dense(tileset, "x.2.3")
+    assert np.shares_memory(tile, values)
+    np.testing.assert_array_equal(tile, values[3072:])
+
+
+@pytest.mark.parametrize(
+    ("aggregation", "expected"),
+    [
+        ("mean", [1.5, 3, np.nan, 6]),
+        ("max", [2, 3, np.nan, 6]),
+        ("min", [1, 3, np.nan, 6]),
+        ("sum", [3, 3, np.nan, 6]),
+    ],
+)
+def test_array_aggregation(aggregation, expected):
+    values = [1, 2, 3, np.nan, np.nan, np.nan, 6]
+    tileset = hg.array(values, aggregation=aggregation, tile_size=4)
+    np.testing.assert_array_equal(dense(tileset, "x.0.0"), expected)
+
+
+def test_array_mean_weighs_by_count():
+    values = [1, np.nan, 2, 3] * 2
+    tileset = hg.array(values, tile_size=1)
+    # the mean of all (non-NaN) values, not the mean of the pairs' means
+    np.testing.assert_allclose(dense(tileset, "x.0.0"), [2])
+
+
+def test_array_pads_last_tile():
+    tileset = hg.array(np.ones(1500), tile_size=1024)
+    tile = dense(tileset, "x.1.1")
+    assert len(tile) == 1024
+    assert np.isnan(tile[476:]).all()
+    assert (tile[:476] == 1).all()
+
+
+def test_array_serves_planned_tiles():
+    tileset = hg.array(np.arange(100_000), binsize=100)
+    info = tileset.info()
+    ids = tile_ids(info, [(2_500_000, 2_600_000)], width=800, uid="x")
+    tiles = tileset.tiles(ids)
+    assert [tile_id for tile_id, _ in tiles] == ids
+
+
+def test_array_per_chromosome_bins():
+    chromsizes = {"chr1": 25, "chr2": 20}
+    # 3 + 2 bins per chromosome, but 5 genome-wide bins: same layout
+    tileset = hg.array([1, 2, 3, 4, 5], chromsizes=chromsizes, binsize=10)
+    np.testing.assert_array_equal(tileset.levels[0], [1, 2, 3, 4, 5])
+
+    chromsizes = {"chr1": 15, "chr2": 15, "chr3": 10}
+    # bins start at 0, 10 | 15, 25 | 30 genome-wide
+    tileset = hg.array([1, 2, 3, 4, 5], chromsizes=chromsizes, binsize=10)
+    np.testing.assert_array_equal(tileset.levels[0], [1, 3, 4, 5])
+
+    with pytest.raises(ValueError):
+        hg.array([1, 2], chromsizes=chromsizes, binsize=10)
+
+
+def test_array_invalid():
+    with pytest.raises(ValueError):
+        hg.array([1, 2], aggregation="median")  # ty: ignore[invalid-argument-type]
+    with pytest.raises(ValueError):
+        hg.array(np.ones((2, 2)))
+
+
+def test_array_copy():
+    tileset = hg.array([1, 2, 3])
+    for other in (copy.copy(tileset), pickle.loads(pickle.dumps(tileset))):
+        assert other.info() == tileset.info()
+        np.testing.assert_array_equal(other.levels[0], tileset.levels[0])
+    # but isn't served from worker processes
+    assert not tileset._process_safe
+
+
+def test_array_track():
+    track = hg.array([1, 2], name="values").track()
+    assert isinstance(track, hgs.EnumTrack)
+    assert track.type == "horizontal-bar"
+    assert track.server == "jupyter"
+    assert track.options and track.options["name"] == "values"
+
+
+def test_intervals():
+    table = {
+        "chrom": ["chr2", "chr1", "chr1"],
+        "start": [10, 5, 990],
+        "end": [20, 50, 2000],
+        "name": ["a", "b", "c"],
+    }
+    tileset = hg.intervals(table, {"chr1": 1000, "chr2": 500}, tile_size=256)
+    assert tileset.info() == {
+        "min_pos": [0],
+        "max_pos": [1500],
+        "max_width": 2048,
+        "tile_size": 256,
+        "max_zoom": 3,
+        "chromsizes": [("chr1", 1000), ("chr2", 500)],
+        "header": "chrom\tstart\tend\tname",
+    }
+    [(_, entries)] = tileset.tiles(["x.3.3"])
+    assert entries == [
+        {
+            "xStart": 990,
+            "xEnd": 1000,
+            "chrOffset": 0,
+            "importance": 10.0,
+            "uid": "2",
+            "fields": ["chr1", "990", "2000", "c"],
+        },
+        {
+            "xStart": 1010,
+            "xEnd": 1020,
+            "chrOffset": 1000,
+            "importance": 10.0,
+            "uid": "0",
+            "fields": ["chr2", "10", "20", "a"],
+        },
+    ]
+    assert copy.deepcopy(tileset).tiles(["x.3.3"]) == tileset.tiles(["x.3.3"])
+    assert not tileset._process_safe
+
+
+def test_intervals_max_per_tile():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame(
+        {
+            "chrom": pd.Categorical(["chr1"] * 100),
+            "start": np.arange(100),
+            "end": np.arange(100) + 1,
+            "score": np.arange(100.0),
+        }
+    )
+    tileset = hg.intervals(df, {"chr1": 100}, importance="score", max_per_tile=5)
+    [(_, entries)] = tileset.tiles(["x.0.0"])
+    assert [entry["uid"] for entry in entries] == ["95", "96", "97", "98", "99"]
+    assert tileset.track().type == "bedlike"
+
+
+def test_intervals_arrow():
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({"c": ["chr1"], "s": [1], "e": [2], "strand": ["+"]})
+    tileset = hg.intervals(table, {"chr1": 10}, chrom="c", start="s", end="e")
+    [(_, [entry])] = tileset.tiles(["x.0.0"])
+    assert entry["fields"] == ["chr1", "1", "2", "+"]
+
+
+def test_points():
+    tileset = hg.points(
+        [10, 300, 700],
+        [20, 900, 100],
+        importance=[1, 3, 2],
+        fields={"label": ["a", "b", "c"]},
+        chromsizes={"chr1": 1000},
+        max_per_tile=2,
+        tile_size=256,
+    )
+    assert tileset.info() == {
+        "min_pos": [0, 0],
+        "max_pos": [1000, 1000],
+        "max_width": 1024,
+        "tile_size": 256,
+        "max_zoom": 2,
+        "chromsizes": [("chr1", 1000)],
+    }
+    [(_, entries)] = tileset.tiles(["x.0.0.0"])
+    assert [entry["fields"] for entry in entries] == [["c"], ["b"]]
+    [(_, [entry])] = tileset.tiles(["x.2.1.3"])
+    assert entry == {
+        "xStart": 300,
+        "xEnd": 300,
+        "yStart": 900,
+        "yEnd": 900,
+        "chrOffset": 0,
+        "importance": 3.0,
+        "uid": "1",
+        "fields": ["b"],
+    }
+    assert tileset.track().type == "2d-rectangle-domains"
+    assert copy.deepcopy(tileset).tiles(["x.0.0.0"]) == tileset.tiles(["x.0.0.0"])
+    assert not tileset._process_safe
+
+
+def test_points_sample_without_importance():
+    rng = np.random.default_rng(0)
+    x, y = rng.random((2, 10_000)) * 1e6
+    tileset = hg.points(x, y, max_per_tile=50)
+    assert tileset.info()["max_pos"] == [int(max(x.max(), y.max())) + 1] * 2
+    [(_, entries)] = tileset.tiles(["x.0.0.0"])
+    assert len(entries) == 50
+    assert entries[0]["fields"] == []
+
+    with pytest.raises(ValueError):
+        hg.points([-1], [0])
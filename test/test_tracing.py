@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from higlass._tracing import BROWSER_PID, Tracer
+
+
+def test_complete_spans():
+    tracer = Tracer()
+    start = time.perf_counter()
+    tracer.complete("tiles", start, start + 0.5, tileset="a")
+    (event,) = tracer.events
+    assert event["ph"] == "X"
+    assert event["dur"] == 0.5e6
+    assert event["tid"] == threading.get_ident()
+    assert event["args"] == {"tileset": "a"}
+    # Unix time in microseconds
+    assert abs(event["ts"] / 1e6 - time.time()) < 60
+
+
+def test_browser_spans_line_up():
+    tracer = Tracer()
+    now = time.perf_counter()
+    tracer.async_span("request", "1", now, now + 0.1)
+    sent = time.time() * 1e3
+    tracer.browser_span("sendCustomMessage", "1", sent, sent + 200)
+    request_begin, _, browser_begin, browser_end = tracer.events
+    assert browser_begin["pid"] == BROWSER_PID
+    assert (browser_begin["ph"], browser_end["ph"]) == ("b", "e")
+    assert browser_end["ts"] - browser_begin["ts"] == 200e3
+    assert abs(browser_begin["ts"] - request_begin["ts"]) < 1e6
+
+
+def test_save(tmp_path):
+    tracer = Tracer()
+    now = time.perf_counter()
+    tracer.complete("encode", now, now)
+    tracer.save(tmp_path / "trace.json")
+    trace = json.loads((tmp_path / "trace.json").read_text())
+    names = [e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"]
+    assert names[:2] == ["kernel", "browser"]
+    assert threading.current_thread().name in names
+    assert trace["traceEvents"][-1]["name"] == "encode"
@@ -3,7 +3,7 @@ from __future__ import annotations
 import pytest
 from pydantic import BaseModel
 
-from higlass._utils import copy_unique, ensure_list
+from higlass._utils import copy_unique, derive_unique, ensure_list
 
 
 def test_copy_unique():
@@ -26,6 +26,20 @@ def test_copy_unique():
     assert other.uid != person_with_id.uid
 
 
+def test_derive_unique():
+    class Person(BaseModel):
+        uid: str
+        names: list[str]
+
+    person = Person(uid="something", names=["foo"])
+    other = derive_unique(person)
+    assert other is not person
+    assert other.uid != person.uid
+    assert other.names == person.names
+    other.names.append("bar")
+    assert person.names == ["foo"]
+
+
 @pytest.mark.parametrize("value", [1, [1, 2], None])
 def test_ensure_list(value: int | list[int] | None):
     assert isinstance(ensure_list(value), list)
@@ -0,0 +1,486 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import concurrent.futures
+import itertools
+import json
+import threading
+import time
+import typing
+
+import ipywidgets
+import numpy as np
+import pytest
+
+import higlass as hg
+from higlass._tileset_registry import TilesetInfo, TilesetRegistry
+from higlass._widget import (
+    HiGlassWidget,
+    JupyterTilesetClient,
+    _embed_tiles,
+    _encode_tiles,
+)
+from higlass.tilesets import Tileset
+
+
+class ImmediateExecutor(concurrent.futures.Executor):
+    """Runs submitted work immediately in the calling thread."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = concurrent.futures.Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+def test_encode_tiles_numpy():
+    dense = np.arange(6, dtype=np.float32).reshape(2, 3)
+    payload, buffers = _encode_tiles({"a.0.0": {"dense": dense, "min_value": 0}})
+    assert payload == {
+        "a.0.0": {
+            "dense": {"buffer": 0},
+            "dtype": "float32",
+            "shape": [2, 3],
+            "min_value": 0,
+        }
+    }
+    assert len(buffers) == 1
+    assert bytes(buffers[0]) == dense.tobytes()
+
+
+def test_encode_tiles_non_contiguous():
+    dense = np.arange(6, dtype=np.float64).reshape(2, 3).T
+    payload, buffers = _encode_tiles({"a.0.0": {"dense": dense}})
+    assert payload["a.0.0"]["shape"] == [3, 2]
+    assert bytes(buffers[0]) == np.ascontiguousarray(dense).tobytes()
+
+
+def test_encode_tiles_base64():
+    raw = np.ones(4, dtype=np.float16).tobytes()
+    tile = {"dense": base64.b64encode(raw).decode(), "dtype": "float16"}
+    payload, buffers = _encode_tiles({"a.0.0": tile, "b.0.0": {"error": "oops"}})
+    assert payload == {
+        "a.0.0": {"dense": {"buffer": 0}, "dtype": "float16"},
+        "b.0.0": {"error": "oops"},
+    }
+    assert bytes(buffers[0]) == raw
+    # input tiles are not modified
+    assert isinstance(tile["dense"], str)
+
+
+def test_encode_tiles_unsupported():
+    tiles = {
+        "a.0.0": {"dense": [1.0, 2.0]},
+        "b.0.0": {"dense": np.array([True, False])},
+        "c.0.0": {"dense": np.arange(2, dtype=np.int64)},
+        "d.0.0": {"dense": "AAAA", "dtype": "int64"},
+    }
+    payload, buffers = _encode_tiles(tiles)
+    assert payload == {
+        "a.0.0": {"dense": [1.0, 2.0]},
+        "b.0.0": {"dense": [True, False]},
+        "c.0.0": {"dense": [0, 1]},
+        "d.0.0": {"dense": "AAAA", "dtype": "int64"},
+    }
+    assert buffers == []
+
+
+def test_embed_tiles():
+    dense = np.arange(6, dtype=np.float32)[::2]
+    tile = {"dense": dense}
+    payload = _embed_tiles({"a.0.0": tile, "b.0.0": {"dense": "AAAA"}})
+    assert payload == {
+        "a.0.0": {
+            "dense": base64.b64encode(dense.tobytes()).decode(),
+            "dtype": "float32",
+            "shape": [3],
+        },
+        "b.0.0": {"dense": "AAAA"},
+    }
+    assert tile["dense"] is dense
+
+
+def test_inline_tilesets():
+    values = np.arange(3000, dtype=np.float32)
+    inline = hg.array(values, tile_size=1024, inline=True)
+    other = hg.array(values)
+    viewconf = hg.view(inline.track(), other.track(), inline.track()).viewconf()
+    widget = HiGlassWidget(viewconf.model_dump(), plugin_urls=[])
+
+    uid = TilesetRegistry.add(inline)
+    assert list(widget._inline_tilesets) == [uid]
+    tileset = widget._inline_tilesets[uid]
+    assert tileset["info"] == inline.info()
+    assert list(tileset["tiles"]) == ["0.0", "1.0", "1.1", "2.0", "2.1", "2.2"]
+    tile = tileset["tiles"]["2.1"]
+    assert tile["dtype"] == "float32"
+    assert bytes(tile["dense"]) == values[1024:2048].tobytes()
+
+    # tiles are synced as binary buffers, not in the JSON state
+    _, _, buffers = ipywidgets.widgets.widget._remove_buffers(widget.get_state())
+    assert len(buffers) == 6
+
+
+def _patch_widget(monkeypatch):
+    values = np.arange(3000, dtype=np.float32)
+    top = hg.array(values).track(uid="top")
+    inner = hg.array(values).track(uid="inner")
+    combined = hg.combine(inner, hg.array(values).track(), uid="combined")
+    viewconf = hg.view((top, "top"), (combined, "top")).viewconf()
+    widget = HiGlassWidget(viewconf.model_dump(), plugin_urls=[])
+    sent = []
+    monkeypatch.setattr(widget, "send", lambda msg: sent.append(json.loads(msg)))
+    return widget, sent
+
+
+def test_update_track(monkeypatch):
+    widget, sent = _patch_widget(monkeypatch)
+    widget.update_track("top", height=120)
+    widget.set_options("inner", lineStrokeColor="red")
+
+    assert sent == [
+        [
+            "patch",
+            1,
+            [{"op": "update_track", "track": "top", "properties": {"height": 120}}],
+        ],
+        [
+            "patch",
+            2,
+            [
+                {
+                    "op": "set_options",
+                    "track": "inner",
+                    "options": {"lineStrokeColor": "red"},
+                }
+            ],
+        ],
+    ]
+    tracks = widget._viewconf["views"][0]["tracks"]["top"]
+    assert tracks[0]["height"] == 120
+    inner = tracks[1]["contents"][0]
+    assert inner["options"]["lineStrokeColor"] == "red"
+
+
+def test_update_track_with_track(monkeypatch):
+    widget, sent = _patch_widget(monkeypatch)
+    track = hg.array(np.zeros(10)).track(uid="top", height=50)
+    widget.update_track(track)
+
+    [[_, _, [patch]]] = sent
+    assert patch["properties"] == track.model_dump()
+    assert widget._viewconf["views"][0]["tracks"]["top"][0]["height"] == 50
+
+
+def test_update_track_with_inline_tileset(monkeypatch):
+    widget, sent = _patch_widget(monkeypatch)
+    inline = hg.array(np.arange(10, dtype=np.float32), inline=True)
+    widget.update_track(inline.track(uid="top"))
+
+    assert len(sent) == 1
+    assert list(widget._inline_tilesets) == [TilesetRegistry.add(inline)]
+
+
+def test_patch_unknown_track(monkeypatch):
+    widget, sent = _patch_widget(monkeypatch)
+    with pytest.raises(KeyError):
+        widget.set_options("missing", color="red")
+    assert sent == []
+
+
+def test_add_view_and_batch(monkeypatch):
+    widget, sent = _patch_widget(monkeypatch)
+    values = np.arange(10, dtype=np.float32)
+    inline = hg.array(values, inline=True)
+    view = hg.view(inline.track(), uid="second")
+
+    with widget.batch():
+        widget.add_view(view)
+        widget.update_track("top", height=80)
+
+    [[fn, version, patches]] = sent
+    assert (fn, version) == ("patch", 1)
+    assert [p["op"] for p in patches] == ["add_view", "update_track"]
+    assert [v["uid"] for v in widget._viewconf["views"]] == [
+        widget._viewconf["views"][0]["uid"],
+        "second",
+    ]
+    assert TilesetRegistry.add(inline) in widget._inline_tilesets
+
+
+def test_fetch_tiles_uses_cache(make_tileset):
+    calls = []
+
+    def fetch(tile_ids):
+        calls.append(list(tile_ids))
+        return [(tile_id, {"dense": "AAAA"}) for tile_id in tile_ids]
+
+    client = JupyterTilesetClient.get_instance()
+    ts = make_tileset(fetch)
+    uid = TilesetRegistry.add(ts)
+
+    tiles = client._fetch_tiles(uid, [f"{uid}.0.0"])
+    assert tiles == [(f"{uid}.0.0", {"dense": "AAAA"})]
+    tiles = client._fetch_tiles(uid, [f"{uid}.0.0", f"{uid}.1.0"])
+    assert dict(tiles) == {
+        f"{uid}.0.0": {"dense": "AAAA"},
+        f"{uid}.1.0": {"dense": "AAAA"},
+    }
+    assert calls == [[f"{uid}.0.0"], [f"{uid}.1.0"]]
+
+    # removing the tileset invalidates its cached tiles
+    del ts
+    assert (uid, f"{uid}.0.0") not in client.tile_cache
+
+
+def test_cancel_drops_queued_requests(monkeypatch, make_client, make_tileset):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    sent = []
+
+    def fetch(tile_ids):
+        calls.append(list(tile_ids))
+        started.set()
+        release.wait()
+        return [(tile_id, {}) for tile_id in tile_ids]
+
+    client = make_client()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(client, "_executor", executor)
+    monkeypatch.setattr(client, "send", lambda msg, buffers=None: sent.append(msg))
+
+    ts = make_tileset(fetch)
+    uid = TilesetRegistry.add(ts)
+    request = {"type": "tiles", "tileIds": [f"{uid}.0.0"]}
+    client._handle_custom_message(client, {"id": "1", "payload": request}, [])
+    started.wait()
+    client._handle_custom_message(client, {"id": "2", "payload": request}, [])
+    client._handle_custom_message(
+        client, {"id": "2", "payload": {"type": "cancel"}}, []
+    )
+    release.set()
+    executor.shutdown(wait=True)
+
+    assert calls == [[f"{uid}.0.0"]]
+    assert {msg["id"] for msg in sent} == {"1"}
+    assert client._pending == {}
+
+
+def test_cancel_running_request(monkeypatch, make_client, make_tileset):
+    started = threading.Event()
+    release = threading.Event()
+    sent = []
+
+    def fetch(tile_ids):
+        started.set()
+        release.wait()
+        if Tileset.cancelled():
+            raise concurrent.futures.CancelledError
+        return [(tile_id, {}) for tile_id in tile_ids]
+
+    client = make_client()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(client, "_executor", executor)
+    monkeypatch.setattr(client, "send", lambda msg, buffers=None: sent.append(msg))
+
+    ts = make_tileset(fetch)
+    uid = TilesetRegistry.add(ts)
+    request = {"type": "tiles", "tileIds": [f"{uid}.0.0"]}
+    client._handle_custom_message(client, {"id": "1", "payload": request}, [])
+    started.wait()
+    assert client.cancel("1")
+    release.set()
+    executor.shutdown(wait=True)
+
+    assert sent == []
+    assert not client.cancel("1")
+
+
+def test_tilesets_are_fetched_concurrently(monkeypatch, make_client, make_tileset):
+    barrier = threading.Barrier(3, timeout=5)
+
+    def fetch(tile_ids):
+        barrier.wait()
+        return [(tile_id, {"value": 1}) for tile_id in tile_ids]
+
+    client = make_client()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(client, "_tileset_executor", executor)
+    tilesets = [make_tileset(fetch) for _ in range(3)]
+    uids = [TilesetRegistry.add(ts) for ts in tilesets]
+    groups = [(uid, [f"{uid}.0.0"]) for uid in uids]
+
+    tiles = list(itertools.chain(*client._iter_tile_groups(groups)))
+    assert dict(tiles) == {f"{uid}.0.0": {"value": 1} for uid in uids}
+
+
+def test_max_concurrent_tilesets(monkeypatch, make_client, make_tileset):
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def fetch(tile_ids):
+        nonlocal active, max_active
+        with lock:
+            active += 1
+            max_active = max(active, max_active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return [(tile_id, {}) for tile_id in tile_ids]
+
+    client = make_client(max_concurrent_tilesets=2)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(client, "_tileset_executor", executor)
+    tilesets = [make_tileset(fetch) for _ in range(6)]
+    uids = [TilesetRegistry.add(ts) for ts in tilesets]
+
+    groups = [(uid, [f"{uid}.0.0"]) for uid in uids]
+    tiles = list(itertools.chain(*client._iter_tile_groups(groups)))
+    assert len(tiles) == 6
+    assert max_active == 2
+
+
+def _value_tiles(tile_ids):
+    return [(tile_id, {"value": 1}) for tile_id in tile_ids]
+
+
+def test_tiles_are_streamed_per_tileset(monkeypatch, make_client, make_tileset):
+    sent = []
+    client = make_client(binary=False)
+    monkeypatch.setattr(client, "_executor", ImmediateExecutor())
+    monkeypatch.setattr(client, "send", lambda msg, buffers=None: sent.append(msg))
+
+    ts1, ts2 = make_tileset(_value_tiles), make_tileset(_value_tiles)
+    uid1, uid2 = TilesetRegistry.add(ts1), TilesetRegistry.add(ts2)
+    tile_ids = [f"{uid1}.0.0", f"{uid2}.0.0", f"{uid1}.1.0"]
+    tiles = {"type": "tiles", "tileIds": tile_ids}
+    client._handle_custom_message(client, {"id": "1", "payload": tiles}, [])
+
+    assert [msg["done"] for msg in sent] == [False, False, True]
+    assert sent[-1]["payload"] == {}
+    payload = {}
+    for msg in sent:
+        assert msg["id"] == "1"
+        payload.update(msg["payload"])
+    assert payload == {tile_id: {"value": 1} for tile_id in tile_ids}
+
+    sent.clear()
+    client.stream_tiles = False
+    client._handle_custom_message(client, {"id": "2", "payload": tiles}, [])
+    assert len(sent) == 1
+    assert sent[0]["done"]
+    assert sent[0]["payload"] == {tile_id: {"value": 1} for tile_id in tile_ids}
+
+
+def test_async_tilesets(make_client):
+    started = 0
+    all_started = asyncio.Event()
+
+    class AsyncTileset:
+        async def tiles(self, tile_ids: typing.Sequence[str], /) -> list[typing.Any]:
+            nonlocal started
+            started += 1
+            if started == 3:
+                all_started.set()
+            # only completes if all tilesets run concurrently on the loop
+            await asyncio.wait_for(all_started.wait(), timeout=5)
+            return [(tile_id, {"value": 1}) for tile_id in tile_ids]
+
+        async def info(self) -> TilesetInfo:
+            return {"min_pos": [0], "max_pos": [1], "max_zoom": 1}
+
+    client = make_client()
+    tilesets = [AsyncTileset() for _ in range(3)]
+    uids = [TilesetRegistry.add(ts) for ts in tilesets]
+    groups = [(uid, [f"{uid}.0.0"]) for uid in uids]
+
+    tiles = list(itertools.chain(*client._iter_tile_groups(groups)))
+    assert dict(tiles) == {f"{uid}.0.0": {"value": 1} for uid in uids}
+    assert client._fetch_info(uids[0])["max_zoom"] == 1
+    # single tileset requests are awaited directly
+    assert client._fetch_tiles(uids[0], [f"{uids[0]}.1.0"]) == [
+        (f"{uids[0]}.1.0", {"value": 1})
+    ]
+
+
+def test_client_stats(monkeypatch, make_client, make_tileset):
+    def fetch(tile_ids):
+        return [
+            (tile_id, {"error": "oops"} if tile_id.endswith("1.0") else {})
+            for tile_id in tile_ids
+        ]
+
+    client = make_client(binary=False)
+    monkeypatch.setattr(client, "_executor", ImmediateExecutor())
+    monkeypatch.setattr(client, "send", lambda msg, buffers=None: None)
+
+    ts = make_tileset(fetch)
+    uid = TilesetRegistry.add(ts)
+    tiles = {"type": "tiles", "tileIds": [f"{uid}.0.0", f"{uid}.1.0"]}
+    info = {"type": "tileset_info", "tilesetUid": uid}
+    client._handle_custom_message(client, {"id": "1", "payload": info}, [])
+    client._handle_custom_message(client, {"id": "2", "payload": tiles}, [])
+    client._handle_custom_message(client, {"id": "3", "payload": tiles}, [])
+
+    stats = client.stats()
+    assert stats["total"]["counters"] == {
+        "info_requests": 1,
+        "tile_requests": 2,
+        "cache_hits": 1,
+        "cache_misses": 3,
+        "errors": 2,
+        "tiles": 4,
+        "bytes": stats["total"]["counters"]["bytes"],
+    }
+    assert set(stats["total"]["latency"]) == {
+        "parse",
+        "queue",
+        "handle",
+        "info",
+        "fetch",
+        "tiles",
+        "encode",
+        "send",
+    }
+    assert stats["tilesets"][uid]["latency"]["tiles"]["count"] == 2
+    assert stats["tilesets"][uid]["counters"]["errors"] == 2
+
+    client.reset_stats()
+    assert client.stats()["tilesets"] == {}
+
+
+def test_client_trace(monkeypatch, tmp_path, make_client, make_tileset):
+    sent = []
+    client = make_client()
+    monkeypatch.setattr(client, "_executor", ImmediateExecutor())
+    monkeypatch.setattr(client, "send", lambda msg, buffers=None: sent.append(msg))
+
+    ts = make_tileset(_value_tiles)
+    uid = TilesetRegistry.add(ts)
+    tiles = {"type": "tiles", "tileIds": [f"{uid}.0.0"]}
+    with client.trace(tmp_path / "trace.json") as tracer:
+        client._handle_custom_message(client, {"id": "1", "payload": tiles}, [])
+        timing = {"type": "timing", "sent": 1.0, "received": 2.0}
+        client._handle_custom_message(client, {"id": "1", "payload": timing}, [])
+    assert client.tracer is None
+
+    assert [msg.get("trace") for msg in sent] == [None, True]
+    spans = {(e["name"], e["ph"]) for e in tracer.events}
+    assert {("parse", "X"), ("fetch", "X"), ("tiles", "X"), ("send", "X")} <= spans
+    assert {("queue", "b"), ("request", "b"), ("sendCustomMessage", "b")} <= spans
+    assert (tmp_path / "trace.json").exists()
+
+    # no longer tracing
+    recorded = len(tracer.events)
+    client._handle_custom_message(client, {"id": "2", "payload": tiles}, [])
+    assert len(tracer.events) == recorded
+    assert "trace" not in sent[-1]
+
+
+def test_closed_clients_release_their_callbacks():
+    client = JupyterTilesetClient()
+    assert client.invalidate in TilesetRegistry._removal_callbacks
+    client.close()
+    assert client.invalidate not in TilesetRegistry._removal_callbacks